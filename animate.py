@@ -1,23 +1,35 @@
 import sys
 import tomllib
 import json
+from pathlib import Path
 from manim._config import tempconfig
 
-from manim.scene.scene import Scene
 from manim.animation.creation import Create
 from manim.constants import UP, RIGHT
 
+from cli import RENDER_OPTIONS, RENDER_USAGE, preflight_from_options, progress_from_options, segment_cache_from_options, split_options
+from draft import render_draft
+from long_render import render_long
 from fa_manager import DFA_Manager, TM_Manager, NFA_Manager
+from multi_resolution import render_multi_resolution
+from parallel_render import render_parallel
+from playback import DEFAULT_CHUNK_SIZE, play_run, scene_plays, segment_fingerprints
+from preflight import SceneComplexity, render_recorded, scene_complexity
+from progress import phase
+from renderers import render_interactive, set_background_color
+from static_layer import StaticBackgroundScene
+from web_export import export_web
 
 
-class SceneToShow(Scene):
+class SceneToShow(StaticBackgroundScene):
     def __init__(self, fa_filename, config_filename, input_string):
         super().__init__()
 
-        with open(fa_filename, "rb") as f:
-            fa_json = json.load(f)
-        with open(config_filename, "rb") as f:
-            self.config = tomllib.load(f)
+        with phase("load", file=str(fa_filename)):
+            with open(fa_filename, "rb") as f:
+                fa_json = json.load(f)
+            with open(config_filename, "rb") as f:
+                self.config = tomllib.load(f)
 
         # Triage
         if fa_json["fa_type"] == "dfa":
@@ -44,17 +56,57 @@ class SceneToShow(Scene):
         # TODO: update NFAs into animation process - transition tables?
 
     def construct(self):
-        self.camera.background_color = self.config["scene"]["background_color"]
-        self.play(Create(self.fa.mobj))
-        self.play(self.fa.animate())
-        self.wait(1)
+        set_background_color(self, self.config["scene"]["background_color"])
+        if scene_plays(self, ("intro",)):
+            self.play(Create(self.fa.mobj))
+        else:
+            self.add(self.fa.mobj)
+        play_run(self, self.fa, self.config["scene"].get("chunk_size", DEFAULT_CHUNK_SIZE))
+        if scene_plays(self, ("wait", 1)):
+            self.wait(1)
+
+    def cache_fingerprints(self, ranges: list[tuple[int, int]]) -> list[dict]:
+        return segment_fingerprints(self.segment, ranges, [self.fa])
+
+    def complexity(self) -> SceneComplexity:
+        # Create() and the closing wait last a second each
+        return scene_complexity([self.fa], [self.fa], intro_seconds=2, intros=1)
+
+    def run_managers(self) -> list:
+        return [self.fa]
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: py animate.py <fa_filename> <config_filename> <input_string>")
+    args, options = split_options(sys.argv, {**RENDER_OPTIONS, "web": Path})
+
+    if len(args) != 4:
+        print(f"Usage: py animate.py <fa_filename> <config_filename> <input_string> [--web DIR] {RENDER_USAGE}")
         exit(1)
+    progress_from_options(options)
+
+    if options.get("renderer") == "opengl":
+        # Shown in a window as it plays, one step at a time, instead of rendered to a movie
+        render_interactive(SceneToShow, tuple(args[1:4]), {"quality": "medium_quality"})
+        exit(0)
+    if "web" in options:
+        # Same layout as the video, but replayed in a browser instead of rendered
+        export_web(SceneToShow(args[1], args[2], args[3]).fa, options["web"], Path(args[1]).stem)
+        exit(0)
+
+    render_config = {"quality": "medium_quality", "preview": True}
+    scene_factory, render_config, draft = preflight_from_options(options, SceneToShow, tuple(args[1:4]), render_config)
+    if options.get("draft", False) or draft:
+        render_draft(scene_factory, tuple(args[1:4]), Path(args[1]).stem)
+        exit(0)
 
-    with tempconfig({"quality": "medium_quality", "preview": True}):
-        scene = SceneToShow(sys.argv[1], sys.argv[2], sys.argv[3])
-        scene.render()
+    cache = segment_cache_from_options(options)
+    if options.get("long", False):
+        render_long(scene_factory, tuple(args[1:4]), render_config, "SceneToShow")
+    elif "resolutions" in options:
+        render_multi_resolution(scene_factory, tuple(args[1:4]), render_config, options["resolutions"], "SceneToShow")
+    elif options.get("parallel", 1) > 1 or cache is not None:
+        render_parallel(scene_factory, tuple(args[1:4]), render_config, options.get("parallel", 1), "SceneToShow", cache)
+    else:
+        with tempconfig(render_config):
+            scene = scene_factory(args[1], args[2], args[3])
+            render_recorded(scene)
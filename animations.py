@@ -1,17 +1,122 @@
 __all__ = {
-    "ApplyReverseWave"
+    "ApplyReverseWave",
+    "InPlaceAnimation",
+    "TransitionAnimation",
+    "Translate",
+    "Recolor",
+    "CountUp"
 }
 
 from typing import Callable, Tuple
 
 import numpy as np
 
+from manim.animation.animation import Animation
 from manim.animation.movement import Homotopy
-from manim.utils.rate_functions import smooth
+from manim.utils.rate_functions import smooth, linear
 from manim.utils.bezier import interpolate, inverse_interpolate
+from manim.utils.color.core import ManimColor
 from manim.utils.space_ops import normalize
-from manim.constants import UP
+from manim.constants import UP, LEFT, RIGHT
 from manim.mobject.mobject import Mobject
+from manim.mobject.text.numbers import Integer
+from manim.mobject.types.vectorized_mobject import VGroup
+
+
+def smooth_array(t: np.ndarray, inflection: float = 10.0) -> np.ndarray:
+    """
+    Manim's smooth() rate function, but for a whole array of times at once
+    """
+    error = 1 / (1 + np.exp(inflection / 2))
+    return np.clip((1 / (1 + np.exp(-inflection * (t - 0.5))) - error) / (1 - 2 * error), 0, 1)
+
+
+def reverse_wave_array(t: np.ndarray, ripples: int = 1) -> np.ndarray:
+    """
+    The wave() function inside ApplyReverseWave, evaluated for a whole array of phases.
+    Uses smooth() as the wave function.
+    """
+    t = np.asarray(t, dtype=float)
+    out = np.zeros_like(t)
+    inside = (t > 0) & (t < 1)
+
+    phases = ripples * 2
+    phase = np.floor(t * phases).astype(int)
+
+    first = inside & (phase == 0)
+    last = inside & (phase == phases - 1)
+    middle = inside & ~first & ~last
+
+    # First rising ripple
+    out[first] = smooth_array(t[first] * phases)
+
+    # Last ripple, rising or falling depending on the number of ripples
+    t_last = t[last] - phase[last] / phases
+    out[last] = (1 - smooth_array(t_last * phases)) * (2 * (ripples % 2) - 1)
+
+    # Longer phases in between
+    half_phase = (phase[middle] - 1) // 2
+    t_middle = t[middle] - (2 * half_phase + 1) / phases
+    out[middle] = (1 - 2 * smooth_array(t_middle * ripples)) * (1 - 2 * (half_phase % 2))
+
+    return out
+
+
+
+def color_arrays(member: Mobject) -> tuple[str, str]:
+    """
+    The names of a VMobject's fill and stroke color arrays, which the OpenGL renderer's VMobjects name
+    differently (fill_rgba rather than fill_rgbas)
+    """
+    if hasattr(member, "fill_rgbas"):
+        return "fill_rgbas", "stroke_rgbas"
+    return "fill_rgba", "stroke_rgba"
+
+
+def color_table_entry(mobject: Mobject, color: ManimColor, planned: dict | None = None):
+    """
+    Precomputes everything needed to fade the family of mobject to color, the way FadeToColor
+    would, without copying anything.
+
+    Returns ``(members, start fills, end fills, start strokes, end strokes)``, or None if the
+    family already has that color. Opacities are kept, like set_color() does.
+
+    planned maps id(member) to the colors a member will have by the time this entry starts. It is
+    updated in place, so a chain of recolors on overlapping families can be precomputed in one go.
+    """
+    if planned is None:
+        planned = dict()
+
+    rgb = ManimColor.parse(color).to_rgb()
+    members = mobject.family_members_with_points()
+    start_fill, end_fill, start_stroke, end_stroke = [], [], [], []
+    for member in members:
+        fill_name, stroke_name = color_arrays(member)
+        fill, stroke = planned.get(id(member), (getattr(member, fill_name), getattr(member, stroke_name)))
+        new_fill = np.array(fill, dtype=float)
+        new_fill[:, :3] = rgb
+        new_stroke = np.array(stroke, dtype=float)
+        new_stroke[:, :3] = rgb
+
+        start_fill.append(np.array(fill, dtype=float))
+        end_fill.append(new_fill)
+        start_stroke.append(np.array(stroke, dtype=float))
+        end_stroke.append(new_stroke)
+        planned[id(member)] = (new_fill, new_stroke)
+
+    if all(np.array_equal(a, b) for a, b in zip(start_fill + start_stroke, end_fill + end_stroke)):
+        return None
+    return members, start_fill, end_fill, start_stroke, end_stroke
+
+
+def apply_color_table_entry(entry, t: float) -> None:
+    if entry is None:
+        return
+    members, start_fill, end_fill, start_stroke, end_stroke = entry
+    for j, member in enumerate(members):
+        fill_name, stroke_name = color_arrays(member)
+        setattr(member, fill_name, interpolate(start_fill[j], end_fill[j], t))
+        setattr(member, stroke_name, interpolate(start_stroke[j], end_stroke[j], t))
 
 
 class ApplyReverseWave(Homotopy):
@@ -67,3 +172,236 @@ class ApplyReverseWave(Homotopy):
             return np.array([x, y, z]) + nudge
 
         super().__init__(homotopy, mobject, run_time=run_time, **kwargs)
+
+
+class InPlaceAnimation(Animation):
+    """
+    An Animation that changes its mobject in place, from state it keeps itself.
+
+    Animation.begin() copies the whole mobject family to interpolate from, which is most of the cost of
+    a short animation on a big graph or ledger. begin() here copies nothing: it calls on_begin, suspends
+    updating like Animation.begin() does, then prepare(), where a subclass stores whatever it needs to
+    interpolate, and draws the first frame.
+
+    Parameters
+    ----------
+    mobject
+        The mobject to animate
+    on_begin
+        Optional function called when the animation begins, before anything else
+    """
+
+    def __init__(self, mobject: Mobject, on_begin: Callable[[], None] | None = None, **kwargs):
+        self.on_begin = on_begin
+        super().__init__(mobject, **kwargs)
+
+    def begin(self) -> None:
+        if self.on_begin is not None:
+            self.on_begin()
+        if self.suspend_mobject_updating:
+            self.mobject.suspend_updating()
+        self.prepare()
+        self.interpolate(0)
+
+    def prepare(self) -> None:
+        """
+        Called when the animation begins, right before its first frame
+        """
+
+
+class TransitionAnimation(InPlaceAnimation):
+    """
+    One step of an automaton in a single Animation: the edge wave of ApplyReverseWave,
+    followed by a sequence of recolors that would otherwise each be a FadeToColor.
+
+    Replaces a Succession of one ApplyReverseWave and several FadeToColors. Nothing is copied
+    when the animation begins; the original edge points and one table of start/end colors for
+    every affected submobject are stored as arrays, and each frame only writes the arrays of the
+    phase that is currently running.
+
+    Parameters
+    ----------
+    edge
+        The mobject to wave
+    recolors
+        A list of ``(mobject, color)`` pairs. Each one gets its own phase after the wave, in order,
+        and recolors the whole family of the mobject just like FadeToColor
+    direction
+        The direction of the wave
+    wave_run_time
+        How long the wave lasts, matching ApplyReverseWave's run_time
+    recolor_run_time
+        How long each recolor lasts, matching FadeToColor's run_time
+    on_begin
+        Optional function called when the step starts playing, for example to report it
+    """
+
+    def __init__(
+        self,
+        edge: Mobject,
+        recolors: list[tuple[Mobject, ManimColor]] | None = None,
+        direction: np.ndarray = UP,
+        amplitude: float = 0.2,
+        time_width: float = 1,
+        ripples: int = 1,
+        wave_run_time: float = 2,
+        recolor_run_time: float = 1,
+        on_begin: Callable[[], None] | None = None,
+        **kwargs
+    ):
+        recolors = recolors if recolors is not None else []
+        self.edge = edge
+        self.recolors = recolors
+        self.vect = amplitude * normalize(direction)
+        self.time_width = time_width
+        self.ripples = ripples
+
+        # Phase boundaries, as fractions of the whole animation
+        total_time = wave_run_time + len(recolors) * recolor_run_time
+        self.wave_end = wave_run_time / total_time
+        self.recolor_phases = [
+            ((wave_run_time + i * recolor_run_time) / total_time, (wave_run_time + (i + 1) * recolor_run_time) / total_time)
+            for i in range(len(recolors))
+        ]
+
+        mobjects = [edge]
+        for mob, _ in recolors:
+            if mob not in mobjects:
+                mobjects.append(mob)
+
+        super().__init__(VGroup(*mobjects), on_begin=on_begin, run_time=total_time, rate_func=linear, **kwargs)
+
+    def prepare(self) -> None:
+        left = self.edge.get_left()[0]
+        right = self.edge.get_right()[0]
+        self.x_min, self.x_max = left, right if right != left else left + 1
+
+        self.edge_points = [(mob, mob.points.copy()) for mob in self.edge.family_members_with_points()]
+        self.wave_done = False
+
+        # Later phases start from the colors earlier phases leave behind, e.g. a label recolored with its vertex.
+        # A recolor to the color something already has comes back as None; it is skipped but keeps its time slot.
+        planned: dict[int, tuple[np.ndarray, np.ndarray]] = dict()
+        self.color_table = [color_table_entry(mob, color, planned) for mob, color in self.recolors]
+        self.color_done = [entry is None for entry in self.color_table]
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        if alpha < self.wave_end:
+            self._wave(smooth(alpha / self.wave_end))
+        elif not self.wave_done:
+            for mob, points in self.edge_points:
+                mob.points = points.copy()
+            self.wave_done = True
+
+        for i, (start, end) in enumerate(self.recolor_phases):
+            if self.color_done[i] or alpha <= start:
+                continue
+            if alpha >= end:
+                t = 1
+                self.color_done[i] = True
+            else:
+                t = smooth((alpha - start) / (end - start))
+            apply_color_table_entry(self.color_table[i], t)
+
+    def _wave(self, t: float) -> None:
+        upper = interpolate(0, 1 + self.time_width, t)
+        lower = upper - self.time_width
+        for mob, points in self.edge_points:
+            relative_x = (points[:, 0] - self.x_max) / (self.x_min - self.x_max)
+            wave_phase = (relative_x - lower) / (upper - lower)
+            mob.points = points + reverse_wave_array(wave_phase, self.ripples)[:, None] * self.vect
+
+
+class Translate(InPlaceAnimation):
+    """
+    Moves a mobject by a fixed vector without copying it, unlike ``mobject.animate.shift()``.
+
+    Parameters
+    ----------
+    mobject
+        The mobject to move
+    vector
+        Either the vector itself, or a function returning it. A function is only called when
+        the animation begins, so it can depend on where things are at that point
+    on_begin
+        Optional function called right before the vector is resolved, for example to recycle
+        mobjects before they start moving
+    """
+
+    def __init__(
+        self,
+        mobject: Mobject,
+        vector: np.ndarray | Callable[[], np.ndarray],
+        on_begin: Callable[[], None] | None = None,
+        **kwargs
+    ):
+        self.vector = vector
+        super().__init__(mobject, on_begin=on_begin, **kwargs)
+
+    def prepare(self) -> None:
+        self.resolved_vector = np.array(self.vector() if callable(self.vector) else self.vector, dtype=float)
+        self.applied = 0
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha)
+        self.mobject.shift((t - self.applied) * self.resolved_vector)
+        self.applied = t
+
+
+class Recolor(InPlaceAnimation):
+    """
+    Fades the family of a mobject to a color, like FadeToColor.
+
+    Only the fill and stroke colors are interpolated and nothing is copied, so it is cheap and can run
+    at the same time as something else that moves the same mobject (FadeToColor would pin it in place).
+    """
+
+    def __init__(self, mobject: Mobject, color: ManimColor, **kwargs):
+        self.color = color
+        super().__init__(mobject, **kwargs)
+
+    def prepare(self) -> None:
+        self.entry = color_table_entry(self.mobject, self.color)
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        apply_color_table_entry(self.entry, self.rate_func(alpha))
+
+
+class CountUp(InPlaceAnimation):
+    """
+    Shows a counter that counts from 1 up to count over the course of the animation, then hides it again.
+    Used as the "×N" overlay while a fast-forwarded cycle plays.
+
+    Parameters
+    ----------
+    counter
+        The counter to show. Its last submobject must be the Integer that counts; anything before it (like
+        a "×" sign) is left alone
+    count
+        What to count up to
+    anchor
+        The counter is placed above the top right corner of this when the animation begins
+    """
+
+    def __init__(self, counter: Mobject, count: int, anchor: Mobject, **kwargs):
+        self.count = count
+        self.anchor = anchor
+        super().__init__(counter, rate_func=linear, remover=True, **kwargs)
+
+    def prepare(self) -> None:
+        self.number: Integer = self.mobject.submobjects[-1]
+        self.mobject.next_to(self.anchor.get_corner(UP + RIGHT), UP + LEFT)
+        self.mobject.set_opacity(1)
+        self.shown = None
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        if alpha >= 1:
+            # Hidden rather than removed, so it doesn't linger between fast-forwards played in the same Succession
+            self.mobject.set_opacity(0)
+            return
+
+        value = min(self.count, 1 + int(alpha * self.count))
+        if value != self.shown:
+            # Integer keeps its left edge in place when its value changes
+            self.number.set_value(value)
+            self.shown = value
@@ -0,0 +1,166 @@
+__all__ = [
+    "RENDER_OPTIONS",
+    "RENDER_USAGE",
+    "pixel_heights",
+    "pixel_width_for",
+    "preflight_from_options",
+    "progress_from_options",
+    "renderer_name",
+    "split_options",
+    "segment_cache_from_options"
+]
+
+# Standard Library
+import sys
+from typing import Callable
+
+# Internal
+from preflight import preflight
+from progress import emit, open_progress
+from renderers import RENDERERS
+from segment_cache import DEFAULT_MAX_BYTES, SegmentCache
+
+
+def split_options(argv: list[str], options: dict[str, Callable]) -> tuple[list[str], dict]:
+    """
+    Pulls "--name value" options out of a command line, so the scripts can keep checking their
+    positional arguments by count like they always have.
+
+    options maps each option name (without the dashes) to the function that converts its value, e.g.
+    {"parallel": int}. Options converted by bool are switches that take no value. Returns the remaining
+    arguments (still starting with the script name) and a dict of the options that were given.
+    """
+    positional = []
+    given = dict()
+
+    args = iter(argv)
+    for arg in args:
+        name = arg.removeprefix("--")
+        if not arg.startswith("--") or name not in options:
+            positional.append(arg)
+            continue
+
+        if options[name] is bool:
+            given[name] = True
+            continue
+
+        value = next(args, None)
+        if value is None:
+            print(f"Option --{name} needs a value")
+            sys.exit(1)
+        try:
+            given[name] = options[name](value)
+        except ValueError:
+            print(f"Invalid value for --{name}: {value}")
+            sys.exit(1)
+
+    return positional, given
+
+
+def segment_cache_from_options(options: dict) -> SegmentCache | None:
+    """
+    The segment cache asked for with --cache (and optionally --cache-size in megabytes), if any
+    """
+    if not options.get("cache", False) and "cache-size" not in options:
+        return None
+    return SegmentCache(max_bytes=options.get("cache-size", DEFAULT_MAX_BYTES // 1024 ** 2) * 1024 ** 2)
+
+
+def progress_from_options(options: dict) -> None:
+    """
+    Starts the progress event stream asked for with --progress TARGET (see progress.ProgressStream), if any
+    """
+    if "progress" not in options:
+        return
+    try:
+        open_progress(options["progress"])
+    except (OSError, ValueError) as e:
+        print(f"Can't report progress to {options['progress']}: {e}")
+        sys.exit(1)
+    emit("job_start", argv=sys.argv)
+
+
+def pixel_heights(value: str) -> list[int]:
+    """
+    Converts a --resolutions value like "480,1080" (or "480p,1080p") into pixel heights
+    """
+    heights = [int(part.strip().removesuffix("p")) for part in value.split(",") if part.strip() != ""]
+    if len(heights) == 0 or any(height <= 0 for height in heights):
+        raise ValueError(value)
+    return heights
+
+
+def pixel_width_for(pixel_height: int, aspect_ratio: float) -> int:
+    """
+    The pixel width that goes with pixel_height at aspect_ratio. Video encoders want even dimensions
+    """
+    return 2 * round(pixel_height * aspect_ratio / 2)
+
+
+def renderer_name(value: str) -> str:
+    """
+    Checks a --renderer value against the renderers the scripts support
+    """
+    name = value.strip().lower()
+    if name not in RENDERERS:
+        raise ValueError(value)
+    return name
+
+
+# The options animate.py, interpreter.py and ledger.py all take, for split_options(). Each script adds its own
+RENDER_OPTIONS = {
+    "parallel": int,
+    "cache": bool,
+    "cache-size": int,
+    "draft": bool,
+    "resolutions": pixel_heights,
+    "long": bool,
+    "renderer": renderer_name,
+    "progress": str,
+    "estimate": bool,
+    "budget": float,
+    "reject-over-budget": bool,
+    "deadline": float
+}
+
+# How RENDER_OPTIONS are shown at the end of each script's usage line
+RENDER_USAGE = (
+    "[--parallel N] [--cache] [--cache-size MB] [--draft] [--resolutions H,H,...] [--long] "
+    "[--renderer cairo|opengl] [--progress TARGET] [--estimate] [--budget SECONDS] [--reject-over-budget] "
+    "[--deadline SECONDS]"
+)
+
+
+def preflight_from_options(
+    options: dict,
+    scene_factory: Callable,
+    scene_args: tuple,
+    render_config: dict
+) -> tuple[Callable, dict, bool]:
+    """
+    The pre-flight check asked for with --estimate or --budget SECONDS (see preflight.preflight()). Exits
+    right after the estimate with --estimate, and when the job is over budget with --reject-over-budget.
+    --deadline SECONDS picks the resolution and frame rate from measured render speed instead of
+    render_config's quality (see deadline.fit_deadline()), and takes the place of --budget.
+
+    Returns the scene factory and render config to use, and whether to make a draft instead; the ones
+    passed in (and False) when none of these options were given.
+    """
+    # Imported here because deadline imports this module for pixel_width_for
+    from deadline import fit_deadline
+
+    if not options.get("estimate", False):
+        if options.get("draft", False):
+            # A draft is as cheap as a render gets already
+            return scene_factory, render_config, False
+        if "deadline" in options:
+            return fit_deadline(scene_factory, scene_args, render_config, options["deadline"])
+        if "budget" not in options:
+            return scene_factory, render_config, False
+
+    fitted = preflight(scene_factory, scene_args, render_config, options.get("budget", 0), options.get("reject-over-budget", False))
+    if options.get("estimate", False):
+        sys.exit(0)
+    if fitted is None:
+        sys.exit(1)
+    return fitted
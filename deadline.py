@@ -0,0 +1,193 @@
+__all__ = [
+    "LADDER",
+    "DeadlineSettings",
+    "ProbeRenderer",
+    "fit_deadline",
+    "fit_settings",
+    "measure_frame_cost"
+]
+
+# Standard Library
+import tempfile
+from functools import partial
+from time import perf_counter
+from typing import Callable, NamedTuple
+
+# Manim
+from manim._config import config, tempconfig
+from manim.mobject.mobject import Mobject
+from manim.scene.scene import Scene
+
+# Internal
+from cli import pixel_width_for
+from preflight import CostModel, SceneComplexity, compressed_scene, load_history
+from progress import emit
+from static_layer import StaticLayerRenderer
+
+
+# Pixel heights and frame rates to pick from, best first. The top is high_quality, the bottom low_quality
+LADDER = (
+    (1080, 60),
+    (1080, 30),
+    (720, 30),
+    (720, 24),
+    (480, 24),
+    (480, 15),
+    (360, 15)
+)
+
+# Wall-clock seconds spent rendering the start of the scene to measure what a frame really costs
+PROBE_SECONDS = 4.0
+
+# Fewer frames than this in the probe are too few to go by
+MIN_PROBE_FRAMES = 10
+
+
+class DeadlineSettings(NamedTuple):
+    pixel_width: int
+    pixel_height: int
+    frame_rate: int
+    run_budget: float  # Seconds the run is compressed to (see the [planner] duration_budget), 0 if it isn't
+    seconds: float  # Predicted wall-clock time
+
+    def render_config(self, render_config: dict) -> dict:
+        """
+        render_config with its quality swapped for these settings
+        """
+        fitted = {key: value for key, value in render_config.items() if key != "quality"}
+        return {**fitted, "pixel_width": self.pixel_width, "pixel_height": self.pixel_height, "frame_rate": self.frame_rate}
+
+    def describe(self) -> str:
+        compressed = f", run compressed to {self.run_budget:.0f} s" if self.run_budget > 0 else ""
+        return f"{self.pixel_height}p{self.frame_rate}{compressed}: about {self.seconds:.0f} s to render"
+
+
+def fit_settings(complexity: SceneComplexity, model: CostModel, seconds: float, aspect_ratio: float) -> DeadlineSettings | None:
+    """
+    The best settings on the LADDER that render a scene in seconds. If none of them do, the run is
+    compressed at the bottom of the ladder. None if even that doesn't fit.
+    """
+    for pixel_height, frame_rate in LADDER:
+        pixel_width = pixel_width_for(pixel_height, aspect_ratio)
+        predicted = model.predict(complexity, pixel_width, pixel_height, frame_rate)
+        if predicted <= seconds:
+            return DeadlineSettings(pixel_width, pixel_height, frame_rate, 0, predicted)
+
+    if complexity.compressible_seconds <= 0:
+        return None
+    movie_seconds = model.max_frames(complexity, pixel_width, pixel_height, seconds) / frame_rate
+    run_budget = complexity.compressible_seconds - (complexity.movie_seconds - movie_seconds)
+    if run_budget < 1:
+        return None
+    return DeadlineSettings(pixel_width, pixel_height, frame_rate, run_budget, seconds)
+
+
+class _ProbeFinished(Exception):
+    pass
+
+
+class ProbeRenderer(StaticLayerRenderer):
+    """
+    A StaticLayerRenderer that stops the scene once it has spent probe_seconds drawing and encoding
+    frames, and keeps how many it got through
+    """
+
+    def __init__(self, probe_seconds: float, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.probe_seconds = probe_seconds
+        self.frames = 0
+        self.started: float | None = None  # When the first frame was drawn
+
+    def render(self, scene: Scene, time: float, moving_mobjects: list[Mobject]) -> None:
+        if self.started is None:
+            self.started = perf_counter()
+        super().render(scene, time, moving_mobjects)
+        self.frames += 1
+        if perf_counter() - self.started >= self.probe_seconds:
+            raise _ProbeFinished()
+
+
+def measure_frame_cost(scene: Scene, probe_seconds: float = PROBE_SECONDS) -> float | None:
+    """
+    Renders the start of a scene that hasn't played yet, at the resolution and frame rate in the config,
+    for probe_seconds, encoding included, and returns the seconds each frame took. None if the scene drew
+    too few frames to tell. Give the config a temporary partial_movie_dir, so nothing is left behind.
+    """
+    # A renderer made now draws at the config's resolution, whatever it was when the scene was built
+    renderer = ProbeRenderer(probe_seconds, camera_class=type(scene.renderer.camera))
+    renderer.init_scene(scene)
+    scene.renderer = renderer
+    try:
+        # Not Scene.render(), which would finish the movie
+        scene.setup()
+        scene.construct()
+    except _ProbeFinished:
+        # Waits for the encoder to catch up, so encoding is part of the measurement
+        renderer.file_writer.end_animation(allow_write=True)
+    finished = perf_counter()
+
+    if renderer.frames < MIN_PROBE_FRAMES:
+        return None
+    return (finished - renderer.started) / renderer.frames
+
+
+def fit_deadline(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    deadline: float
+) -> tuple[Callable[..., Scene], dict, bool]:
+    """
+    Picks the pixel height, frame rate and, if need be, the run's length that get a scene rendered
+    within deadline seconds of wall-clock time, counted from now.
+
+    The scene is built and measured (see SceneComplexity), and the cost model (calibrated from earlier
+    renders) picks a first guess. The start of that same scene is then rendered at the guess for a few
+    seconds (see measure_frame_cost()), the model is rescaled to the per-frame cost measured there, and
+    the settings are picked again for the time that's left. The scene factory is only called once more,
+    for the render itself.
+
+    Returns the scene factory and render config to render with, and whether to make a draft instead,
+    like preflight.preflight().
+    """
+    started = perf_counter()
+    model = CostModel.calibrated(load_history())
+
+    with tempfile.TemporaryDirectory() as partial_movie_dir:
+        with tempconfig({**render_config, "partial_movie_dir": partial_movie_dir, "disable_caching": True, "preview": False}):
+            scene = scene_factory(*scene_args)
+            complexity = scene.complexity()
+            aspect_ratio = config.pixel_width / config.pixel_height
+
+            guess = fit_settings(complexity, model, deadline, aspect_ratio)
+            pixel_height, frame_rate = LADDER[-1] if guess is None else (guess.pixel_height, guess.frame_rate)
+            pixel_width = pixel_width_for(pixel_height, aspect_ratio)
+            with tempconfig(DeadlineSettings(pixel_width, pixel_height, frame_rate, 0, 0).render_config(dict())):
+                frame_seconds = measure_frame_cost(scene)
+
+    if frame_seconds is not None:
+        predicted = model.frame_seconds(complexity, pixel_width, pixel_height)
+        print(f"Measured {frame_seconds * 1000:.0f} ms per frame at {pixel_height}p{frame_rate} (estimated {predicted * 1000:.0f} ms)")
+        emit("probe", pixel_height=pixel_height, frame_rate=frame_rate, frame_seconds=round(frame_seconds, 4), estimated=round(predicted, 4))
+        model = model.rescaled(complexity, pixel_width, pixel_height, frame_seconds)
+
+    remaining = deadline - (perf_counter() - started)
+    settings = fit_settings(complexity, model, remaining, aspect_ratio)
+    if settings is None:
+        print(f"Falling back to a draft to render within {deadline:.0f} s")
+        emit("deadline", draft=True, remaining=round(remaining, 1))
+        return scene_factory, render_config, True
+
+    print(f"Rendering at {settings.describe()} ({remaining:.0f} s left of {deadline:.0f} s)")
+    emit(
+        "deadline",
+        pixel_height=settings.pixel_height,
+        frame_rate=settings.frame_rate,
+        run_budget=round(settings.run_budget, 1),
+        seconds=round(settings.seconds, 1),
+        remaining=round(remaining, 1)
+    )
+    if settings.run_budget > 0:
+        planner = {"fast_forward": True, "duration_budget": settings.run_budget}
+        return partial(compressed_scene, scene_factory, planner), settings.render_config(render_config), False
+    return scene_factory, settings.render_config(render_config), False
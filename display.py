@@ -1,33 +1,28 @@
 import sys
 import tomllib
-import json
-from manim._config import tempconfig
+from pathlib import Path
 
-from manim.scene.scene import Scene
+from manim._config import config, tempconfig
+from manim.utils.file_ops import open_file
 
-from fa_manager import DFA_Manager, TM_Manager, NFA_Manager
+from export import export_png, manager_from_file
 
 
-class SceneToShow(Scene):
-    def __init__(self, fa_filename, config_filename, in_string):
-        super().__init__()
+def display(fa_filename, config_filename, in_string) -> Path:
+    """
+    Draws the graph of an automaton straight to a PNG and opens it. Only one frame is drawn, so no
+    movie is rendered or encoded.
+    """
+    with open(config_filename, "rb") as f:
+        visual_config = tomllib.load(f)
 
-        with open(fa_filename, "rb") as f:
-            fa_json = json.load(f)
-        with open(config_filename, "rb") as f:
-            self.config = tomllib.load(f)
+    fa = manager_from_file(fa_filename, visual_config, in_string)
+    fa.show_mobj(fa.graph_key)
 
-        if fa_json["fa_type"] == "dfa":
-            self.fa = DFA_Manager.from_json(fa_json, config=self.config, input_string=in_string)
-        elif fa_json["fa_type"] == "tm":
-            self.fa = TM_Manager.from_json(fa_json, config=self.config, input_string=in_string)
-        elif fa_json["fa_type"] == "nfa":
-            self.fa = NFA_Manager.from_json(fa_json, config=self.config, input_string=in_string)
-
-    def construct(self):
-        self.camera.background_color = self.config["scene"]["background_color"]
-        self.fa.show_mobj("dfa")
-        self.add(self.fa.mobj)
+    path = Path(config.media_dir) / "images" / f"{Path(fa_filename).stem}.png"
+    export_png(fa.mobj[fa.graph_key], path, visual_config["scene"]["background_color"])
+    open_file(path)
+    return path
 
 
 if __name__ == "__main__":
@@ -35,6 +30,5 @@ if __name__ == "__main__":
         print("Usage: py display.py <fa_filename> <config_filename> <input_string>")
         exit(1)
 
-    with tempconfig({"quality": "high_quality", "preview": True}):
-        scene = SceneToShow(sys.argv[1], sys.argv[2], sys.argv[3])
-        scene.render()
+    with tempconfig({"quality": "high_quality"}):
+        display(sys.argv[1], sys.argv[2], sys.argv[3])
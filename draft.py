@@ -0,0 +1,132 @@
+__all__ = [
+    "DraftRenderer",
+    "contact_sheet",
+    "render_draft"
+]
+
+# Standard Library
+from pathlib import Path
+from typing import Callable
+
+# Dependencies
+import numpy as np
+from PIL import Image, ImageDraw
+
+# Manim
+from manim._config import config, tempconfig
+from manim.mobject.mobject import Mobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene import Scene
+from manim.utils.file_ops import open_file
+
+
+# Width in pixels of each keyframe on a contact sheet
+THUMBNAIL_WIDTH = 320
+
+DEFAULT_COLUMNS = 4
+
+
+class DraftRenderer(CairoRenderer):
+    """
+    A CairoRenderer that skips every animation straight to its end state and keeps one small picture
+    of the scene after each play. Nothing in between is drawn and nothing is encoded.
+
+    play_steps() plays one step per play under this renderer, so there is a keyframe for every step.
+    Keyframes that look the same as the one before (like after a wait) are dropped.
+    """
+
+    keyframe_every_step = True
+
+    def __init__(self, *args, **kwargs):
+        kwargs["skip_animations"] = True
+        super().__init__(*args, **kwargs)
+        self.keyframes: list[tuple[int, Image.Image]] = []  # (play number, thumbnail)
+        self._last_thumbnail: np.ndarray = None
+
+    def save_static_frame_data(self, scene: Scene, static_mobjects: list[Mobject]) -> None:
+        # Only the end of each play is drawn, so there is no background worth keeping
+        self.static_image = None
+        return None
+
+    def play(self, scene: Scene, *args, **kwargs) -> None:
+        play_number = self.num_plays
+        super().play(scene, *args, **kwargs)
+
+        self.update_frame(scene)
+        image = self.camera.get_image().convert("RGB")
+        image.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_WIDTH))
+
+        thumbnail = np.asarray(image)
+        if self._last_thumbnail is not None and np.array_equal(thumbnail, self._last_thumbnail):
+            return
+        self._last_thumbnail = thumbnail
+        self.keyframes.append((play_number, image))
+
+
+def contact_sheet(keyframes: list[tuple[int, Image.Image]], columns: int = DEFAULT_COLUMNS) -> Image.Image:
+    """
+    Lays keyframes out in a grid, left to right and top to bottom, each labeled with its play number
+    (the number to pass as from_animation_number to render from there). One column gives a filmstrip.
+    """
+    if len(keyframes) == 0:
+        raise ValueError("No keyframes to put on a contact sheet")
+
+    width = max(image.width for _, image in keyframes)
+    height = max(image.height for _, image in keyframes)
+    label_height = 16
+    columns = max(1, min(columns, len(keyframes)))
+    rows = -(-len(keyframes) // columns)
+
+    sheet = Image.new("RGB", (columns * width, rows * (height + label_height)), "white")
+    draw = ImageDraw.Draw(sheet)
+    for i, (play_number, image) in enumerate(keyframes):
+        x = (i % columns) * width
+        y = (i // columns) * (height + label_height)
+        sheet.paste(image, (x, y))
+        draw.text((x + 4, y + height + 2), f"#{play_number}", fill="black")
+
+    return sheet
+
+
+def render_draft(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    output_name: str,
+    columns: int = DEFAULT_COLUMNS,
+    preview: bool = True
+) -> Path:
+    """
+    Runs a scene with a DraftRenderer and saves the keyframes as one contact sheet PNG in the media
+    images folder. Takes about as long as drawing one frame per step, so layout and step mistakes
+    show up in seconds rather than after a full render.
+    """
+    with tempconfig({
+        "quality": "low_quality",
+        "preview": False,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True
+    }):
+        scene = scene_factory(*scene_args)
+
+        # The scenes build their own renderer, so the draft one is swapped in before anything plays
+        renderer = DraftRenderer()
+        renderer.init_scene(scene)
+        scene.renderer = renderer
+        scene.render()
+
+        if len(renderer.keyframes) == 0:
+            # Nothing was played, so the draft is the one still frame
+            renderer.update_frame(scene)
+            image = renderer.camera.get_image().convert("RGB")
+            image.thumbnail((THUMBNAIL_WIDTH, THUMBNAIL_WIDTH))
+            renderer.keyframes.append((0, image))
+
+        path = Path(config.media_dir) / "images" / f"{output_name}_draft.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        contact_sheet(renderer.keyframes, columns).save(path)
+
+    print(f"Draft of {len(renderer.keyframes)} keyframes saved to {path}")
+    if preview:
+        open_file(path)
+    return path
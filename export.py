@@ -0,0 +1,272 @@
+__all__ = [
+    "export_mobject",
+    "export_png",
+    "export_svg",
+    "manager_from_file",
+    "svg_document",
+    "svg_transform"
+]
+
+# Standard Library
+import json
+import sys
+import tomllib
+from pathlib import Path
+from typing import Callable
+from xml.sax.saxutils import quoteattr
+
+# Dependencies
+import numpy as np
+
+# Manim
+from manim._config import config
+from manim.camera.camera import Camera
+from manim.constants import RendererType
+from manim.mobject.mobject import Mobject
+from manim.mobject.types.vectorized_mobject import VMobject
+from manim.utils.color import ManimColor
+from manim.utils.family import extract_mobject_family_members
+
+# Internal
+from cli import split_options
+from fa_manager import Auto_Manager, DFA_Manager, NFA_Manager, TM_Manager
+
+
+# Empty space left around an exported component, in Manim units
+DEFAULT_MARGIN = 0.25
+
+EXPORT_FORMATS = {".png", ".svg"}
+
+
+def _frame(mobject: Mobject, margin: float) -> tuple[np.ndarray, float, float]:
+    """
+    The center, width and height of the smallest frame that fits the mobject with `margin` to spare
+    on every side
+    """
+    return mobject.get_center(), mobject.width + 2 * margin, mobject.height + 2 * margin
+
+
+def export_png(
+    mobject: Mobject,
+    path: Path,
+    background_color: str = "black",
+    margin: float = DEFAULT_MARGIN,
+    pixels_per_unit: float | None = None
+) -> Path:
+    """
+    Draws a mobject with a Cairo camera framed around it and saves the picture as a PNG. Nothing is
+    added to a scene and no movie is written, so this takes about as long as drawing one frame.
+
+    pixels_per_unit defaults to the pixel density of the current quality setting, so an exported
+    component is as sharp as it would be in a video.
+    """
+    if pixels_per_unit is None:
+        pixels_per_unit = config.pixel_width / config.frame_width
+
+    center, width, height = _frame(mobject, margin)
+    camera = Camera(
+        frame_center=center,
+        frame_width=width,
+        frame_height=height,
+        pixel_width=max(1, round(width * pixels_per_unit)),
+        pixel_height=max(1, round(height * pixels_per_unit)),
+        background_color=ManimColor(background_color)
+    )
+    camera.capture_mobject(mobject)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    camera.get_image().save(path)
+    return path
+
+
+def _svg_color(rgba: np.ndarray) -> tuple[str, float]:
+    red, green, blue = (np.clip(rgba[:3], 0, 1) * 255).round().astype(int)
+    return f"#{red:02x}{green:02x}{blue:02x}", float(rgba[3])
+
+
+def _svg_path_data(vmobject: VMobject, to_svg) -> str:
+    """
+    The path of a VMobject as an SVG "d" attribute. Manim stores paths as runs of cubic Bézier
+    curves, which map one to one onto SVG's C command
+    """
+    commands = []
+    for subpath in vmobject.get_subpaths():
+        if len(subpath) < vmobject.n_points_per_cubic_curve:
+            continue
+        points = [to_svg(point) for point in subpath]
+        commands.append("M {:.4f} {:.4f}".format(*points[0]))
+        for i in range(0, len(points) - 3, vmobject.n_points_per_cubic_curve):
+            commands.append("C {:.4f} {:.4f} {:.4f} {:.4f} {:.4f} {:.4f}".format(*points[i + 1], *points[i + 2], *points[i + 3]))
+        if vmobject.consider_points_equals_2d(subpath[0], subpath[-1]):
+            commands.append("Z")
+    return " ".join(commands)
+
+
+def _svg_paint(vmobject: VMobject, background: bool, units_per_stroke: float) -> str:
+    """
+    The fill and stroke attributes of a VMobject. Gradients are flattened to their first color
+    """
+    attributes = []
+
+    fill, fill_opacity = _svg_color(vmobject.get_fill_rgbas()[0])
+    if background or fill_opacity == 0:
+        attributes.append('fill="none"')
+    else:
+        attributes.append(f'fill="{fill}" fill-opacity="{fill_opacity:.3f}"')
+
+    stroke, stroke_opacity = _svg_color(vmobject.get_stroke_rgbas(background=background)[0])
+    stroke_width = vmobject.get_stroke_width(background=background)
+    if stroke_opacity == 0 or stroke_width == 0:
+        attributes.append('stroke="none"')
+    else:
+        attributes.append(
+            f'stroke="{stroke}" stroke-opacity="{stroke_opacity:.3f}" stroke-width="{stroke_width * units_per_stroke:.4f}" '
+            'stroke-linejoin="round" stroke-linecap="round"'
+        )
+
+    return " ".join(attributes)
+
+
+def svg_transform(mobject: Mobject, margin: float = DEFAULT_MARGIN, units_per_inch: float = 1.0) -> tuple[Callable, float, float]:
+    """
+    How svg_document() maps Manim coordinates into the picture of a mobject: a function from a
+    point to (x, y) in SVG user units, and the width and height of the picture in those units
+    """
+    center, width, height = _frame(mobject, margin)
+    scale = 96 * units_per_inch  # SVG user units are CSS pixels, 96 to the inch
+    left, top = center[0] - width / 2, center[1] + height / 2
+
+    def to_svg(point: np.ndarray) -> tuple[float, float]:
+        # Manim's y axis points up, SVG's points down
+        return (point[0] - left) * scale, (top - point[1]) * scale
+
+    return to_svg, width * scale, height * scale
+
+
+def svg_document(
+    mobject: Mobject,
+    background_color: str | None = "black",
+    margin: float = DEFAULT_MARGIN,
+    units_per_inch: float = 1.0,
+    classes: dict[Mobject, str] | None = None
+) -> str:
+    """
+    A mobject as SVG markup, made by walking the Bézier path data of every VMobject in its family
+    in the same order the Cairo camera draws them. Text and arrow tips stay vectors, so the picture
+    can be scaled to any size. Mobjects without paths (like images) are left out.
+
+    classes gives the paths of some submobjects a class attribute, so they can be found again in a
+    browser. Every path in the family of a key gets its class; list outer mobjects before the ones
+    inside them, since the last matching key wins.
+    """
+    to_svg, svg_width, svg_height = svg_transform(mobject, margin, units_per_inch)
+    # Manim stroke widths are hundredths of a unit (see Camera.cairo_line_width_multiple)
+    units_per_stroke = 0.01 * 96 * units_per_inch
+
+    class_of = dict()
+    for tagged, name in (classes or dict()).items():
+        for member in tagged.get_family():
+            class_of[member] = name
+
+    elements = []
+    if background_color is not None:
+        background, opacity = _svg_color(ManimColor(background_color).to_rgba())
+        elements.append(f'<rect width="100%" height="100%" fill="{background}" fill-opacity="{opacity:.3f}"/>')
+
+    for mob in extract_mobject_family_members([mobject], use_z_index=True, only_those_with_points=True):
+        if not isinstance(mob, VMobject):
+            continue
+        d = _svg_path_data(mob, to_svg)
+        if d == "":
+            continue
+        tag = f" class={quoteattr(class_of[mob])}" if mob in class_of else ""
+        if mob.get_stroke_width(background=True) > 0:
+            elements.append(f'<path d={quoteattr(d)}{tag} {_svg_paint(mob, True, units_per_stroke)}/>')
+        elements.append(f'<path d={quoteattr(d)}{tag} {_svg_paint(mob, False, units_per_stroke)}/>')
+
+    return "\n".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{svg_width:.2f}" height="{svg_height:.2f}" '
+        f'viewBox="0 0 {svg_width:.2f} {svg_height:.2f}" fill-rule="nonzero">',
+        *elements,
+        "</svg>",
+        ""
+    ])
+
+
+def export_svg(
+    mobject: Mobject,
+    path: Path,
+    background_color: str | None = "black",
+    margin: float = DEFAULT_MARGIN,
+    units_per_inch: float = 1.0
+) -> Path:
+    """
+    Writes a mobject as an SVG file (see svg_document()). One Manim unit becomes units_per_inch
+    inches in the file. background_color None leaves the background transparent.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(svg_document(mobject, background_color, margin, units_per_inch))
+    return path
+
+
+def export_mobject(mobject: Mobject, path: Path, background_color: str = "black", **kwargs) -> Path:
+    """
+    Exports a mobject as a PNG or SVG, going by the file extension of path
+    """
+    if config.renderer == RendererType.OPENGL:
+        raise ValueError("Exporting needs mobjects built for the Cairo renderer; run without --renderer opengl")
+
+    suffix = Path(path).suffix.lower()
+    if suffix == ".png":
+        return export_png(mobject, path, background_color, **kwargs)
+    if suffix == ".svg":
+        return export_svg(mobject, path, background_color, **kwargs)
+    raise ValueError(f"Can't export to {path}: expected one of {', '.join(sorted(EXPORT_FORMATS))}")
+
+
+def manager_from_file(fa_filename: str, config: dict, input_string: str = "") -> Auto_Manager:
+    with open(fa_filename, "rb") as f:
+        fa_json = json.load(f)
+
+    match fa_json["fa_type"].lower():
+        case "dfa":
+            return DFA_Manager.from_json(fa_json, config=config, input_string=input_string)
+        case "nfa":
+            return NFA_Manager.from_json(fa_json, config=config, input_string=input_string)
+        case "tm":
+            return TM_Manager.from_json(fa_json, config=config, input_string=input_string)
+        case _:
+            raise TypeError(f'JSON claims type {fa_json["fa_type"]}, which is not a valid type.')
+
+
+if __name__ == "__main__":
+    args, options = split_options(sys.argv, {"out": Path, "format": str, "component": str, "input": str})
+
+    if len(args) < 3:
+        print("Usage: py export.py <config_filename> <fa_filename> [fa_filename ...] "
+              "[--out FILE_OR_DIR] [--format png|svg] [--component NAME] [--input STRING]")
+        exit(1)
+
+    with open(args[1], "rb") as f:
+        visual_config = tomllib.load(f)
+    background_color = visual_config["scene"]["background_color"]
+
+    fa_filenames = args[2:]
+    out = options.get("out", Path(config.media_dir) / "images")
+    suffix = "." + options["format"].lower().lstrip(".") if "format" in options else None
+    if len(fa_filenames) == 1 and out.suffix != "":
+        # A single automaton exported straight to the file named by --out
+        targets = [out]
+    else:
+        targets = [out / f"{Path(name).stem}{suffix or '.png'}" for name in fa_filenames]
+    if suffix is not None:
+        targets = [target.with_suffix(suffix) for target in targets]
+
+    for fa_filename, target in zip(fa_filenames, targets):
+        manager = manager_from_file(fa_filename, visual_config, options.get("input", ""))
+        component = options.get("component", manager.graph_key)
+        manager.show_mobj(component)
+        export_mobject(manager.mobj[component], target, background_color)
+        print(f"Exported the {component} of {fa_filename} to {target}")
@@ -2,7 +2,8 @@
 import json
 import tomllib
 import os
-from typing import Callable
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator
 from pathlib import Path
 
 # Dependencies
@@ -14,6 +15,7 @@ from automata.tm.tape import TMTape
 from automata.fa.nfa import NFA, NFAStateT
 
 from manim.mobject.types.vectorized_mobject import VDict, VGroup
+from manim.animation.animation import Animation
 from manim.animation.composition import Succession, AnimationGroup
 
 from jsonschema import validate
@@ -22,6 +24,10 @@ from numpy.typing import NDArray
 
 # Internal
 from finite_automaton import FiniteAutomaton
+from ledger import LedgerView
+from planner import COMPONENT_STEP_SECONDS, TRANSITION_SECONDS, PlannedStep, budget_scale, plan_run, planned_seconds
+from progress import emit, phase
+from run_trace import RunStep, RunTrace
 from text_visuals import ProcessText, TuringTape
 from transition_table import TransitionTable
 
@@ -29,7 +35,7 @@ from transition_table import TransitionTable
 dir_path = Path(os.path.dirname(os.path.realpath(__file__)))
 
 
-class Auto_Manager:
+class Auto_Manager(ABC):
     def __init__(self):
         self.auto: Automaton = None
         self.mobj: VDict = VDict()
@@ -41,6 +47,9 @@ class Auto_Manager:
         self.current_state: AutomatonStateT = None
         self.char_ptr: int = None
 
+        # Computed once per input by run_trace() and shared by every component
+        self.trace: RunTrace = None
+
         # Maps the keys for self.mobj to the internal functions which create each component
         self.how_to_show: dict[str, Callable] = {}
 
@@ -48,7 +57,8 @@ class Auto_Manager:
         return self.mobj.submob_dict.keys()
 
     def show_mobj(self, key: str):
-        self.how_to_show[key]()
+        with phase("build", component=key):
+            self.how_to_show[key]()
         return self
 
     def move_mobj(self, key: str, location: NDArray):
@@ -67,8 +77,107 @@ class Auto_Manager:
         self.mobj[key].scale(size)
         return self
 
+    @abstractmethod
+    def run_trace(self) -> RunTrace:
+        """
+        Every step the automaton takes on the current input. Subclasses say how to compute it.
+        """
+
+    @abstractmethod
+    def animate_steps(self, start: int = 0) -> Iterator[AnimationGroup]:
+        """
+        Yields the animation for each step of the run, building each one only when it is asked for.
+        Subclasses say how. Each animation expects the ones before it to have played already; with start,
+        the components seek() past the first start animations instead, and only the rest are yielded.
+        """
+
+    @abstractmethod
+    def step_count(self) -> int:
+        """
+        How many animations animate_steps() yields
+        """
+
+    @abstractmethod
+    def seek(self, step: int) -> None:
+        """
+        Puts every shown component straight where it is once the first step animations of
+        animate_steps() have played, without building any of them. Only moves forward.
+        """
+
+    def _step_colors(self, step: RunStep) -> dict:
+        """
+        The color each vertex the graph's animation of one step recolors ends up with
+        """
+        theory = self.config["theory"]
+        return {step.before: theory["initial_state_color"], step.after: theory["transition_color"]}
+
+    def _current_states(self, configuration) -> set:
+        return {configuration}
+
+    def _seek_graph(self, trace: RunTrace, end: int) -> None:
+        """
+        Puts the graph where the first end steps of the run leave it. A vertex has the color of the last
+        step that recolored it, so the trace is read backwards only until every vertex has been found.
+        """
+        colors = dict()
+        for i in reversed(range(end)):
+            for state, color in self._step_colors(trace[i]).items():
+                colors.setdefault(state, color)
+            if len(colors) == len(self.states):
+                break
+        self.mobj[self.graph_key].seek(self._current_states(trace.configuration(end)), colors)
+
+    def animate(self) -> Succession:
+        """
+        The whole run as one Succession. Builds every step up front; see playback.play_steps() for playing
+        long runs without doing that.
+        """
+        return Succession(*self.animate_steps())
+
+    def fingerprint(self) -> dict:
+        """
+        Everything that decides how this manager's components are laid out: the automaton, the resolved
+        config, and where each shown component is. What they show of the input is in shown_input(), and
+        what the run does in step_fingerprints(), so segments can be shared between inputs (see
+        playback.segment_fingerprints()).
+        """
+        shown = [key for key, showing in self.showing.items() if showing]
+
+        return {
+            "type": type(self).__name__,
+            "automaton": self.auto.input_parameters if self.auto is not None else None,
+            "config": self.config,
+            "layout": {key: (self.mobj[key].get_center(), self.mobj[key].width, self.mobj[key].height) for key in shown}
+        }
+
+    @abstractmethod
+    def step_fingerprints(self) -> Iterator[list]:
+        """
+        Yields what each animation of animate_steps() does, without building any of them: the steps of the
+        run it covers and anything else that decides how it looks, given where the components are when it
+        starts
+        """
+
+    @abstractmethod
+    def shown_input(self, start: int, stop: int) -> dict:
+        """
+        What the shown components show of the input at some point while animations start through stop - 1
+        of animate_steps() play, or when start is stop, while the run stays there. Anything of it that is
+        still to come, like the next symbol a table follower goes to, counts as shown.
+        """
+
+    def _show_ledger(self):
+        self.run_trace()  # Fails early if there is nothing to run
+
+        self.mobj["ledger"] = LedgerView(self.config)
+        self.showing["ledger"] = True
+
+        return self
+
 
 class DFA_Manager(Auto_Manager):
+    graph_key = "dfa"  # Key of the graph in self.mobj and self.showing
+
     def __init__(
         self,
         config: dict
@@ -77,7 +186,8 @@ class DFA_Manager(Auto_Manager):
         self.mobj: VDict = VDict({
             "dfa": VGroup(),
             "text": VGroup(),
-            "table": VGroup()
+            "table": VGroup(),
+            "ledger": VGroup()
         })
         self.input_string: str = ""
         self.config: dict = config
@@ -85,12 +195,14 @@ class DFA_Manager(Auto_Manager):
         self.how_to_show: dict[str, Callable] = {
             "dfa": self._show_graph_render,
             "text": self._show_process_text,
-            "table": self._show_transition_table
+            "table": self._show_transition_table,
+            "ledger": self._show_ledger
         }
         self.showing: dict[str, bool] = {
             "dfa": False,
             "text": False,
-            "table": False
+            "table": False,
+            "ledger": False
         }
 
         self.states: list[str] = []
@@ -99,12 +211,16 @@ class DFA_Manager(Auto_Manager):
         self.current_state: DFAStateT = None
         self.char_ptr: int = None
 
+        self.trace: RunTrace = None
+        self._planned: tuple = None  # The trace and [planner] config of the last plan(), and the plan
+
     def _show_transition_table(self):
         mobj = TransitionTable(
             self.auto,
             self.config["table"],
             highlight_color=self.config["theory"]["current_state_color"],
-            starting_symbol=self.input_string[0]
+            starting_symbol=self.input_string[0],
+            window=self.config["table"].get("window", 0)
         )
 
         self.mobj["table"] = mobj
@@ -120,6 +236,7 @@ class DFA_Manager(Auto_Manager):
             self.input_string,
             visual_config=self.config["text"],
             highlight_color=self.config["theory"]["current_state_color"],
+            window=self.config["text"].get("window", 0)
         )
 
         self.showing["text"] = True
@@ -174,7 +291,8 @@ class DFA_Manager(Auto_Manager):
     @classmethod
     def from_json(cls, json_object: dict, config: dict = dict(), input_string: str = ""):
         # Throws on failure
-        cls.validate_json(json_object)
+        with phase("validate", fa_type=json_object.get("fa_type")):
+            cls.validate_json(json_object)
         allow_partial = json_object.get("allow_partial", False)
 
         # Config stuff
@@ -221,6 +339,14 @@ class DFA_Manager(Auto_Manager):
 
     def add_input(self, input_str: str) -> None:
         self.input_string = input_str
+        self.trace = None
+
+    def run_trace(self) -> RunTrace:
+        if len(self.input_string) == 0:
+            raise Exception("No input string to run")
+        if self.trace is None:
+            self.trace = RunTrace.from_dfa(self.auto, self.input_string)
+        return self.trace
 
     @classmethod
     def validate_json(cls, json_object: dict) -> None:
@@ -250,41 +376,154 @@ class DFA_Manager(Auto_Manager):
                 if (end := json_object["transitions"][state][symbol]) not in json_object["states"]:
                     raise AttributeError(f"Destination {end} not in states list")
 
-    def animate(self) -> Succession:
-        sequence = []
+    def plan(self) -> list[PlannedStep]:
+        """
+        The steps of the run to animate, with long stretches around the same cycle fast-forwarded
+        according to the [planner] config
+        """
+        trace = self.run_trace()
+        planner_cfg = self.config.get("planner", dict())
+        if self._planned is not None and self._planned[0] is trace and self._planned[1] == planner_cfg:
+            return self._planned[2]
+
+        if not planner_cfg.get("fast_forward", True):
+            plan = plan_run(trace, min_repeats=0)
+        else:
+            plan = plan_run(
+                trace,
+                min_repeats=planner_cfg.get("min_repeats", 3),
+                max_period=planner_cfg.get("max_period", 4)
+            )
+        self._planned = (trace, dict(planner_cfg), plan)
+        return plan
+
+    def step_durations(self, plan: list[PlannedStep]) -> list[float]:
+        """
+        How long the animation of each step of plan lasts unscaled, going by the components that are shown
+        """
+        graph = TRANSITION_SECONDS if self.showing[self.graph_key] else 0
+        ledger = self.config.get("ledger", dict()).get("fade_speed", 0.75) if self.showing["ledger"] else 0
+        return planned_seconds(plan, graph, max(COMPONENT_STEP_SECONDS, ledger))
+
+    def _graph_step(self, step: RunStep) -> Animation:
+        """
+        The graph's animation for one step of the run. Updates which states are current as a side effect
+        """
+        animation = self.mobj["dfa"].transition_animation(step.before, step.after)
+        self.mobj["dfa"].set_current_states({step.after})
+        return animation
+
+    def _next_char(self, end: int) -> str:
+        """
+        The column of the transition table the follower goes to once end characters have been read
+        """
+        return self.input_string[end] if end < len(self.input_string) else "?"
+
+    def _ledger_step(self, planned: PlannedStep, trace: RunTrace) -> RunStep:
+        if planned.fast_forward:
+            return RunStep(trace[planned.start].before, f"$\\times${planned.repeats}", planned.last(trace).after)
+        return planned.last(trace)
+
+    def _scale(self, plan: list[PlannedStep]) -> float:
+        # Every step is sped up by the same amount
+        return budget_scale(self.step_durations(plan), self.config.get("planner", dict()).get("duration_budget", 0))
+
+    def _plan_end(self, plan: list[PlannedStep], step: int) -> int:
+        """
+        How many steps of the run the first step steps of plan cover
+        """
+        return plan[step].start if step < len(plan) else len(self.run_trace())
+
+    def step_count(self) -> int:
+        return len(self.plan())
+
+    def step_fingerprints(self) -> Iterator[list]:
+        trace = self.run_trace()
+        plan = self.plan()
+        scale = self._scale(plan)
+        for planned in plan:
+            yield [planned.period, planned.repeats, scale, planned.cycle(trace), planned.last(trace)]
+
+    def shown_input(self, start: int, stop: int) -> dict:
+        plan = self.plan()
+        first, last = self._plan_end(plan, start), self._plan_end(plan, stop)
+
+        shown = dict()
+        if self.showing["text"]:
+            shown["text"] = self.mobj["text"].shown_text(first, last)
+        if self.showing["table"]:
+            # The follower goes to the column of the next symbol
+            shown["table"] = self.input_string[first:last + 1]
+        return shown
+
+    def seek(self, step: int) -> None:
+        if step == 0:
+            return
+
+        trace = self.run_trace()
+        end = self._plan_end(self.plan(), step)
+        plan = self.plan()[:step]
+
+        if self.showing["text"]:
+            self.mobj["text"].seek(end)
+        if self.showing[self.graph_key]:
+            self._seek_graph(trace, end)
+        if self.showing["table"]:
+            self.mobj["table"].seek([self._table_row(planned.last(trace).after) for planned in plan], self._next_char(end))
+        if self.showing["ledger"]:
+            recent = plan[max(0, len(plan) - self.mobj["ledger"].max_steps):]
+            self.mobj["ledger"].seek([self._ledger_step(planned, trace) for planned in recent], len(plan))
+
+        self.current_state = trace.configuration(end)
+
+    def animate_steps(self, start: int = 0) -> Iterator[AnimationGroup]:
         if len(self.input_string) == 0:
             raise Exception("Can't animate without more than one character")
-        else:
-            for i, next_char in enumerate(self.input_string):
-                next_state = self.auto._get_next_current_state(self.current_state, next_char)
 
-                if len(self.input_string) - i > 1:
-                    next_next_char = self.input_string[i + 1]
+        trace = self.run_trace()
+        plan = self.plan()
+        emit("plan", steps=len(plan), run_length=len(trace))
+        scale = self._scale(plan)
+        self.seek(start)
+
+        for planned in plan[start:]:
+            last = planned.last(trace)
+            end = planned.start + planned.length
+
+            animation_queue = []
+            if self.showing["text"]:
+                animation_queue.append(self.mobj["text"].RemoveCharacters(planned.length))
+            if self.showing[self.graph_key]:
+                if planned.fast_forward:
+                    cycle = [self._graph_step(step) for step in planned.cycle(trace)]
+                    animation_queue.append(self.mobj[self.graph_key].fast_forward_animation(cycle, planned.repeats))
                 else:
-                    next_next_char = "?"
+                    animation_queue.append(self._graph_step(last))
+            if self.showing["table"]:
+                animation_queue.append(self.mobj["table"].follower_animation(self._table_row(last.after), self._next_char(end)))
+            if self.showing["ledger"]:
+                animation_queue.append(self.mobj["ledger"].step_animation(self._ledger_step(planned, trace)))
 
-                animation_queue = []
-                if self.showing["text"]:
-                    animation_queue.append(self.mobj["text"].RemoveOneCharacter())
-                if self.showing["dfa"]:
-                    animation_queue.append(self.mobj["dfa"].transition_animation(self.current_state, next_state))
-                if self.showing["table"]:
-                    animation_queue.append(self.mobj["table"].animate.move_follower(next_state, next_next_char))
+            group = AnimationGroup(*animation_queue)
+            group.run_time *= scale
 
-                sequence.append(AnimationGroup(*animation_queue))
+            yield group
 
-                if self.showing["dfa"]:
-                    self.mobj["dfa"].remove_flag(self.current_state, "c")
-                    self.mobj["dfa"].add_flag(next_state, "c")
-                if self.showing["text"]:
-                    self.mobj["text"].increment_letter()
+            if self.showing["text"]:
+                self.mobj["text"].increment_letter()
 
-                self.current_state = next_state
+            self.current_state = last.after
 
-        return Succession(*sequence)
+    def _table_row(self, configuration) -> str:
+        """
+        The row of the transition table the follower goes to for a configuration of the run
+        """
+        return configuration
 
 
 class NFA_Manager(DFA_Manager):
+    graph_key = "nfa"
+
     # TODO change validation criteria
     def __init__(
         self,
@@ -294,7 +533,8 @@ class NFA_Manager(DFA_Manager):
         self.mobj: VDict = VDict({
             "nfa": VGroup(),
             "text": VGroup(),
-            "table": VGroup()
+            "table": VGroup(),
+            "ledger": VGroup()
         })
         self.input_string: str = ""
         self.config: dict = config
@@ -302,12 +542,14 @@ class NFA_Manager(DFA_Manager):
         self.how_to_show: dict[str, Callable] = {
             "nfa": self._show_graph_render,
             "text": self._show_process_text,
-            "table": self._show_transition_table
+            "table": self._show_transition_table,
+            "ledger": self._show_ledger
         }
         self.showing: dict[str, bool] = {
             "nfa": False,
             "text": False,
-            "table": False
+            "table": False,
+            "ledger": False
         }
 
         self.states: list[str] = []
@@ -316,6 +558,9 @@ class NFA_Manager(DFA_Manager):
         self.current_state: NFAStateT = None
         self.char_ptr: int = None
 
+        self.trace: RunTrace = None
+        self._planned: tuple = None  # The trace and [planner] config of the last plan(), and the plan
+
     # def _show_transition_table(self):
     #     mobj = TransitionTable(
     #         self.auto,
@@ -383,24 +628,27 @@ class NFA_Manager(DFA_Manager):
 
         return self
 
-    # @classmethod
-    # def _json_to_mobj_edges(cls, transitions: dict) -> dict:
-    #     edges = dict()
+    @classmethod
+    def _json_to_mobj_edges(cls, transitions: dict) -> dict:
+        edges = dict()
 
-    #     for start, symbols in transitions.items():
-    #         for symbol, end in symbols.items():
-    #             if (start, end) in edges:
-    #                 # An edge already exists, but with a different symbol ... hrm, this is a dictionary
-    #                 edges[(start, end)]["label"] += f", {symbol}"
-    #             else:
-    #                 edges[(start, end)] = {"label": symbol}
+        # Unlike a DFA, each symbol leads to a set of states, so one symbol can produce several edges
+        for start, symbols in transitions.items():
+            for symbol, ends in symbols.items():
+                for end in ends:
+                    if (start, end) in edges:
+                        # An edge already exists, but with a different symbol
+                        edges[(start, end)]["label"] += f", {symbol}"
+                    else:
+                        edges[(start, end)] = {"label": symbol}
 
-    #     return edges
+        return edges
 
     @classmethod
     def from_json(cls, json_object: dict, config: dict = dict(), input_string: str = ""):
         # Throws on failure
-        cls.validate_json(json_object)
+        with phase("validate", fa_type=json_object.get("fa_type")):
+            cls.validate_json(json_object)
         allow_partial = json_object.get("allow_partial", False)
 
         # Config stuff
@@ -489,40 +737,50 @@ class NFA_Manager(DFA_Manager):
                 # if (end := json_object["transitions"][state][symbol]) not in json_object["states"]: #change this... "Destination ['1','2'] not in states list"
                 #    raise AttributeError(f"Destination {end} not in states list")
 
-    def animate(self) -> Succession:
-        sequence = []
+    def run_trace(self) -> RunTrace:
         if len(self.input_string) == 0:
-            raise Exception("Can't animate without more than one character")
-        else:
-            for i, next_char in enumerate(self.input_string):
-                next_state = self.auto._get_next_current_state(self.current_state, next_char)
-
-                if len(self.input_string) - i > 1:
-                    next_next_char = self.input_string[i + 1]
-                else:
-                    next_next_char = "?"
-
-                animation_queue = []
-                if self.showing["text"]:
-                    animation_queue.append(self.mobj["text"].RemoveOneCharacter())
-                if self.showing["nfa"]:
-                    animation_queue.append(self.mobj["nfa"].transition_animation(self.current_state, next_state))
-                if self.showing["table"]:
-                    animation_queue.append(self.mobj["table"].animate.move_follower(next_state, next_next_char))
-
-                sequence.append(AnimationGroup(*animation_queue))
-
-                if self.showing["nfa"]:
-                    self.mobj["nfa"].remove_flag(self.current_state, "c")
-                    self.mobj["nfa"].add_flag(next_state, "c")
-                if self.showing["text"]:
-                    self.mobj["text"].increment_letter()
-
-                self.current_state = next_state
-
-        return Succession(*sequence)
-
-        # need to do stuff with this animation
+            raise Exception("No input string to run")
+        if self.trace is None:
+            self.trace = RunTrace.from_nfa(self.auto, self.input_string)
+        return self.trace
+
+    def _table_row(self, configuration) -> str:
+        return min(configuration, default=self.auto.initial_state)
+
+    def _graph_step(self, step: RunStep) -> Animation:
+        # An NFA is in a set of states (its frontier) rather than a single one
+        animations = []
+        for start in step.before:
+            for end in self.auto.transitions.get(start, dict()).get(step.symbol, set()):
+                animations.append(self.mobj["nfa"].transition_animation(start, end))
+
+        entered, left = self.mobj["nfa"].set_current_states(step.after)
+        animations.append(self.mobj["nfa"].highlight_animation(entered, left))
+        return AnimationGroup(*animations)
+
+    def _step_colors(self, step: RunStep) -> dict:
+        # Like _graph_step(): the transitions taken recolor their ends over their starts, and the states
+        # that entered or left the frontier are recolored over both
+        theory = self.config["theory"]
+        colors = dict()
+        ends = set()
+        for start in step.before:
+            targets = self.auto.transitions.get(start, dict()).get(step.symbol, set())
+            if len(targets) > 0:
+                colors[start] = theory["initial_state_color"]
+            ends |= set(targets)
+        colors.update({end: theory["transition_color"] for end in ends})
+        colors.update({state: theory["initial_state_color"] for state in step.before - step.after})
+        colors.update({state: theory["transition_color"] for state in step.after - step.before})
+        return colors
+
+    def _current_states(self, configuration) -> set:
+        return set(configuration)
+
+    def animate_steps(self, start: int = 0) -> Iterator[AnimationGroup]:
+        if start == 0 and self.showing["nfa"] and len(self.input_string) > 0:
+            self.mobj["nfa"].set_current_states(self.run_trace().initial)
+        yield from super().animate_steps(start)
 
 
 class PDA_Manager(Auto_Manager):
@@ -530,6 +788,8 @@ class PDA_Manager(Auto_Manager):
 
 
 class TM_Manager(Auto_Manager):
+    graph_key = "tm"
+
     def __init__(
         self,
         config: dict = dict(),
@@ -540,23 +800,27 @@ class TM_Manager(Auto_Manager):
         self.mobj = VDict({
             "tm": VGroup(),
             "tape": VGroup(),
-            "table": VGroup()
+            "table": VGroup(),
+            "ledger": VGroup()
         })
 
         self.how_to_show: dict[str, Callable] = {
             "tm": self._show_graph_render,
             "tape": self._show_tape,
-            "table": self._show_transition_table
+            "table": self._show_transition_table,
+            "ledger": self._show_ledger
         }
         self.showing: dict[str, bool] = {
             "tm": False,
             "tape": False,
-            "table": False
+            "table": False,
+            "ledger": False
         }
 
         self.states = []
         self.input_symbols = []
         self.tape_symbols = []
+        self.input_string: str = ""
         self.tape: TMTape = None
 
         self.max_iter = max_iter
@@ -565,6 +829,8 @@ class TM_Manager(Auto_Manager):
         self.config = config
         self.tm_config = None
 
+        self.trace: RunTrace = None
+
     def add_automaton(self, auto: DTM):
         self.auto = auto
 
@@ -585,11 +851,26 @@ class TM_Manager(Auto_Manager):
         if self.auto is None:
             raise Exception("Can't add an input string without an automaton")
 
+        self.input_string = input_string
         self.tape = TMTape(list(input_string), self.blank_symbol)
         self.tm_config = TMConfiguration(self.auto.initial_state, self.tape)
+        self.trace = None
 
         return self
 
+    def fingerprint(self) -> dict:
+        # How long a run is allowed to go on changes what gets animated
+        return {**super().fingerprint(), "max_iter": self.max_iter}
+
+    def run_trace(self) -> RunTrace:
+        if self.tape is None:
+            raise Exception("No input tape to run")
+        if self.trace is None:
+            self.trace = RunTrace.from_tm(self.auto, self.tape, self.max_iter)
+            if self.trace.truncated:
+                print(f"Maximum iterations reached: the run is cut off after {len(self.trace)} steps")
+        return self.trace
+
     def _show_graph_render(self):
         edges_with_options = self._json_to_mobj_edges(self.auto.transitions)
 
@@ -633,7 +914,8 @@ class TM_Manager(Auto_Manager):
             self.auto,
             self.config["table"],
             highlight_color=self.config["theory"]["current_state_color"],
-            starting_symbol=self.tape.tape[0]
+            starting_symbol=self.tape.tape[0],
+            window=self.config["table"].get("window", 0)
         )
 
         self.mobj["table"] = mobj
@@ -663,8 +945,15 @@ class TM_Manager(Auto_Manager):
     @classmethod
     def from_json(cls, json_object: dict, config: dict = dict(), input_string: str = ""):
         # Throws on failure
-        cls.validate_json(json_object)
+        with phase("validate", fa_type=json_object.get("fa_type")):
+            cls.validate_json(json_object)
+
+        # Config stuff
+        default_config_path = dir_path / "default_config.toml"
+        with default_config_path.open("rb") as f:
+            default_config = tomllib.load(f)
 
+        config = {**default_config, **config}
         out = cls(config=config, max_iter=50)
 
         auto = DTM(
@@ -725,31 +1014,49 @@ class TM_Manager(Auto_Manager):
                 if final not in json_object["states"]:
                     raise AttributeError(f"Final state {final} not found")
 
-    def animate(self) -> Succession:
-        sequence = []
-        iters = 0
-
-        generator = self.auto.read_input_stepwise(list(self.tape.tape))
-        generator.__next__()  # Gets rid of initial state
-
-        for tm_config in generator:
-            if iters > self.max_iter:
-                print("Maximum iterations reached")
-                break
-
-            next_state = str(tm_config.state)
-            transition = self.auto._get_transition(self.tm_config.state, self.tm_config.tape.read_symbol())
+    def step_count(self) -> int:
+        return len(self.run_trace())
+
+    def step_fingerprints(self) -> Iterator[list]:
+        yield from self.run_trace()
+
+    def shown_input(self, start: int, stop: int) -> dict:
+        shown = dict()
+        if self.showing["tape"]:
+            # Where the window is comes from the steps taken, and the rest of the tape from here
+            tape = self.run_trace().tape_at(start)
+            shown["tape"] = (tape.tape, tape.current_position)
+        if self.showing["table"]:
+            shown["table"] = self.tape.tape[0]
+        return shown
+
+    def seek(self, step: int) -> None:
+        if step == 0:
+            return
+
+        trace = self.run_trace()
+        if self.showing["tape"]:
+            self.mobj["tape"].seek(trace.tape_at(step), [trace.head_at(i) for i in range(step + 1)])
+        if self.showing["tm"]:
+            self._seek_graph(trace, step)
+        if self.showing["ledger"]:
+            self.mobj["ledger"].seek(trace[max(0, step - self.mobj["ledger"].max_steps):step], step)
+
+    def animate_steps(self, start: int = 0) -> Iterator[AnimationGroup]:
+        trace = self.run_trace()
+        emit("plan", steps=len(trace), run_length=len(trace))
+        self.seek(start)
+
+        for i in range(start, len(trace)):
+            step = trace[i]
+            transition = (step.after, step.write, step.move)
 
             animation_queue = []
             if self.showing["tape"]:
                 animation_queue.append(self.mobj["tape"].animate_update(transition))
             if self.showing["tm"]:
-                animation_queue.append(self.mobj["tm"].transition_animation(str(self.tm_config.state), next_state))
-
-            sequence.append(AnimationGroup(*animation_queue))
-
-            self.tm_config = tm_config
-
-            iters += 1
+                animation_queue.append(self.mobj["tm"].transition_animation(step.before, step.after))
+            if self.showing["ledger"]:
+                animation_queue.append(self.mobj["ledger"].step_animation(step))
 
-        return Succession(*sequence)
+            yield AnimationGroup(*animation_queue)
@@ -13,17 +13,22 @@ import numpy as np
 
 # Manim
 from manim.animation.transform import FadeToColor
-from manim.animation.composition import Succession
+from manim.animation.animation import Animation
+from manim.animation.composition import AnimationGroup, Succession
 from manim.animation.movement import MoveAlongPath
+from manim.constants import OUT
 from manim.mobject.graph import DiGraph
 from manim.mobject.geometry.arc import CurvedArrow, Annulus, LabeledDot, Dot
 from manim.mobject.geometry.labeled import LabeledLine, Label
 from manim.mobject.geometry.line import Arrow
+from manim.mobject.text.numbers import Integer
 from manim.mobject.text.tex_mobject import MathTex
 from manim.mobject.types.vectorized_mobject import VGroup, VDict
+from manim.utils.color.core import ManimColor
 
 # Internal
-from animations import ApplyReverseWave
+from animations import CountUp, TransitionAnimation
+from progress import emit
 
 
 def unit_vector(vector):
@@ -56,7 +61,7 @@ class LabeledCurvedArrow(CurvedArrow):
 
         self.add(self.label)
 
-    def rotate(self, angle, axis, about_point=None, **kwargs):
+    def rotate(self, angle, axis=OUT, about_point=None, **kwargs):
         if about_point is None:
             about_point = self.around.get_center()
 
@@ -112,7 +117,7 @@ class FiniteAutomaton(DiGraph):
 
         Supported flags:
             'f': The vertex is a [f]inal state
-            'c': The vertex is the [c]urrent state (one allowed)
+            'c': The vertex is a [c]urrent state (several allowed, for NFA frontiers). See set_current_states()
             'i': The vertex is the [i]nitial state (one allowed)
     """
 
@@ -203,9 +208,17 @@ class FiniteAutomaton(DiGraph):
             self.vertices[k] = VDict({"base": v, "accessories": accessories[k]})
 
         self.flags = _flags
+        self.current_states: set = {k for k, v in _flags.items() if "c" in v}
         self.visual_config = visual_config
         self.vertex_config = _vertex_config
         self._init_vertices()
+        self._build_edge_index()
+
+        self._fast_forward_counter: VGroup = None  # Built the first time a cycle is fast-forwarded
+
+        # update_edges() only redraws edges whose vertices moved, and vertices only move when they are
+        # animated, so the graph can stay in a StaticBackgroundScene's static layer despite the updater
+        self.static_updaters = True
 
     def __repr__(self) -> str:
         return f"Directed Graph with labeled edges with\
@@ -237,6 +250,7 @@ class FiniteAutomaton(DiGraph):
         labels: dict[(str, str), str]
     ) -> None:
         self.edges = dict()  # dictionary with start edge and ending edges
+        self._edge_label_positions = dict()  # Used by update_edges() to put labels back in place
         general_edge_config = {k: v for k, v in edge_config.items() if isinstance(k, str)}
         specific_edge_config = {k: v for k, v in edge_config.items() if isinstance(k, tuple)}
 
@@ -279,6 +293,7 @@ class FiniteAutomaton(DiGraph):
                             box_config=this_edge_config["label"]["box"],
                             frame_config=this_edge_config["label"]["frame"],
                         ).shift(offset)
+                        self._edge_label_positions[(u, bv)] = this_edge_config["label"]["label_position"]
 
                         for label in [x for x in self.edges[(u, bv)].submobjects if isinstance(x, Label)]:
                             label.scale(this_edge_config["label"]["font_size"] / 48)
@@ -326,6 +341,7 @@ class FiniteAutomaton(DiGraph):
                         box_config=this_edge_config["label"]["box"],
                         frame_config=this_edge_config["label"]["frame"],
                     ).shift(offset)
+                    self._edge_label_positions[(u, v)] = this_edge_config["label"]["label_position"]
 
                     for label in [x for x in self.edges[(u, v)].submobjects if isinstance(x, Label)]:
                         label.scale(this_edge_config["label"]["font_size"] / 48)
@@ -382,21 +398,13 @@ class FiniteAutomaton(DiGraph):
 
         self.add(*self.vertices.values())
 
-    def _redraw_vertices(self) -> None:
+    def _redraw_vertex(self, state: str) -> None:
         """
-        for vertex, opts in self.flags.items():
-            # The initial and final states should not change for the duration of the animation,
-            #   so they are not handled here. See _init_vertices()
-            if "c" in opts:
-                self.vertices[vertex]["base"].set_color(self.visual_config["current_state_color"])
-                self.vertices[vertex]["base"].submobjects[0].set_color(self.visual_config["vertex_text_color"])
-            else:
-                self.vertices[vertex]["base"].set_color(self.visual_config["vertex_color"])
-                self.vertices[vertex]["base"].submobjects[0].set_color(self.visual_config["vertex_text_color"])
+        Brings a single vertex back on top of the edges after its flags change.
+        Only the one VDict is re-added, so the rest of the draw order is left alone.
         """
-
-        self.remove(*self.vertices.values())
-        self.add(*self.vertices.values())
+        self.remove(self.vertices[state])
+        self.add(self.vertices[state])
 
     def _arrow_from(self, edge: LabeledLine | CurvedArrow) -> None:
         return Arrow(
@@ -404,50 +412,205 @@ class FiniteAutomaton(DiGraph):
             stroke_width=15
         ).put_start_and_end_on(*edge.get_start_and_end())
 
+    def _build_edge_index(self) -> None:
+        """
+        Precomputes everything update_edges() needs so the per-frame work is a handful of
+        array operations instead of a Python walk over every edge.
+
+        Vertex centers live in one (V, 3) array, straight edges are stored as index pairs
+        into that array, and the multi-edge test ``(v, u) in edges`` is answered once here.
+        """
+        self._vertex_keys: list = list(self.vertices.keys())
+        vertex_pos: dict = {k: i for i, k in enumerate(self._vertex_keys)}
+
+        self._straight_edges: list = [(u, v) for (u, v) in self.edges if u != v]
+        self._loop_edges: list = [(u, v) for (u, v) in self.edges if u == v]
+
+        self._edge_u = np.array([vertex_pos[u] for (u, _) in self._straight_edges], dtype=int)
+        self._edge_v = np.array([vertex_pos[v] for (_, v) in self._straight_edges], dtype=int)
+        self._edge_has_reverse = np.array(
+            [(v, u) in self.edges for (u, v) in self._straight_edges],
+            dtype=bool
+        )
+        self._edge_label_position = np.array(
+            [self._edge_label_positions.get(e, 0.5) for e in self._straight_edges],
+            dtype=float
+        )
+
+        self._loop_u = np.array([vertex_pos[u] for (u, _) in self._loop_edges], dtype=int)
+
+        self._vertex_centers = self._gather_vertex_centers()
+        self._loop_centers = self._gather_loop_centers()
+
+    def _gather_vertex_centers(self) -> np.ndarray:
+        return np.array(
+            [self.vertices[k]["base"].get_center() for k in self._vertex_keys],
+            dtype=float
+        ).reshape(-1, 3)
+
+    def _gather_loop_centers(self) -> np.ndarray:
+        return np.array(
+            [self.edges[e].get_center() for e in self._loop_edges],
+            dtype=float
+        ).reshape(-1, 3)
+
+    def edge_geometry(self, centers: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the start and end point of every straight edge at once.
+
+        Rows line up with self._straight_edges. Edges between the same two vertices in both
+        directions are pushed apart by 0.1 along the normal, exactly like in _repopulate_edge_dict().
+        """
+        if centers is None:
+            centers = self._gather_vertex_centers()
+
+        tails = centers[self._edge_u]
+        heads = centers[self._edge_v]
+        vec = heads - tails
+
+        # np.cross(vec, [0, 0, 1]) for every row
+        normal = np.stack([vec[:, 1], -vec[:, 0], np.zeros(len(vec))], axis=1)
+        length = np.linalg.norm(vec, axis=1)
+        safe_length = np.where(length > 0, length, 1)[:, None]
+
+        offsets = np.where(self._edge_has_reverse[:, None], 0.1 * normal / safe_length, 0)
+        buff = self.vertex_config["radius"] * vec / safe_length
+
+        return tails + buff + offsets, heads - buff + offsets
+
     def update_edges(self, graph):
         """
-        The GitHub has been updated to fix an issue since the last release of Manim
+        Keeps the edges stuck to their vertices whenever the vertices move.
 
-        This is just a copy of that
+        Runs as an updater on every frame, so the geometry for all straight edges is computed in
+        one batch by edge_geometry(), and only edges touching a vertex that actually moved since
+        the last frame get their points rewritten.
+
+        A self-loop that was moved, scaled or rotated along with its vertex (like when the whole
+        graph is) is already in place. Only loops left behind by a vertex that moved on its own are
+        shifted, by as much as the vertex moved.
         """
-        for (u, v), edge in graph.edges.items():
-            if u != v:
-                if (v, u) in graph.edges:
-                    # We need to offset two edges between the same vertices
-                    vec1 = self[v].get_center() - self[u].get_center()
-                    vec2 = np.cross(vec1, np.array([0, 0, 1]))
-
-                    length = np.linalg.norm(vec2)
-                    offset = 0.1 * vec2 / length  # TODO: Make configurable?
-                else:
-                    offset = np.array([0, 0, 0])
+        centers = graph._gather_vertex_centers()
+        moved = np.any(np.abs(centers - graph._vertex_centers) > 1e-8, axis=1)
+        if not moved.any():
+            return
+
+        deltas = centers - graph._vertex_centers
+        graph._vertex_centers = centers
+
+        if len(graph._straight_edges) > 0:
+            dirty = np.flatnonzero(moved[graph._edge_u] | moved[graph._edge_v])
+            starts, ends = graph.edge_geometry(centers)
+            label_points = starts + graph._edge_label_position[:, None] * (ends - starts)
 
+            for i in dirty:
+                edge = graph.edges[graph._straight_edges[i]]
                 tip = edge.pop_tips()[0]
-                edge.set_points_by_ends(
-                    graph[u]["base"].get_center() + np.dot(offset, np.array([1, 0, 0])),
-                    graph[v]["base"].get_center() + np.dot(offset, np.array([0, 1, 0])),
-                    buff=self.vertex_config["radius"],
-                    path_arc=0
-                )
+                edge.set_points_by_ends(starts[i], ends[i], buff=0, path_arc=0)
                 edge.add_tip(tip)
+                edge.label.move_to(label_points[i])
+
+        if len(graph._loop_edges) > 0:
+            loop_centers = graph._gather_loop_centers()
+            left_behind = ~np.any(np.abs(loop_centers - graph._loop_centers) > 1e-8, axis=1)
+            for i in np.flatnonzero(moved[graph._loop_u] & left_behind):
+                graph.edges[graph._loop_edges[i]].shift(deltas[graph._loop_u[i]])
+            graph._loop_centers = graph._gather_loop_centers()
 
     def add_flag(self, state: str, flag: str) -> None:
         assert state in self.vertices, "State does not exist"
-        assert flag not in self.flags[state], f"Flag {flag} already applied to state {state}"
+        assert flag not in self.flags.get(state, []), f"Flag {flag} already applied to state {state}"
 
-        self.flags[state].append(flag)
-        self._redraw_vertices()
+        self.flags.setdefault(state, []).append(flag)
+        if flag == "c":
+            self.current_states.add(state)
+        self._redraw_vertex(state)
 
     def remove_flag(self, state: str, flag: str) -> None:
         assert state in self.vertices, "State does not exist"
-        assert flag in self.flags[state], f"Flag {flag} not applied to state {state}"
+        assert flag in self.flags.get(state, []), f"Flag {flag} not applied to state {state}"
 
         self.flags[state].remove(flag)
-        self._redraw_vertices()
+        if flag == "c":
+            self.current_states.discard(state)
+        self._redraw_vertex(state)
+
+    def set_current_states(self, states) -> tuple[set, set]:
+        """
+        Moves the current-state flag ('c') onto exactly the given states.
+
+        Only the vertices whose flag actually changes are touched: a DFA step costs at most two
+        vertex updates, and an NFA step costs the size of the difference between two frontiers.
+
+        Returns the states that were entered and the states that were left, in that order.
+        """
+        new_states = set(states)
+        entered = new_states - self.current_states
+        left = self.current_states - new_states
+
+        for state in left:
+            self.remove_flag(state, "c")
+        for state in entered:
+            self.add_flag(state, "c")
+
+        return entered, left
 
-    def transition_animation(self, start: str, end: str) -> Succession:
+    def seek(self, current_states, colors: dict[str, ManimColor]) -> None:
+        """
+        Puts the graph straight where a run leaves it, without animating anything: current_states get the
+        current-state flag, and every vertex in colors is recolored to its color, with its label back in the
+        label color like transition_animation() leaves it.
+        """
+        self.set_current_states(current_states)
+
+        label_color = self.visual_config["graph"]["vertex"]["label"]["color"]
+        for state, color in colors.items():
+            self.vertices[state]["base"].set_color(color)
+            self.vertices[state]["base"].submobjects[0].set_color(label_color)
+
+    def highlight_animation(self, entered, left) -> AnimationGroup:
+        """
+        Recolors only the vertices that entered or left the current frontier.
+        Uses the same colors as transition_animation().
+        """
+        label_color = self.visual_config["graph"]["vertex"]["label"]["color"]
+        animations = []
+        for state in left:
+            animations.append(FadeToColor(self.vertices[state]["base"], color=self.visual_config["theory"]["initial_state_color"]))
+        for state in entered:
+            animations.append(FadeToColor(self.vertices[state]["base"], color=self.visual_config["theory"]["transition_color"]))
+        for state in [*left, *entered]:
+            animations.append(FadeToColor(self.vertices[state]["base"].submobjects[0], label_color))
+
+        return AnimationGroup(*animations)
+
+    def fast_forward_animation(self, cycle: list[Animation], repeats: int) -> AnimationGroup:
+        """
+        Plays the animations for one trip around a cycle, in order, while a "×N" counter above the
+        graph counts up to the number of times the run actually goes around it.
+        """
+        if self._fast_forward_counter is None:
+            font_size = self.visual_config["graph"]["edge"]["label"]["font_size"]
+            color = self.visual_config["theory"]["transition_color"]
+            self._fast_forward_counter = VGroup(
+                MathTex("\\times", color=color, font_size=font_size),
+                Integer(1, color=color, font_size=font_size)
+            ).arrange()
+            self._fast_forward_counter.set_opacity(0)
+
+        trip = Succession(*cycle)
+        return AnimationGroup(
+            trip,
+            CountUp(self._fast_forward_counter, repeats, anchor=self, run_time=trip.run_time)
+        )
+
+    def transition_animation(self, start: str, end: str) -> TransitionAnimation:
+        """
+        Waves the edge from start to end, then fades start back to the initial state color and
+        end to the transition color. The whole step is one TransitionAnimation rather than a
+        Succession of five separate animations.
+        """
         assert (start, end) in self.edges, f"Transition does not exist: {(start, end)}"
-        print(f"Successful transition: ({start}, {end})")
 
         if start != end:
             wiggle_vector = np.cross(self.edges[(start, end)].get_unit_vector(), np.array([0, 0, 1]))
@@ -455,10 +618,17 @@ class FiniteAutomaton(DiGraph):
             # Self-loop requires different vector calculation
             wiggle_vector = np.array([1, 0, 0])
 
-        return Succession(
-            ApplyReverseWave(self.edges[(start, end)], direction=wiggle_vector, color=self.visual_config["theory"]["transition_color"]),
-            FadeToColor(self.vertices[start]["base"], color=self.visual_config["theory"]["initial_state_color"]),
-            FadeToColor(self.vertices[end]["base"], color=self.visual_config["theory"]["transition_color"]),
-            FadeToColor(self.vertices[start]["base"].submobjects[0], self.visual_config["graph"]["vertex"]["label"]["color"]),
-            FadeToColor(self.vertices[end]["base"].submobjects[0], self.visual_config["graph"]["vertex"]["label"]["color"])
+        label_color = self.visual_config["graph"]["vertex"]["label"]["color"]
+
+        return TransitionAnimation(
+            self.edges[(start, end)],
+            direction=wiggle_vector,
+            recolors=[
+                (self.vertices[start]["base"], self.visual_config["theory"]["initial_state_color"]),
+                (self.vertices[end]["base"], self.visual_config["theory"]["transition_color"]),
+                (self.vertices[start]["base"].submobjects[0], label_color),
+                (self.vertices[end]["base"].submobjects[0], label_color)
+            ],
+            # Reported when the step plays, not when it is built ahead of time
+            on_begin=lambda: emit("transition", start=start, end=end)
         )
@@ -3,31 +3,70 @@ import sys
 import os
 import tomllib
 from pathlib import Path
+from typing import Callable
 
-from manim.scene.scene import Scene
 from manim._config import tempconfig
 from manim.animation.creation import Create
 
+from cli import RENDER_OPTIONS, RENDER_USAGE, preflight_from_options, progress_from_options, segment_cache_from_options, split_options
+from draft import render_draft
+from long_render import render_long
+from export import export_mobject
 from fa_manager import Auto_Manager, DFA_Manager, NFA_Manager, TM_Manager
+from multi_resolution import render_multi_resolution
+from parallel_render import render_parallel
+from playback import play_run, scene_plays, segment_fingerprints
+from preflight import SceneComplexity, render_recorded, scene_complexity
+from progress import phase
+from renderers import RENDERERS, render_interactive, wait_for_step
+from segment_cache import SegmentCache
+from static_layer import StaticBackgroundScene
 
 # NOTE: This shouldn't run ridiculously slow, but a potential speedup
 #   I see is running each LOAD instruction concurrently.
 
+dir_path = Path(os.path.dirname(os.path.realpath(__file__)))
 
-class OutputScene(Scene):
+
+class OutputScene(StaticBackgroundScene):
     def __init__(self, showing=False, commands=list()):
         super().__init__()
-        self.animations = list()
+        self.animated_managers = list()  # Managers whose runs are played, in order
         self.showing = showing
         self.managers = dict()  # Format {"name": Auto_Manager}
 
+        # LOAD and LINK paths are relative to the .viz file, so parsing it never depends on (or changes) the cwd
+        self.base_dir = Path(".")
+        self.config_path = dir_path / "default_config.toml"
+
     def construct(self):
-        if len(self.animations) > 0:
-            self.play(*[Create(manager.mobj) for manager in self.managers.values()])
-            for anim in self.animations:
-                self.play(anim)
+        if len(self.animated_managers) > 0:
+            if scene_plays(self, ("intro",)):
+                self.play(*[Create(manager.mobj) for manager in self.managers.values()])
+            else:
+                self.add(*[manager.mobj for manager in self.managers.values()])
+            for manager in self.animated_managers:
+                play_run(self, manager)
         else:
             self.add(*[manager.mobj for manager in self.managers.values()])
+            # Keeps a still picture up in the OpenGL window until a key is pressed
+            wait_for_step(self)
+
+    def cache_fingerprints(self, ranges: list[tuple[int, int]]) -> list[dict]:
+        """
+        What the segment cache keys each range of plays on (see playback.segment_fingerprints()). Every
+        manager is on screen the whole time, so all of them go in, animated or not
+        """
+        return segment_fingerprints(self.segment, ranges, list(self.managers.values()))
+
+    def complexity(self) -> SceneComplexity:
+        if len(self.animated_managers) == 0:
+            return scene_complexity(list(self.managers.values()), [])
+        # The managers are created together in one second before the runs play
+        return scene_complexity(list(self.managers.values()), self.animated_managers, intro_seconds=1, intros=1)
+
+    def run_managers(self) -> list:
+        return list(self.managers.values())
 
 
 def capture_quotes(tokens: list[str], delimiter: str = " ") -> str:
@@ -51,40 +90,41 @@ def capture_quotes(tokens: list[str], delimiter: str = " ") -> str:
 def read_file(pathobj, env):
     with pathobj.open() as f:
         lines = f.readlines()
+    env.base_dir = pathobj.parent
 
-    for i, line in enumerate(lines):
-        try:
-            triageLine(line, env)
-        except SyntaxError as e:
-            raise SyntaxError(f"Line {i}:\n\t{str(e)}")
+    with phase("parse", file=str(pathobj), lines=len(lines)):
+        for i, line in enumerate(lines):
+            try:
+                triageLine(line, env)
+            except SyntaxError as e:
+                raise SyntaxError(f"Line {i}:\n\t{str(e)}")
 
 
 def load_from_file(pathobj, varname, scene, config_file):
-    with pathobj.open() as f:
-        rawJson = json.loads(f.read())
-
-    with config_file.open('rb') as f:
-        config = tomllib.load(f)
-
-    os.chdir("..")
-    match rawJson["fa_type"].lower():
-        case "dfa":
-            created = DFA_Manager.from_json(rawJson, config)
-        case "nfa":
-            created = NFA_Manager.from_json(rawJson) #TODO: config???
-        case "tm":
-            created = TM_Manager.from_json(rawJson)
-        case _:
-            raise TypeError(
-                f'JSON claims type {rawJson["type"]}, which is not a valid type.'
-            )
+    with phase("load", file=str(pathobj), name=varname):
+        with pathobj.open() as f:
+            rawJson = json.loads(f.read())
+
+        with config_file.open('rb') as f:
+            config = tomllib.load(f)
+
+        match rawJson["fa_type"].lower():
+            case "dfa":
+                created = DFA_Manager.from_json(rawJson, config)
+            case "nfa":
+                created = NFA_Manager.from_json(rawJson, config)
+            case "tm":
+                created = TM_Manager.from_json(rawJson, config)
+            case _:
+                raise TypeError(
+                    f'JSON claims type {rawJson["type"]}, which is not a valid type.'
+                )
 
     scene.managers[varname] = created
 
 
 def triageLine(line, scene):
     tokens = line.strip().split(" ")
-    config_path = Path("./default_config.toml")
 
     if line.startswith("# "):
         # It's a comment
@@ -96,9 +136,9 @@ def triageLine(line, scene):
 
         # Theoretically this should allow for spaces in the filename
         filename = capture_quotes(tokens[1:-2])
-        pathobj = Path(filename)
+        pathobj = scene.base_dir / filename
         varname = tokens[-1]
-        load_from_file(pathobj, varname, scene, config_path)
+        load_from_file(pathobj, varname, scene, scene.config_path)
 
     elif line.startswith("SHOW "):
         # SHOW <component> OF <varname>
@@ -164,16 +204,55 @@ def triageLine(line, scene):
         if line.strip() not in ["ANIMATE", "ANIMATE!"]:
             raise SyntaxError("Superfluous characters after ANIMATE command")
 
-        for manager in scene.managers.values():
-            scene.animations.append(manager.animate())
+        scene.animated_managers.extend(scene.managers.values())
+    elif line.startswith("EXPORT "):
+        # EXPORT <component> OF <varname> TO "<filename>"
+        if tokens[2] != "OF":
+            raise SyntaxError("Malformed Command: Missing or mistyped OF keyword")
+        if tokens[4] != "TO":
+            raise SyntaxError("Malformed Command: Missing or mistyped TO keyword")
+        if tokens[3] not in scene.managers:
+            raise KeyError(f"Object {tokens[3]} not recognized.")
+
+        filename = capture_quotes(tokens[5:], ' ')
+
+        manager: Auto_Manager = scene.managers[tokens[3]]
+        if not manager.showing.get(tokens[1], False):
+            manager.show_mobj(tokens[1])
+
+        background_color = manager.config["scene"]["background_color"]
+        export_mobject(manager.mobj[tokens[1]], Path(filename), background_color)
+        print(f"Exported {tokens[1]} of {tokens[3]} to {filename}")
+
+    elif line.startswith("RENDERER "):
+        # RENDERER <cairo|opengl>
+        # Read by file_renderer() before the scene is built; only checked here
+        if len(tokens) != 2:
+            raise SyntaxError(f"Malformed command: too many tokens ({len(tokens)}), expected 2")
+        if tokens[1].lower() not in RENDERERS:
+            raise SyntaxError(f"Unknown renderer {tokens[1]}: expected one of {', '.join(RENDERERS)}")
+
     elif line.startswith("LINK "):
         # LINK <config_filename>
         filename = capture_quotes(tokens[1:], ' ')
 
-        config_path = Path(filename)
+        scene.config_path = scene.base_dir / filename
+
 
+def file_renderer(filename: str) -> str | None:
+    """
+    The renderer a .viz file asks for with RENDERER, if any. Every mobject is built for one renderer,
+    so this has to be known before anything in the file is loaded
+    """
+    with Path(filename).open() as f:
+        for line in f:
+            tokens = line.strip().split(" ")
+            if line.startswith("RENDERER ") and len(tokens) == 2:
+                return tokens[1].lower()
+    return None
 
-def interpret(filename: str) -> None:
+
+def load_scene(filename: str) -> OutputScene:
     scene = OutputScene()
 
     try:
@@ -182,18 +261,86 @@ def interpret(filename: str) -> None:
     except SyntaxError as e:
         raise SyntaxError(f"Viz file {str(infile)}:\n\t{str(e)}")
 
-    with tempconfig({"quality": "low_quality", "preview": True}):
-        scene.render()
+    return scene
+
+
+def interpret(
+    filename: str,
+    parallel: int = 1,
+    cache: SegmentCache | None = None,
+    draft: bool = False,
+    resolutions: list[int] | None = None,
+    long_render: bool = False,
+    renderer: str | None = None,
+    render_config: dict | None = None,
+    scene_factory: Callable[[str], OutputScene] = load_scene
+) -> None:
+    """
+    Renders a .viz file. scene_factory builds the scene from the file name, and render_config (low quality
+    by default) is what it is rendered at; see cli.preflight_from_options() for fitting both into a budget.
+    """
+    if render_config is None:
+        render_config = {"quality": "low_quality", "preview": True}
+
+    # The command line wins over the file
+    if (renderer or file_renderer(filename)) == "opengl":
+        render_interactive(scene_factory, (str(filename),), render_config)
+        return
+    if draft:
+        render_draft(scene_factory, (str(filename),), Path(filename).stem)
+        return
+    if long_render:
+        render_long(scene_factory, (str(filename),), render_config, "OutputScene")
+        return
+    if resolutions is not None:
+        render_multi_resolution(scene_factory, (str(filename),), render_config, resolutions, "OutputScene")
+        return
+
+    if parallel > 1 or cache is not None:
+        # Each segment is rendered from a scene built by parsing the file again
+        render_parallel(scene_factory, (str(filename),), render_config, parallel, "OutputScene", cache)
+        return
+
+    scene = scene_factory(str(filename))
+    if not scene.showing and len(scene.animated_managers) == 0:
+        # Nothing was shown, e.g. a file that only EXPORTs figures
+        print("Nothing to render")
+        return
+
+    with tempconfig(render_config):
+        render_recorded(scene)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) == 1:
+    args, options = split_options(sys.argv, RENDER_OPTIONS)
+    progress_from_options(options)
+
+    if len(args) == 1:
         infile = Path(input("Input file path: "))
-    elif len(sys.argv) == 2:
-        infile = Path(sys.argv[1])
+    elif len(args) == 2:
+        infile = Path(args[1])
     else:
-        print("Usage: py interpreter.py [infile]")
+        print(f"Usage: py interpreter.py [infile] {RENDER_USAGE}")
         infile = ""
         exit(1)
 
-    interpret(infile)
+    # The command line wins over the file
+    renderer = options.get("renderer") or file_renderer(infile)
+
+    # The pre-flight check builds the scene once to measure it, and the render builds it again
+    render_config = {"quality": "low_quality", "preview": True}
+    scene_factory, render_config, draft = load_scene, render_config, False
+    if renderer != "opengl":
+        scene_factory, render_config, draft = preflight_from_options(options, load_scene, (str(infile),), render_config)
+
+    interpret(
+        infile,
+        options.get("parallel", 1),
+        segment_cache_from_options(options),
+        options.get("draft", False) or draft,
+        options.get("resolutions"),
+        options.get("long", False),
+        renderer,
+        render_config,
+        scene_factory
+    )
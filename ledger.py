@@ -1,17 +1,48 @@
 from manim import *
 import json
 import sys
-import toml
+import tomllib
+import numpy as np
 from manim import tempconfig
 
+from animations import InPlaceAnimation
+from cli import RENDER_OPTIONS, RENDER_USAGE, preflight_from_options, progress_from_options, segment_cache_from_options, split_options
+from draft import render_draft
+from long_render import chunk_finished, render_long
+from multi_resolution import render_multi_resolution
+from parallel_render import render_parallel
+from playback import scene_plays
+from preflight import SceneComplexity, measure_managers, render_recorded
+from progress import emit, frames_written, phase
+from renderers import render_interactive, set_background_color, wait_for_step
+from static_layer import StaticBackgroundScene
+
+
+def format_configuration(configuration) -> str:
+    """
+    How a state, or a set of states for an NFA, is written on a ledger row
+    """
+    if isinstance(configuration, (set, frozenset)):
+        return "$\\{" + ", ".join(sorted(str(state) for state in configuration)) + "\\}$"
+    return str(configuration)
+
+
+def format_symbol(step) -> str:
+    """
+    How the symbol read during a step is written on a ledger row. Turing Machines also show what they write and where they move
+    """
+    if step.write is not None:
+        return f"{step.symbol}$\\to${step.write},{step.move}"
+    return str(step.symbol)
+
 
 class DisplayLedger(VGroup):
     def __init__(self, fa_json, input_string="aab", scale=1.0, spacing=1.2, style_config=None):
         super().__init__()
         self.json = fa_json
         self.input_string = input_string
-        self.current_state = self.json["initial_state"]
-        self.transitions = self.json["transitions"]
+        self.current_state = self.json["initial_state"] if self.json is not None else None
+        self.transitions = self.json["transitions"] if self.json is not None else None
         self.scale_factor = scale
         self.vertical_spacing = spacing * self.scale_factor
         self.steps = []
@@ -19,48 +50,54 @@ class DisplayLedger(VGroup):
 
     def create_step(self, current_state, symbol):
         next_state = self.transitions[current_state][symbol]
+        step_group = self.build_row(str(current_state), str(symbol), str(next_state))
+
+        self.current_state = next_state
+        return step_group
 
+    def _styles(self):
         # Load visual styles from config
         ledger_cfg = self.style_config.get("ledger", {})
         past_cfg = ledger_cfg.get("past", {})
         symbol_cfg = ledger_cfg.get("symbol", {})
         next_cfg = ledger_cfg.get("next", {})
 
-        arrow_color = ledger_cfg.get("arrow_color", "yellow")
+        # font size, text color, and circle/box color for each part of a row
+        return {
+            "past": (past_cfg.get("font_size", 30), past_cfg.get("text_color", "black"), past_cfg.get("circle_color", "gray")),
+            "symbol": (symbol_cfg.get("font_size", 30), symbol_cfg.get("text_color", "white"), symbol_cfg.get("box_color", "yellow")),
+            "next": (next_cfg.get("font_size", 30), next_cfg.get("text_color", "black"), next_cfg.get("circle_color", "white"))
+        }
 
-        # Past state styling
-        past_font_size = past_cfg.get("font_size", 30)
-        past_text_color = past_cfg.get("text_color", "black")
-        past_circle_color = past_cfg.get("circle_color", "gray")
-
-        # Symbol styling
-        symbol_font_size = symbol_cfg.get("font_size", 30)
-        symbol_text_color = symbol_cfg.get("text_color", "white")
-        symbol_box_color = symbol_cfg.get("box_color", "yellow")
-
-        # Next state styling
-        next_font_size = next_cfg.get("font_size", 30)
-        next_text_color = next_cfg.get("text_color", "black")
-        next_circle_color = next_cfg.get("circle_color", "white")
+    def build_label(self, role, text):
+        """
+        Builds the label for one part of a row ("past", "symbol" or "next"), at the size build_row() would give it
+        """
+        font_size, text_color, _ = self._styles()[role]
 
         # Normalize scales
-        scale_past = past_font_size / 42
-        scale_symbol = symbol_font_size / 42
-        scale_next = next_font_size / 42
+        return Tex(text).scale(font_size / 42).set_color(text_color)
+
+    def build_row(self, current_label, symbol_label, next_label):
+        """
+        Builds one ledger row out of the three labels, without stepping any automaton
+        """
+        styles = self._styles()
+        arrow_color = self.style_config.get("ledger", {}).get("arrow_color", "yellow")
 
         # Build past state group
-        cs_circle = Circle(radius=0.5 * self.scale_factor, color=past_circle_color)
-        cs_label = Tex(str(current_state)).scale(scale_past).set_color(past_text_color)
+        cs_circle = Circle(radius=0.5 * self.scale_factor, color=styles["past"][2])
+        cs_label = self.build_label("past", current_label)
         cs_group = VGroup(cs_circle, cs_label).move_to(LEFT * 3 * self.scale_factor)
 
         # Build symbol group
-        sym_box = Square(side_length=0.7 * self.scale_factor, color=symbol_box_color)
-        sym_label = Tex(str(symbol)).scale(scale_symbol).set_color(symbol_text_color)
+        sym_box = Square(side_length=0.7 * self.scale_factor, color=styles["symbol"][2])
+        sym_label = self.build_label("symbol", symbol_label)
         sym_group = VGroup(sym_box, sym_label)
 
         # Build next state group
-        ns_circle = Circle(radius=0.5 * self.scale_factor, color=next_circle_color)
-        ns_label = Tex(str(next_state)).scale(scale_next).set_color(next_text_color)
+        ns_circle = Circle(radius=0.5 * self.scale_factor, color=styles["next"][2])
+        ns_label = self.build_label("next", next_label)
         ns_group = VGroup(ns_circle, ns_label).move_to(RIGHT * 3 * self.scale_factor)
 
         # Arrows
@@ -70,85 +107,274 @@ class DisplayLedger(VGroup):
         step_group = VGroup(cs_group, arrow1, sym_group, arrow2, ns_group)
         step_group.scale(self.scale_factor)
 
-        self.current_state = next_state
         return step_group
 
 
-class RollingLedger(Scene):
-    def __init__(self, fa_filename, input_string, config):
-        super().__init__()
-        with open(fa_filename, "r") as file:
-            self.fa_json = json.load(file)
+class LedgerView(VGroup):
+    """
+    The rolling ledger as a component that the managers can show next to the graph, table and text.
 
-        self.input_string = input_string
+    Rows are filled in from the steps of a RunTrace, so it works for every kind of automaton without simulating
+    anything itself. There is a fixed ring of max_steps + 1 rows: each step relabels the next row in the ring from
+    a cache of labels, and scrolls every row up by one with a single shift. The cost of a step does not depend on
+    how long the input is.
+    """
+
+    # Where each label sits inside a row built by DisplayLedger.build_row()
+    LABEL_PATHS = {"past": (0, 1), "symbol": (2, 1), "next": (4, 1)}
+
+    def __init__(self, config: dict):
+        super().__init__()
         ledger_cfg = config.get("ledger", {})
         self.max_steps = ledger_cfg.get("max_steps", 3)
         self.fade_speed = ledger_cfg.get("fade_speed", 0.75)
-        self.step_delay = ledger_cfg.get("speed", 0.75)
-        self.scale = ledger_cfg.get("size", 1.0)
-        self.spacing = ledger_cfg.get("spacing", 1.2)
-        self.style_config = config
+        self.builder = DisplayLedger(
+            fa_json=None,
+            scale=ledger_cfg.get("size", 1.0),
+            spacing=ledger_cfg.get("spacing", 1.2),
+            style_config=config
+        )
+
+        self.ring = VGroup(*[self.builder.build_row("q", "a", "q").set_opacity(0) for _ in range(self.max_steps + 1)])
+        self.pitch = self.ring[0].height + self.builder.vertical_spacing
+
+        # Invisible frame that gives the ledger its size and position, and that the rows scroll inside of
+        self.frame = Rectangle(
+            width=self.ring[0].width,
+            height=self.pitch * self.max_steps,
+            stroke_width=0
+        )
+        self._frame_height = self.frame.height
+        self.add(self.frame, self.ring)
+
+        self._labels: dict[tuple[str, str], Tex] = dict()
+        self.steps_shown = 0  # Steps that will have been shown once every queued animation has played
+
+    def _scale(self) -> float:
+        return self.frame.height / self._frame_height
+
+    def _label(self, role: str, text: str) -> Tex:
+        if (role, text) not in self._labels:
+            self._labels[(role, text)] = self.builder.build_label(role, text).scale(self.builder.scale_factor)
+        return self._labels[(role, text)]
+
+    def relabel(self, row: VGroup, labels: dict[str, str]) -> None:
+        """
+        Puts new labels on a recycled row in place, using cached labels instead of building new ones
+        """
+        scale = self._scale()
+        for role, text in labels.items():
+            group, index = self.LABEL_PATHS[role]
+            old = row[group][index]
+            center = old.get_center()
+            old.become(self._label(role, text).copy().scale(scale))
+            old.move_to(center)
+
+    def _row_labels(self, step) -> dict[str, str]:
+        return {
+            "past": format_configuration(step.before),
+            "symbol": format_symbol(step),
+            "next": format_configuration(step.after)
+        }
+
+    def bottom_slot(self) -> np.ndarray:
+        return self.frame.get_bottom() + UP * self.pitch * self._scale() / 2
+
+    def seek(self, steps: list, shown: int) -> None:
+        """
+        Puts the ledger straight where it is once shown steps have been shown, without animating anything.
+        steps are the last of them; only the last max_steps are on screen, so earlier ones can be left out.
+        """
+        if shown == self.steps_shown:
+            return
+
+        for row in self.ring:
+            row.set_opacity(0)
+
+        recent = steps[len(steps) - min(len(steps), self.max_steps):]
+        for index, step in zip(range(shown - len(recent), shown), recent):
+            row = self.ring[index % len(self.ring)]
+            self.relabel(row, self._row_labels(step))
+            row.move_to(self.bottom_slot() + UP * self.pitch * self._scale() * (shown - 1 - index))
+            row.set_opacity(1)
+
+        self.steps_shown = shown
+
+    def step_animation(self, step) -> Animation:
+        index = self.steps_shown
+        self.steps_shown += 1
+
+        return LedgerStep(
+            self,
+            entering=self.ring[index % len(self.ring)],
+            leaving=self.ring[(index + 1) % len(self.ring)] if index >= self.max_steps else None,
+            labels=self._row_labels(step),
+            run_time=self.fade_speed
+        )
+
+
+class LedgerStep(InPlaceAnimation):
+    """
+    Shows one step on a LedgerView: the entering row is relabeled and faded in at the bottom, every row
+    scrolls up by one with a single shift, and the row scrolling past the top (if any) fades out.
+    """
+
+    def __init__(self, ledger: LedgerView, entering: VGroup, leaving: VGroup | None, labels: dict[str, str], **kwargs):
+        self.entering = entering
+        self.leaving = leaving
+        self.labels = labels
+        super().__init__(ledger, **kwargs)
+
+    def prepare(self) -> None:
+        ledger = self.mobject
+        ledger.relabel(self.entering, self.labels)
+        self.entering.move_to(ledger.bottom_slot() + DOWN * ledger.pitch * ledger._scale())
+        self.entering.set_opacity(0)
+
+        self.shift = UP * ledger.pitch * ledger._scale()
+        self.applied = 0
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha)
+        self.mobject.ring.shift((t - self.applied) * self.shift)
+        self.applied = t
+
+        self.entering.set_opacity(t)
+        if self.leaving is not None:
+            self.leaving.set_opacity(1 - t)
+
+
+class RollingLedger(StaticBackgroundScene):
+    def __init__(self, fa_filename, input_string, config):
+        super().__init__()
+        # Imported here because fa_manager imports this module for LedgerView
+        from fa_manager import DFA_Manager, NFA_Manager, TM_Manager
+
+        with phase("load", file=str(fa_filename)):
+            with open(fa_filename, "r") as file:
+                self.fa_json = json.load(file)
+
+            self.input_string = input_string
+            ledger_cfg = config.get("ledger", {})
+            self.step_delay = ledger_cfg.get("speed", 0.75)
+            self.style_config = config
+
+            match self.fa_json.get("fa_type", "dfa"):
+                case "nfa":
+                    manager = NFA_Manager.from_json(self.fa_json, config, input_string)
+                case "tm":
+                    manager = TM_Manager.from_json(self.fa_json, config, input_string)
+                case _:
+                    manager = DFA_Manager.from_json(self.fa_json, config, input_string)
+            self.manager = manager
+            self.trace = manager.run_trace()
+        emit("plan", steps=len(self.trace), run_length=len(self.trace))
 
         # Background color from [scene]
         scene_cfg = config.get("scene", {})
         self.background_color = scene_cfg.get("background_color", "black")
 
     def construct(self):
-        self.camera.background_color = self.background_color
-
-        ledger = DisplayLedger(
-            fa_json=self.fa_json,
-            input_string=self.input_string,
-            scale=self.scale,
-            spacing=self.spacing,
-            style_config=self.style_config,
-        )
+        set_background_color(self, self.background_color)
 
-        step_stack = VGroup()
-        current_state = ledger.json["initial_state"]
+        ledger = LedgerView(self.style_config)
+        self.add(ledger)
 
-        for symbol in self.input_string:
-            step = ledger.create_step(current_state, symbol)
-            current_state = ledger.current_state
-            step.set_opacity(0)
-            step_stack.add(step)
-            step_stack.arrange(DOWN, buff=ledger.vertical_spacing)
-            step_stack.move_to(ORIGIN)
+        for i, step in enumerate(self.trace):
+            # Each step fades in, then waits
+            plays = scene_plays(self, ("step", i), ("wait", self.step_delay))
+            if len(plays) == 0:
+                continue
 
-            if len(step_stack) > self.max_steps:
-                old_step = step_stack[0]
-                self.play(FadeOut(old_step, shift=UP), run_time=self.fade_speed)
-                step_stack.remove(old_step)
-                step_stack.arrange(DOWN, buff=ledger.vertical_spacing)
-                step_stack.move_to(ORIGIN)
+            if 0 in plays:
+                ledger.seek(self.trace[max(0, i - ledger.max_steps):i], i)
+                self.play(ledger.step_animation(step))
+            else:
+                ledger.seek(self.trace[max(0, i + 1 - ledger.max_steps):i + 1], i + 1)
+            if 1 in plays:
+                self.wait(self.step_delay)
+            emit("step", step=i + 1, plays=self.renderer.num_plays, frames=frames_written(self))
+            chunk_finished(self)
+            wait_for_step(self)
 
-            self.play(FadeIn(step, shift=UP), step.animate.set_opacity(1.0), run_time=self.fade_speed)
-            self.wait(self.step_delay)
+        if scene_plays(self, ("wait", 2)):
+            self.wait(2)
 
-        step_stack.arrange(DOWN, buff=ledger.vertical_spacing)
-        step_stack.move_to(ORIGIN)
-        self.wait(2)
+    def cache_fingerprints(self, ranges: list[tuple[int, int]]) -> list[dict]:
+        """
+        What the segment cache keys each range of plays on: the config, the steps on screen when the
+        range starts, and the steps and waits it plays. The rest of the run doesn't go in.
+        """
+        max_steps = self.style_config.get("ledger", {}).get("max_steps", 3)
+        plays = self.segment.plays
+
+        fingerprints = []
+        shown = 0  # Steps played before the range
+        counted = 0  # Plays those steps were counted over
+        for first, last in ranges:
+            shown += sum(1 for play in plays[counted:first] if play[0] == "step")
+            counted = max(counted, first)
+            fingerprints.append({
+                "config": self.style_config,
+                "on_screen": [self.trace[i] for i in range(max(0, shown - max_steps), shown)],
+                "plays": [("step", self.trace[play[1]]) if play[0] == "step" else play for play in plays[first:last + 1]]
+            })
+        return fingerprints
+
+    def complexity(self) -> SceneComplexity:
+        ledger_cfg = self.style_config.get("ledger", {})
+        rows = ledger_cfg.get("max_steps", 3) + 1
+        steps = len(self.trace)
+        return SceneComplexity(
+            **{**measure_managers([self.manager]), "tex_labels": 3 * rows},
+            animations=steps,
+            # Every step fades in and waits, and the last one is held for two seconds
+            movie_seconds=steps * (ledger_cfg.get("fade_speed", 0.75) + self.step_delay) + 2
+        )
+
+    def run_managers(self) -> list:
+        # Steps come straight from the trace, not from a plan, so there is nothing to compress
+        return []
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: py ledger.py <fa_filename> <config_file> <input_string>")
+    args, options = split_options(sys.argv, RENDER_OPTIONS)
+
+    if len(args) != 4:
+        print(f"Usage: py ledger.py <fa_filename> <config_file> <input_string> {RENDER_USAGE}")
         sys.exit(1)
+    progress_from_options(options)
 
-    fa_filename = sys.argv[1]
-    config_file = sys.argv[2]
-    input_string = sys.argv[3]
+    fa_filename = args[1]
+    config_file = args[2]
+    input_string = args[3]
 
     try:
-        full_config = toml.load(config_file)
+        with open(config_file, "rb") as f:
+            full_config = tomllib.load(f)
     except Exception as e:
         print(f"Error reading config file: {e}")
         full_config = {}
 
-    with tempconfig({
+    render_config = {
         "quality": "low_quality",
-        "preview": True,
-        "output_file": "RollingLedger.mp4"
-    }):
-        scene = RollingLedger(fa_filename, input_string, full_config)
-        scene.render()
+        "preview": True
+    }
+    cache = segment_cache_from_options(options)
+    if options.get("renderer") == "opengl":
+        render_interactive(RollingLedger, (fa_filename, input_string, full_config), render_config)
+        sys.exit(0)
+
+    scene_factory, render_config, draft = preflight_from_options(options, RollingLedger, (fa_filename, input_string, full_config), render_config)
+    if options.get("draft", False) or draft:
+        render_draft(scene_factory, (fa_filename, input_string, full_config), "RollingLedger")
+    elif options.get("long", False):
+        render_long(scene_factory, (fa_filename, input_string, full_config), render_config, "RollingLedger")
+    elif "resolutions" in options:
+        render_multi_resolution(scene_factory, (fa_filename, input_string, full_config), render_config, options["resolutions"], "RollingLedger")
+    elif options.get("parallel", 1) > 1 or cache is not None:
+        render_parallel(scene_factory, (fa_filename, input_string, full_config), render_config, options.get("parallel", 1), "RollingLedger", cache)
+    else:
+        with tempconfig({**render_config, "output_file": "RollingLedger.mp4"}):
+            scene = scene_factory(fa_filename, input_string, full_config)
+            render_recorded(scene)
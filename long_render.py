@@ -0,0 +1,186 @@
+__all__ = [
+    "LongRenderMonitor",
+    "chunk_finished",
+    "render_long",
+    "retire_mobjects"
+]
+
+# Standard Library
+import gc
+import os
+import sys
+from pathlib import Path
+from typing import Callable
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where only the current RSS (if anything) is reported
+    resource = None
+
+# Dependencies
+import numpy as np
+
+# Manim
+from manim._config import tempconfig
+from manim.mobject.mobject import Group, Mobject
+from manim.mobject.types.vectorized_mobject import VGroup, VMobject
+from manim.scene.scene import Scene
+
+
+def current_rss() -> int | None:
+    """
+    Resident memory of this process in bytes, where the OS says (Linux)
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux resets the high water mark in /proc/self/status when 5 is written here
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss(since_reset: bool) -> int | None:
+    """
+    Highest resident memory in bytes: since the last _reset_peak_rss() if since_reset, otherwise since
+    the process started
+    """
+    if since_reset:
+        try:
+            with open("/proc/self/status") as f:
+                for line in f:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Bytes on macOS, kilobytes elsewhere
+
+
+def _megabytes(size: int | None) -> str:
+    return "n/a" if size is None else f"{size / 1024 ** 2:.1f} MB"
+
+
+def _invisible(mob: Mobject) -> bool:
+    """
+    Whether nothing in a mobject's family would show up in a frame, and nothing will change that
+    on its own
+    """
+    if len(mob.get_family_updaters()) > 0:
+        return False
+    for member in mob.family_members_with_points():
+        if not isinstance(member, VMobject):
+            return False
+        if np.any(member.get_fill_opacities() > 0) or np.any(member.get_stroke_opacities() > 0):
+            return False
+    return True
+
+
+def retire_mobjects(scene: Scene) -> int:
+    """
+    Detaches top-level mobjects that no longer draw anything of their own, and returns how many:
+
+    - the Groups that Scene.play() adds for every AnimationGroup or Succession it plays, once
+      everything in them is on screen through another mobject anyway
+    - mobjects that are completely transparent and have no updaters, like rows faded out for good
+
+    They are taken straight off scene.mobjects, without Scene.remove() breaking their parents up.
+    Animating a retired mobject again puts it back in the scene, like any mobject that isn't in it.
+    """
+    retired = 0
+    for mob in list(scene.mobjects):
+        if mob in scene.foreground_mobjects:
+            continue
+
+        others = [other for other in scene.mobjects if other is not mob]
+        if type(mob) in (Group, VGroup):
+            covered = {member for other in others for member in other.get_family()}
+            if all(member in covered for member in mob.get_family()[1:]):
+                scene.mobjects = others
+                retired += 1
+                continue
+
+        if _invisible(mob):
+            scene.mobjects = others
+            retired += 1
+
+    return retired
+
+
+class LongRenderMonitor:
+    """
+    Keeps a long render's memory flat. After every chunk of steps (see chunk_finished()), it retires
+    mobjects that no longer draw anything, collects garbage, and prints how many mobjects are left and
+    the highest resident memory reached during the chunk.
+
+    The partial movie of each chunk is already closed and on disk by then, so nothing of the frames
+    drawn so far is held in memory.
+    """
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self.retired = 0
+        self.peak: int | None = None
+        self._per_chunk = _reset_peak_rss()
+
+    def chunk_finished(self, scene: Scene) -> None:
+        retired = retire_mobjects(scene)
+        gc.collect()
+
+        self.chunks += 1
+        self.retired += retired
+        chunk_peak = peak_rss(self._per_chunk)
+        if chunk_peak is not None:
+            self.peak = max(self.peak or 0, chunk_peak)
+
+        print(
+            f"Chunk {self.chunks}: retired {retired} mobjects, {len(scene.get_mobject_family_members())} left; "
+            f"RSS {_megabytes(current_rss())}, peak {_megabytes(chunk_peak)}"
+        )
+        self._per_chunk = _reset_peak_rss()
+
+    def summary(self) -> None:
+        print(f"Long render: {self.chunks} chunks, {self.retired} mobjects retired, peak RSS {_megabytes(self.peak)}")
+
+
+def chunk_finished(scene: Scene) -> None:
+    """
+    Called by the scenes between chunks of steps. Does nothing unless the scene is rendered by render_long()
+    """
+    monitor = getattr(scene, "long_render", None)
+    if monitor is not None:
+        monitor.chunk_finished(scene)
+
+
+def render_long(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    output_name: str
+) -> Path:
+    """
+    Renders a scene with a LongRenderMonitor attached, for recordings too long to keep every mobject
+    and animation hash around. Partial movie caching is turned off, since hashing a play serializes
+    the whole scene and the partial movies of a one-off recording are never reused.
+    """
+    monitor = LongRenderMonitor()
+    with tempconfig({**render_config, "output_file": output_name, "disable_caching": True}):
+        scene = scene_factory(*scene_args)
+        scene.long_render = monitor
+        scene.render()
+        movie = Path(scene.renderer.file_writer.movie_file_path)
+
+    monitor.summary()
+    return movie
@@ -0,0 +1,216 @@
+__all__ = [
+    "MultiResolutionFileWriter",
+    "MultiResolutionRenderer",
+    "RenderLane",
+    "render_multi_resolution"
+]
+
+# Standard Library
+from pathlib import Path
+from typing import Callable
+
+# Dependencies
+import numpy as np
+
+# Manim
+from manim._config import config, tempconfig
+from manim.camera.camera import Camera
+from manim.mobject.mobject import Mobject
+from manim.scene.scene import Scene
+from manim.utils.file_ops import open_file
+from manim.utils.iterables import list_update
+
+# Internal
+from cli import pixel_width_for
+from static_layer import HoldingFileWriter, StaticLayerRenderer
+
+
+class RenderLane:
+    """
+    One extra output of a MultiResolutionRenderer: a camera at its own resolution, the file writer
+    its frames go to, and the static background drawn at that resolution for the current play.
+    """
+
+    def __init__(self, camera: Camera, file_writer: HoldingFileWriter, pixel_width: int, pixel_height: int) -> None:
+        self.camera = camera
+        self.file_writer = file_writer
+        self.pixel_width = pixel_width
+        self.pixel_height = pixel_height
+        self.static_image: np.ndarray | None = None
+
+    def config(self) -> tempconfig:
+        """
+        The file writers read the resolution (and the folder named after it) from the global config
+        """
+        return tempconfig({"pixel_width": self.pixel_width, "pixel_height": self.pixel_height})
+
+    def draw(self, scene: Scene, mobjects: list[Mobject], primary: Camera) -> np.ndarray:
+        """
+        Draws mobjects over this lane's static background, with whatever background and framing the
+        scene has given the primary camera, and returns the frame
+        """
+        camera = self.camera
+        if (camera.background_color, camera.background_opacity) != (primary.background_color, primary.background_opacity):
+            camera.background_color = primary.background_color
+            camera.background_opacity = primary.background_opacity
+        camera.frame_center = primary.frame_center
+
+        if self.static_image is not None:
+            camera.set_frame_to_background(self.static_image)
+        else:
+            camera.reset()
+        camera.capture_mobjects(mobjects if mobjects else list_update(scene.mobjects, scene.foreground_mobjects))
+        return np.array(camera.pixel_array)
+
+
+class MultiResolutionFileWriter(HoldingFileWriter):
+    """
+    The primary file writer of a MultiResolutionRenderer. Every call that starts, ends or finishes a
+    movie is repeated for each lane's writer, under that lane's resolution, so all of the movies get
+    the same partial movies and the same timeline.
+    """
+
+    def _lanes(self) -> list[RenderLane]:
+        return getattr(self.renderer, "lanes", [])
+
+    def add_partial_movie_file(self, hash_animation: str) -> None:
+        super().add_partial_movie_file(hash_animation)
+        for lane in self._lanes():
+            with lane.config():
+                lane.file_writer.add_partial_movie_file(hash_animation)
+
+    def begin_animation(self, allow_write: bool = False, file_path=None) -> None:
+        super().begin_animation(allow_write, file_path)
+        for lane in self._lanes():
+            with lane.config():
+                lane.file_writer.begin_animation(allow_write)
+
+    def end_animation(self, allow_write: bool = False) -> None:
+        super().end_animation(allow_write)
+        for lane in self._lanes():
+            with lane.config():
+                lane.file_writer.end_animation(allow_write)
+
+    def finish(self) -> None:
+        super().finish()
+        for lane in self._lanes():
+            with lane.config():
+                lane.file_writer.finish()
+
+
+class MultiResolutionRenderer(StaticLayerRenderer):
+    """
+    A StaticLayerRenderer that writes the same scene at several resolutions in one pass.
+
+    The scene, its mobjects and every animation are built and run once. Each frame is then drawn by
+    the main camera (at the resolution in the config) and by one extra camera per lane, and every
+    resolution streams to its own encoder. Vectors are rasterized at each resolution rather than
+    scaled down, so the smaller movies are as sharp as separate renders. Static backgrounds are kept
+    per camera, like StaticLayerRenderer does for the main one.
+
+    Each lane's movie goes in the quality folder named after its resolution (e.g. videos/<module>/480p30).
+    """
+
+    def __init__(self, pixel_heights: list[int], *args, **kwargs):
+        kwargs.setdefault("file_writer_class", MultiResolutionFileWriter)
+        super().__init__(*args, **kwargs)
+        self.pixel_heights = pixel_heights
+        self.lanes: list[RenderLane] = []
+        self._scene: Scene = None
+
+    def init_scene(self, scene: Scene) -> None:
+        super().init_scene(scene)
+        self._scene = scene
+
+        self.lanes = []
+        for pixel_height in self.pixel_heights:
+            pixel_width = pixel_width_for(pixel_height, self.camera.pixel_width / self.camera.pixel_height)
+            lane = RenderLane(None, None, pixel_width, pixel_height)
+            with lane.config():
+                lane.camera = type(self.camera)(
+                    pixel_width=pixel_width,
+                    pixel_height=pixel_height,
+                    frame_width=self.camera.frame_width,
+                    frame_height=self.camera.frame_height,
+                    frame_rate=self.camera.frame_rate
+                )
+                lane.file_writer = HoldingFileWriter(self, scene.__class__.__name__)
+            self.lanes.append(lane)
+
+    def save_static_frame_data(self, scene: Scene, static_mobjects: list[Mobject]) -> np.ndarray | None:
+        image = super().save_static_frame_data(scene, static_mobjects)
+
+        for lane in self.lanes:
+            lane.static_image = None
+            if image is None:
+                continue
+
+            key = self._camera_key(lane.camera)
+            if key in self._backgrounds and self._backgrounds[key][0] == self._static_signature:
+                lane.static_image = self._backgrounds[key][1]
+                continue
+
+            lane.static_image = lane.draw(scene, static_mobjects, self.camera)
+            self._backgrounds[key] = (self._static_signature, lane.static_image)
+
+        return image
+
+    def render(self, scene: Scene, time: float, moving_mobjects: list[Mobject]) -> None:
+        super().render(scene, time, moving_mobjects)
+        if self.skip_animations:
+            return
+
+        for lane in self.lanes:
+            lane.file_writer.write_frame(lane.draw(scene, moving_mobjects, self.camera))
+
+    def freeze_current_frame(self, duration: float) -> None:
+        super().freeze_current_frame(duration)
+        if self.skip_animations:
+            return
+
+        num_frames = int(duration / (1 / self.camera.frame_rate))
+        for lane in self.lanes:
+            lane.file_writer.write_held_frame(lane.draw(self._scene, self._scene.moving_mobjects, self.camera), num_frames)
+
+
+def render_multi_resolution(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    pixel_heights: list[int],
+    output_name: str
+) -> list[Path]:
+    """
+    Renders a scene once into one movie per pixel height, largest first. The frame rate comes from
+    render_config's quality. Partial movie caching is turned off, since a play cached at one
+    resolution may not be at the others. Returns the movie paths in the order of pixel_heights.
+    """
+    heights = sorted(set(pixel_heights), reverse=True)
+    aspect_ratio = config.pixel_width / config.pixel_height
+
+    with tempconfig({
+        **render_config,
+        "pixel_height": heights[0],
+        "pixel_width": pixel_width_for(heights[0], aspect_ratio),
+        "output_file": output_name,
+        "disable_caching": True,
+        "preview": False
+    }):
+        scene = scene_factory(*scene_args)
+
+        # The scenes build their own renderer, so this one is swapped in before anything plays
+        renderer = MultiResolutionRenderer(heights[1:], camera_class=type(scene.renderer.camera))
+        renderer.init_scene(scene)
+        scene.renderer = renderer
+        scene.render()
+
+        movies = {heights[0]: Path(renderer.file_writer.movie_file_path)}
+        for lane in renderer.lanes:
+            movies[lane.pixel_height] = Path(lane.file_writer.movie_file_path)
+
+    for height in heights:
+        print(f"{height}p: {movies[height]}")
+    if render_config.get("preview", config.preview):
+        open_file(movies[heights[0]])
+
+    return [movies[height] for height in pixel_heights]
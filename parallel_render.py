@@ -0,0 +1,195 @@
+__all__ = [
+    "count_plays",
+    "split_plays",
+    "cache_ranges",
+    "render_parallel",
+    "concat_segments"
+]
+
+# Standard Library
+import multiprocessing
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+# Manim
+from manim._config import config, tempconfig
+from manim.scene.scene import Scene
+from manim.utils.file_ops import open_file
+
+# Internal
+from playback import PlaySegment
+from progress import emit, phase
+from segment_cache import SegmentCache
+
+
+# Plays per segment when segments are cached. Fixed, so the same plays land in the same segments
+# on every run no matter how many processes there are
+CACHE_SEGMENT_PLAYS = 4
+
+
+def _count_plays(scene_factory: Callable[..., Scene], scene_args: tuple, render_config: dict) -> Scene:
+    with tempconfig({**render_config, "preview": False, "write_to_movie": False}):
+        scene = scene_factory(*scene_args)
+        # Not Scene.render(): with a segment that renders nothing, construct() only counts its plays
+        scene.segment = PlaySegment(0, -1)
+        scene.setup()
+        scene.construct()
+        return scene
+
+
+def count_plays(scene_factory: Callable[..., Scene], scene_args: tuple, render_config: dict) -> int:
+    """
+    How many Scene.play() and Scene.wait() calls a scene makes. The scene goes through its plays with
+    a PlaySegment that renders none of them, so nothing is built, played, drawn or written.
+    """
+    return _count_plays(scene_factory, scene_args, render_config).segment.cursor
+
+
+def split_plays(plays: int, segments: int) -> list[tuple[int, int]]:
+    """
+    Splits play numbers 0 through plays - 1 into at most `segments` contiguous, inclusive ranges of
+    (nearly) the same size
+    """
+    segments = max(1, min(segments, plays))
+    bounds = [plays * i // segments for i in range(segments + 1)]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(segments)]
+
+
+def cache_ranges(plays: int) -> list[tuple[int, int]]:
+    """
+    The intro (play 0) on its own, then blocks of CACHE_SEGMENT_PLAYS plays
+    """
+    return [(0, 0)] + [(first, min(first + CACHE_SEGMENT_PLAYS, plays) - 1) for first in range(1, plays, CACHE_SEGMENT_PLAYS)]
+
+
+def _render_segment(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    first: int,
+    last: int,
+    output_file: str
+) -> str:
+    """
+    Renders plays first through last of a fresh scene. The scene's managers seek straight to where the
+    first play starts (see playback.PlaySegment), so nothing before it is built or played.
+    """
+    with tempconfig({
+        **render_config,
+        "preview": False,
+        "output_file": output_file,
+        # Every segment gets its own partial movie folder, so workers never clean up each other's files
+        "partial_movie_dir": f"{{video_dir}}/partial_movie_files/{output_file}"
+    }):
+        scene = scene_factory(*scene_args)
+        scene.segment = PlaySegment(first, last)
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def concat_segments(segments: list[Path], output: Path) -> Path:
+    """
+    Joins movie files end to end with ffmpeg's concat demuxer. Nothing is re-encoded, so the frames
+    are exactly the ones in the segments.
+    """
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise FileNotFoundError("ffmpeg is needed to join rendered segments, but it was not found on the PATH")
+
+    file_list = output.with_suffix(".segments.txt")
+    with file_list.open("w") as f:
+        for segment in segments:
+            f.write(f"file '{Path(segment).resolve().as_posix()}'\n")
+
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(file_list), "-c", "copy", str(output)],
+        check=True
+    )
+    file_list.unlink()
+
+    return output
+
+
+def render_parallel(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    processes: int,
+    output_name: str,
+    cache: SegmentCache | None = None
+) -> Path:
+    """
+    Renders a scene in `processes` worker processes and joins the result into one movie.
+
+    The plays of the scene are split into contiguous ranges, one per worker. Each worker builds the
+    scene from scratch with scene_factory(*scene_args), so both have to be picklable (a class or a
+    module-level function, and plain arguments). The scene must go through its plays with
+    playback.scene_plays() (and play_run() for the runs), which lets every worker seek the managers to
+    the start of its range straight from the run trace instead of replaying what comes before.
+
+    With a cache, the scene must have a cache_fingerprints(ranges) method, which says what each range
+    of plays shows once the scene has counted them (see playback.segment_fingerprints()). The plays are
+    then split the same way on every run (see cache_ranges()), segments already in the cache are reused,
+    and only the rest are rendered. A segment is keyed on how the run got to its start and the steps it
+    covers, not on the whole input or where its plays are numbered, so inputs that share a start share
+    their first segments.
+
+    Falls back to a normal render when there is only one process, no cache, or nothing to split.
+    """
+    if processes <= 1 and cache is None:
+        plays = 0
+    else:
+        counted = _count_plays(scene_factory, scene_args, render_config)
+        plays = counted.segment.cursor
+
+    if plays < 2:
+        with tempconfig({**render_config, "output_file": output_name}):
+            scene = scene_factory(*scene_args)
+            scene.render()
+            return Path(scene.renderer.file_writer.movie_file_path)
+
+    if cache is None:
+        ranges = split_plays(plays, processes)
+        cached = [None] * len(ranges)
+    else:
+        ranges = cache_ranges(plays)
+        keys = [cache.key(fingerprint, render_config) for fingerprint in counted.cache_fingerprints(ranges)]
+        cached = [cache.get(key) for key in keys]
+
+    missing = [i for i, path in enumerate(cached) if path is None]
+    print(f"Rendering {len(missing)} of {len(ranges)} segments ({plays} animations) in {max(1, min(processes, len(missing)))} processes")
+    emit("segments", segments=len(ranges), missing=len(missing), plays=plays)
+
+    jobs = [(scene_factory, scene_args, render_config, *ranges[i], f"{output_name}_segment{i:03}") for i in missing]
+    if processes > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(jobs)), mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [pool.submit(_render_segment, *job) for job in jobs]
+            rendered = [Path(future.result()) for future in futures]
+    else:
+        rendered = [Path(_render_segment(*job)) for job in jobs]
+
+    segments = list(cached)
+    for i, path in zip(missing, rendered):
+        segments[i] = cache.put(keys[i], path) if cache is not None else path
+
+    if len(rendered) > 0:
+        output_dir = rendered[0].parent
+    else:
+        # Everything came from the cache, so there is no render folder to follow
+        output_dir = Path(config.media_dir) / "videos"
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    with phase("encode", segments=len(segments)):
+        output = concat_segments(segments, output_dir / (output_name + segments[0].suffix))
+    if cache is not None:
+        cache.report()
+    for path in rendered:
+        path.unlink()
+
+    if render_config.get("preview", config.preview):
+        open_file(output)
+
+    return output
@@ -0,0 +1,110 @@
+__all__ = [
+    "COMPONENT_STEP_SECONDS",
+    "TRANSITION_SECONDS",
+    "PlannedStep",
+    "budget_scale",
+    "plan_run",
+    "planned_seconds"
+]
+
+# Standard Library
+from typing import NamedTuple
+
+# Internal
+from run_trace import RunStep, RunTrace
+
+
+# TransitionAnimation's defaults: a 2 s wave, then four 1 s recolors
+TRANSITION_SECONDS = 6.0
+
+# Unwrites, table followers and tape moves
+COMPONENT_STEP_SECONDS = 1.0
+
+
+class PlannedStep(NamedTuple):
+    """
+    One animated step of a plan: either a single step of the trace, or a fast-forward over a cycle of
+    period steps that the run goes around repeats times in a row.
+    """
+    start: int  # Index in the trace of the first step covered
+    period: int = 1
+    repeats: int = 1
+
+    @property
+    def length(self) -> int:
+        """
+        How many steps of the trace (and characters of the input) this covers
+        """
+        return self.period * self.repeats
+
+    @property
+    def fast_forward(self) -> bool:
+        return self.repeats > 1
+
+    def cycle(self, trace: RunTrace) -> list[RunStep]:
+        return trace[self.start:self.start + self.period]
+
+    def last(self, trace: RunTrace) -> RunStep:
+        return trace[self.start + self.length - 1]
+
+
+def _key(step: RunStep) -> tuple:
+    # Steps that go between the same configurations look the same on the graph, whatever symbol is read
+    return (step.before, step.after)
+
+
+def plan_run(trace: RunTrace, min_repeats: int = 3, max_period: int = 4) -> list[PlannedStep]:
+    """
+    Splits a trace into the steps to animate, collapsing stretches where the run goes around the same
+    self-loop (period 1) or cycle (period up to max_period) at least min_repeats times in a row into a
+    single fast-forward step. At each position the cycle covering the most steps wins.
+
+    With min_repeats below 2 nothing is collapsed and every step of the trace is planned on its own.
+    """
+    n = len(trace)
+    if min_repeats < 2:
+        return [PlannedStep(i) for i in range(n)]
+
+    keys = [_key(step) for step in trace]
+    plan = []
+    i = 0
+    while i < n:
+        best = PlannedStep(i)
+        for period in range(1, max_period + 1):
+            if i + period * min_repeats > n:
+                break
+
+            cycle = keys[i:i + period]
+            repeats = 1
+            while i + (repeats + 1) * period <= n and keys[i + repeats * period:i + (repeats + 1) * period] == cycle:
+                repeats += 1
+
+            if repeats >= min_repeats and period * repeats > best.length:
+                best = PlannedStep(i, period, repeats)
+
+        plan.append(best)
+        i += best.length
+
+    return plan
+
+
+def planned_seconds(plan: list[PlannedStep], graph_seconds: float, other_seconds: float) -> list[float]:
+    """
+    How long each step of a plan lasts unscaled. A single step of the run lasts graph_seconds on the graph
+    (0 if it isn't shown), and the other components animate a step in other_seconds. A fast-forward step
+    plays its cycle once on the graph, so it lasts as long as period steps there, while the other
+    components animate it as one step.
+    """
+    return [max(other_seconds, graph_seconds * planned.period) for planned in plan]
+
+
+def budget_scale(durations: list[float], budget: float = 0) -> float:
+    """
+    How much every step's run time should be multiplied by so steps lasting durations seconds unscaled
+    (see planned_seconds()) fit in budget seconds together. Never speeds anything up when budget is 0 or
+    already enough.
+    """
+    total = sum(durations)
+    if budget <= 0 or total <= budget:
+        return 1.0
+    return budget / total
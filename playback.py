@@ -0,0 +1,213 @@
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "PlaySegment",
+    "play_run",
+    "play_steps",
+    "scene_plays",
+    "segment_fingerprints"
+]
+
+# Standard Library
+import hashlib
+import json
+import sys
+from itertools import islice
+from typing import Iterable
+
+# Manim
+from manim.animation.animation import Animation
+from manim.animation.composition import Succession
+from manim.mobject.mobject import Mobject
+from manim.scene.scene import Scene
+
+# Internal
+from long_render import chunk_finished
+from progress import emit, frames_written
+from renderers import wait_for_step
+from segment_cache import canonical
+
+
+# How many step animations are built and played together. Small enough that memory stays flat, large
+# enough that the overhead of each Scene.play() call doesn't matter
+DEFAULT_CHUNK_SIZE = 16
+
+
+class PlaySegment:
+    """
+    The plays a scene renders when it only renders some of them: first through last, numbered over every
+    Scene.play() and Scene.wait() a full render makes. Set it as scene.segment before rendering.
+
+    The scene goes through its plays with scene_plays() and only makes the ones in the segment. It skips
+    the others without building their animations, and the managers seek() past them instead. Every play
+    gone through is kept in self.plays as the scene described it, so a segment that renders nothing
+    counts and describes the plays of a scene (see segment_fingerprints()).
+    """
+
+    def __init__(self, first: int = 0, last: int = sys.maxsize):
+        self.first = first
+        self.last = last
+        self.plays: list[tuple] = []
+
+    @property
+    def cursor(self) -> int:
+        """
+        How many plays have been gone through, rendered or not
+        """
+        return len(self.plays)
+
+    @property
+    def finished(self) -> bool:
+        """
+        Whether every play of the segment has been gone through, so nothing after it matters
+        """
+        return self.cursor > self.last
+
+    def take(self, plays: tuple[tuple, ...]) -> range:
+        """
+        Goes through the next plays, and returns which of them (counted from 0) to render
+        """
+        cursor = self.cursor
+        self.plays.extend(plays)
+        return range(max(self.first - cursor, 0), max(min(self.last + 1 - cursor, len(plays)), 0))
+
+
+def scene_plays(scene: Scene, *plays: tuple) -> range:
+    """
+    Which of the scene's next plays to make, counted from 0: all of them unless the scene has a
+    PlaySegment. Each play is described by a tuple, like ("wait", seconds), which is all the segment
+    cache knows about it. Plays of a run are described by play_run().
+    """
+    segment = getattr(scene, "segment", None)
+    if segment is None:
+        return range(len(plays))
+    return segment.take(plays)
+
+
+def segment_fingerprints(segment: PlaySegment, ranges: list[tuple[int, int]], managers: list) -> list[dict]:
+    """
+    What each range of plays (first, last) shows, for a scene that went through all of its plays with
+    segment, for the segment cache to key them on. ranges have to cover the plays in order.
+
+    A range is keyed on how each manager is laid out (Auto_Manager.fingerprint()), on a digest of the
+    steps its run has taken before the range starts, on what it shows of the input during the range
+    (Auto_Manager.shown_input()), and on what each play in it does. Nothing else about the input goes
+    in, so a range is shared by every input whose run starts the same way, and changing a symbol only
+    misses the ranges from the one where its step plays on.
+    """
+    layouts = [manager.fingerprint() for manager in managers]
+    position = [0] * len(managers)  # How many animations of each run have been described
+    steps = [None] * len(managers)  # Each run's Auto_Manager.step_fingerprints(), once it starts
+    prefixes = [hashlib.blake2b(digest_size=16) for _ in managers]
+
+    fingerprints = []
+    for first, last in ranges:
+        start = list(position)
+        prefix = [digest.hexdigest() for digest in prefixes]
+
+        plays = []
+        for play in segment.plays[first:last + 1]:
+            if play[0] != "run":
+                plays.append(play)
+                continue
+
+            _, manager, run_first, run_stop = play
+            i = managers.index(manager)
+            if steps[i] is None or run_first != position[i]:
+                # The run starts, or is played again
+                steps[i] = islice(manager.step_fingerprints(), run_first, None)
+            covered = [next(steps[i]) for _ in range(run_first, run_stop)]
+            for step in covered:
+                prefixes[i].update(json.dumps(canonical(step), sort_keys=True).encode())
+            position[i] = run_stop
+            plays.append(("run", i, covered))
+
+        fingerprints.append({
+            "managers": [
+                {"layout": layout, "prefix": digest, "input": manager.shown_input(min(begin, end), max(begin, end))}
+                for manager, layout, digest, begin, end in zip(managers, layouts, prefix, start, position)
+            ],
+            "plays": plays
+        })
+
+    return fingerprints
+
+
+def _chunk_size(scene: Scene, chunk_size: int) -> int:
+    if getattr(scene.renderer, "keyframe_every_step", False) or getattr(scene, "step_controls", None) is not None:
+        return 1
+    return chunk_size
+
+
+def play_run(scene: Scene, manager, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Plays every step of a manager's run with play_steps(), one play per chunk.
+
+    When the scene has a PlaySegment, the chunks outside of it are neither built nor played: the manager
+    seeks straight to the first step of the first chunk in the segment (see Auto_Manager.seek()), and
+    to the end of the run if none of it is.
+    """
+    chunk_size = _chunk_size(scene, chunk_size)
+    steps = manager.step_count()
+    chunks = scene_plays(scene, *[("run", manager, first, min(first + chunk_size, steps)) for first in range(0, steps, chunk_size)])
+
+    if len(chunks) == 0:
+        segment = getattr(scene, "segment", None)
+        if segment is None or not segment.finished:
+            manager.seek(steps)
+        return
+
+    first = chunks.start * chunk_size
+    last = min(chunks.stop * chunk_size, steps)
+    play_steps(scene, islice(manager.animate_steps(first), last - first), chunk_size, first)
+
+
+def play_steps(scene: Scene, steps: Iterable[Animation], chunk_size: int = DEFAULT_CHUNK_SIZE, played: int = 0) -> None:
+    """
+    Plays step animations (e.g. from Auto_Manager.animate_steps()) as they are generated.
+
+    Only chunk_size steps exist at any time: they are played as one Succession, dropped along with the
+    Group Scene.play() added for it, and the next chunk is pulled from the generator. Peak memory and
+    setup time before the first frame then no longer depend on the length of the input.
+
+    Renderers that keep a keyframe for every play (see draft.DraftRenderer) get one step per play, and
+    so do scenes stepped through in the OpenGL window (see renderers.render_interactive()), which pause
+    after each one. Between chunks, long renders retire what is no longer on screen (see
+    long_render.render_long()). A "step" progress event is sent after every chunk (see progress.emit()),
+    counting from played steps that came before these.
+    """
+    chunk_size = _chunk_size(scene, chunk_size)
+
+    chunk = []
+    for step in steps:
+        chunk.append(step)
+        if len(chunk) >= chunk_size:
+            played += len(chunk)
+            _play_chunk(scene, chunk, played)
+            chunk = []
+
+    if len(chunk) > 0:
+        played += len(chunk)
+        _play_chunk(scene, chunk, played)
+
+
+def _detach_group(scene: Scene, group: Mobject) -> None:
+    """
+    Takes the Group that Scene.play() added for a Succession off scene.mobjects, so groups don't pile up
+    chunk after chunk. Members that aren't in the scene through another mobject take its place.
+    """
+    index = next((i for i, mob in enumerate(scene.mobjects) if mob is group), None)
+    if index is None:
+        return
+
+    others = scene.mobjects[:index] + scene.mobjects[index + 1:]
+    covered = {member for other in others for member in other.get_family()}
+    scene.mobjects = others[:index] + [mob for mob in group.submobjects if mob not in covered] + others[index:]
+
+
+def _play_chunk(scene: Scene, chunk: list[Animation], played: int) -> None:
+    succession = Succession(*chunk)
+    scene.play(succession)
+    _detach_group(scene, succession.mobject)
+    emit("step", step=played, plays=scene.renderer.num_plays, frames=frames_written(scene))
+    chunk_finished(scene)
+    wait_for_step(scene)
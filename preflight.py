@@ -0,0 +1,374 @@
+__all__ = [
+    "CostModel",
+    "RenderEstimate",
+    "SceneComplexity",
+    "compressed_scene",
+    "estimate_render",
+    "load_history",
+    "measure_managers",
+    "planned_run",
+    "preflight",
+    "record_render",
+    "render_recorded",
+    "scene_complexity"
+]
+
+# Standard Library
+import json
+import time
+from functools import partial
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+# Dependencies
+import numpy as np
+
+# Manim
+from manim._config import config, tempconfig
+from manim.constants import QUALITIES
+from manim.mobject.text.tex_mobject import SingleStringMathTex
+from manim.scene.scene import Scene
+
+# Internal
+from planner import COMPONENT_STEP_SECONDS, TRANSITION_SECONDS, budget_scale
+from progress import emit
+
+
+# Renders older than this many are left out of the calibration
+HISTORY_LIMIT = 500
+
+# Renders needed before every coefficient of the cost model is fitted, rather than one overall factor
+FULL_FIT_SAMPLES = 12
+
+
+class SceneComplexity(NamedTuple):
+    """
+    What a scene will draw and for how long, worked out from its managers before anything is rendered
+    (see a scene's complexity() method)
+    """
+    vertices: int
+    edges: int
+    tex_labels: int
+    mobjects: int  # Family members with points, i.e. what gets drawn
+    animations: int  # Step animations, plus intros
+    movie_seconds: float
+    compressible_seconds: float = 0  # The part of movie_seconds that run compression can shorten
+
+    def frames(self, frame_rate: float) -> int:
+        return max(1, round(self.movie_seconds * frame_rate))
+
+
+def planned_run(manager) -> tuple[int, float]:
+    """
+    How many step animations manager.animate_steps() will yield, and how many seconds they last together.
+
+    Goes by the components that are shown and the [planner] config, without building any animation: a step
+    lasts as long as its longest part, and a fast-forward plays its cycle once on the graph. Runs of DFAs
+    and NFAs are also fitted into their duration_budget, like animate_steps() does.
+    """
+    if not manager.input_string:
+        return 0, 0.0
+
+    if not hasattr(manager, "plan"):
+        # Turing Machines animate every step of the trace
+        graph = TRANSITION_SECONDS if manager.showing.get(manager.graph_key, False) else 0
+        ledger = manager.config.get("ledger", {}).get("fade_speed", 0.75) if manager.showing.get("ledger", False) else 0
+        steps = len(manager.run_trace())
+        return steps, steps * max(COMPONENT_STEP_SECONDS, graph, ledger)
+
+    plan = manager.plan()
+    durations = manager.step_durations(plan)
+    scale = budget_scale(durations, manager.config.get("planner", {}).get("duration_budget", 0))
+    return len(plan), sum(durations) * scale
+
+
+def _edge_count(manager) -> int:
+    graph = manager.mobj[manager.graph_key] if manager.showing.get(manager.graph_key, False) else None
+    if graph is not None and hasattr(graph, "edges"):
+        return len(graph.edges)
+    if manager.auto is None:
+        return 0
+    return sum(len(symbols) for symbols in manager.auto.transitions.values())
+
+
+def measure_managers(managers: list) -> dict:
+    """
+    Counts the vertices, edges, TeX labels and drawn mobjects of the components the managers show
+    """
+    counts = {"vertices": 0, "edges": 0, "tex_labels": 0, "mobjects": 0}
+    for manager in managers:
+        counts["vertices"] += len(manager.states)
+        counts["edges"] += _edge_count(manager)
+        for key, showing in manager.showing.items():
+            if not showing:
+                continue
+            family = manager.mobj[key].get_family()
+            counts["tex_labels"] += sum(isinstance(mob, SingleStringMathTex) for mob in family)
+            counts["mobjects"] += sum(len(mob.points) > 0 for mob in family)
+    return counts
+
+
+def scene_complexity(shown: list, animated: list, intro_seconds: float = 0, intros: int = 0) -> SceneComplexity:
+    """
+    The complexity of a scene that shows the components of the shown managers and animates the runs of
+    the animated ones one after the other, after intros animations lasting intro_seconds in total
+    """
+    animations, movie_seconds, compressible_seconds = intros, intro_seconds, 0.0
+    for manager in animated:
+        steps, seconds = planned_run(manager)
+        animations += steps
+        movie_seconds += seconds
+        if hasattr(manager, "plan"):
+            compressible_seconds += seconds
+
+    return SceneComplexity(
+        **measure_managers(shown),
+        animations=animations,
+        movie_seconds=movie_seconds,
+        compressible_seconds=compressible_seconds
+    )
+
+
+def _pixels(pixel_width: int, pixel_height: int) -> float:
+    return pixel_width * pixel_height / 1e6
+
+
+class CostModel:
+    """
+    Predicts how many seconds a render takes from a linear model over:
+
+    - a fixed cost (writer setup, joining the partial movies)
+    - frames (the Python side of every frame: updaters, interpolation)
+    - frames times megapixels (clearing, compositing and encoding each frame)
+    - frames times megapixels times thousands of drawn mobjects (rasterizing them)
+
+    calibrated() fits the coefficients to timings of earlier renders. With only a few of them, the
+    default coefficients are scaled by one factor instead.
+    """
+
+    DEFAULT_COEFFICIENTS = (2.0, 0.002, 0.02, 0.15)
+
+    def __init__(self, coefficients: tuple = DEFAULT_COEFFICIENTS, samples: int = 0) -> None:
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.samples = samples  # Renders it was calibrated from
+
+    @staticmethod
+    def features(complexity: SceneComplexity, pixel_width: int, pixel_height: int, frame_rate: float) -> np.ndarray:
+        frames = complexity.frames(frame_rate)
+        pixels = _pixels(pixel_width, pixel_height)
+        return np.array([1.0, frames, frames * pixels, frames * pixels * complexity.mobjects / 1000])
+
+    def predict(self, complexity: SceneComplexity, pixel_width: int, pixel_height: int, frame_rate: float) -> float:
+        return float(self.features(complexity, pixel_width, pixel_height, frame_rate) @ self.coefficients)
+
+    def frame_seconds(self, complexity: SceneComplexity, pixel_width: int, pixel_height: int) -> float:
+        """
+        What each frame of a scene like this one costs, leaving out the fixed cost
+        """
+        pixels = _pixels(pixel_width, pixel_height)
+        return float(self.coefficients[1:] @ np.array([1.0, pixels, pixels * complexity.mobjects / 1000]))
+
+    def max_frames(self, complexity: SceneComplexity, pixel_width: int, pixel_height: int, seconds: float) -> int:
+        """
+        The most frames of a scene like this one that fit in seconds
+        """
+        per_frame = self.frame_seconds(complexity, pixel_width, pixel_height)
+        if per_frame <= 0:
+            return 0
+        return max(0, int((seconds - self.coefficients[0]) / per_frame))
+
+    def rescaled(self, complexity: SceneComplexity, pixel_width: int, pixel_height: int, frame_seconds: float) -> "CostModel":
+        """
+        This model with its per-frame costs scaled to match frame_seconds, a per-frame cost measured while
+        rendering the scene at pixel_width x pixel_height
+        """
+        predicted = self.frame_seconds(complexity, pixel_width, pixel_height)
+        if predicted <= 0:
+            return self
+        factor = frame_seconds / predicted
+        return CostModel(np.concatenate([self.coefficients[:1], self.coefficients[1:] * factor]), self.samples)
+
+    @classmethod
+    def calibrated(cls, history: list[dict]) -> "CostModel":
+        if len(history) == 0:
+            return cls()
+
+        default = cls()
+        rows = []
+        for entry in history:
+            complexity = SceneComplexity(**entry["complexity"])
+            rows.append(cls.features(complexity, entry["pixel_width"], entry["pixel_height"], entry["frame_rate"]))
+        x = np.array(rows)
+        y = np.array([entry["seconds"] for entry in history])
+
+        if len(history) >= FULL_FIT_SAMPLES:
+            coefficients, *_ = np.linalg.lstsq(x, y, rcond=None)
+            if np.all(coefficients >= 0):
+                return cls(coefficients, len(history))
+
+        # Too few renders (or ones too alike) to tell the terms apart
+        predicted = x @ default.coefficients
+        factor = float(np.median(y / np.maximum(predicted, 1e-9)))
+        return cls(default.coefficients * factor, len(history))
+
+
+def _history_path() -> Path:
+    return Path(config.media_dir) / "render_history.jsonl"
+
+
+def load_history(path: Path | None = None) -> list[dict]:
+    """
+    The most recent renders recorded by record_render(), oldest first
+    """
+    path = path if path is not None else _history_path()
+    if not path.exists():
+        return []
+
+    history = []
+    with path.open() as f:
+        for line in f:
+            try:
+                history.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return history[-HISTORY_LIMIT:]
+
+
+def record_render(complexity: SceneComplexity, seconds: float, path: Path | None = None) -> None:
+    """
+    Adds a finished render at the current resolution and frame rate to the history the cost model is
+    calibrated from
+    """
+    path = path if path is not None else _history_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "time": time.time(),
+        "complexity": complexity._asdict(),
+        "pixel_width": config.pixel_width,
+        "pixel_height": config.pixel_height,
+        "frame_rate": config.frame_rate,
+        "seconds": round(seconds, 3)
+    }
+    with path.open("a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def render_recorded(scene: Scene) -> None:
+    """
+    Renders a scene and, if it can tell its complexity, records how long that took
+    """
+    complexity = scene.complexity() if hasattr(scene, "complexity") else None
+    started = time.perf_counter()
+    scene.render()
+    if complexity is not None and config.write_to_movie:
+        record_render(complexity, time.perf_counter() - started)
+
+
+class RenderEstimate(NamedTuple):
+    quality: str
+    frames: int
+    seconds: float  # Predicted wall-clock time
+    complexity: SceneComplexity
+
+    def describe(self) -> str:
+        c = self.complexity
+        return (
+            f"{c.vertices} vertices, {c.edges} edges, {c.tex_labels} TeX labels, {c.mobjects} mobjects, "
+            f"{c.animations} animations; {c.movie_seconds:.1f} s of movie, {self.frames} frames at "
+            f"{self.quality}: about {self.seconds:.0f} s to render"
+        )
+
+
+def estimate_render(complexity: SceneComplexity, quality: str, model: CostModel) -> RenderEstimate:
+    settings = QUALITIES[quality]
+    return RenderEstimate(
+        quality,
+        complexity.frames(settings["frame_rate"]),
+        model.predict(complexity, settings["pixel_width"], settings["pixel_height"], settings["frame_rate"]),
+        complexity
+    )
+
+
+def _lower_qualities(quality: str) -> list[str]:
+    """
+    The qualities below quality, best first
+    """
+    ranked = sorted(
+        (name for name in QUALITIES if name != "example_quality"),
+        key=lambda name: (QUALITIES[name]["pixel_height"], QUALITIES[name]["frame_rate"]),
+        reverse=True
+    )
+    return ranked[ranked.index(quality) + 1:] if quality in ranked else []
+
+
+def compressed_scene(scene_factory: Callable[..., Scene], planner: dict, *scene_args) -> Scene:
+    """
+    Builds a scene with planner merged into the [planner] config of the managers whose runs it animates
+    """
+    scene = scene_factory(*scene_args)
+    for manager in scene.run_managers():
+        manager.config = {**manager.config, "planner": {**manager.config.get("planner", {}), **planner}}
+    return scene
+
+
+def preflight(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    budget: float = 0,
+    reject: bool = False
+) -> tuple[Callable[..., Scene], dict, bool] | None:
+    """
+    Estimates what rendering a scene will cost (see SceneComplexity and CostModel) and, when budget is
+    more than 0 seconds, makes it fit. In order, it tries:
+
+    1. the quality in render_config
+    2. each lower quality
+    3. the lowest quality with run compression: long stretches around a cycle fast-forwarded, and the
+       steps of the run sped up to fit (the [planner] duration_budget)
+    4. a draft (see draft.render_draft())
+
+    Returns the scene factory and render config to render with, and whether to make a draft instead, or
+    None when the job is over budget and reject is set. The scene is built once to measure it; the
+    scene factory builds the one that is rendered, so building a scene must not change anything the next
+    build depends on (like the cwd).
+    """
+    model = CostModel.calibrated(load_history())
+    quality = render_config.get("quality", config.quality)
+
+    with tempconfig(render_config):
+        scene = scene_factory(*scene_args)
+        complexity = scene.complexity()
+
+    estimate = estimate_render(complexity, quality, model)
+    print(f"Estimate: {estimate.describe()} ({'calibrated from ' + str(model.samples) + ' renders' if model.samples else 'uncalibrated'})")
+    emit("estimate", quality=quality, frames=estimate.frames, seconds=round(estimate.seconds, 1), **complexity._asdict())
+
+    if budget <= 0 or estimate.seconds <= budget:
+        return scene_factory, render_config, False
+    if reject:
+        print(f"Rejected: over the budget of {budget:.0f} s")
+        emit("rejected", budget=budget, seconds=round(estimate.seconds, 1))
+        return None
+
+    for lower in _lower_qualities(quality):
+        estimate = estimate_render(complexity, lower, model)
+        if estimate.seconds <= budget:
+            print(f"Downgraded to {lower} to fit the budget of {budget:.0f} s ({estimate.seconds:.0f} s)")
+            emit("downgraded", quality=lower, seconds=round(estimate.seconds, 1))
+            return scene_factory, {**render_config, "quality": lower}, False
+        quality = lower
+
+    if complexity.compressible_seconds > 0:
+        settings = QUALITIES[quality]
+        movie_seconds = model.max_frames(complexity, settings["pixel_width"], settings["pixel_height"], budget) / settings["frame_rate"]
+        run_budget = complexity.compressible_seconds - (complexity.movie_seconds - movie_seconds)
+        if run_budget >= 1:
+            planner = {"fast_forward": True, "duration_budget": run_budget}
+            print(f"Compressed the run to {run_budget:.0f} s at {quality} to fit the budget of {budget:.0f} s")
+            emit("downgraded", quality=quality, duration_budget=round(run_budget, 1))
+            return partial(compressed_scene, scene_factory, planner), {**render_config, "quality": quality}, False
+
+    print(f"Falling back to a draft to fit the budget of {budget:.0f} s")
+    emit("downgraded", draft=True)
+    return scene_factory, render_config, True
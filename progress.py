@@ -0,0 +1,150 @@
+__all__ = [
+    "PROGRESS_ENV",
+    "ProgressStream",
+    "close_progress",
+    "emit",
+    "frames_written",
+    "open_progress",
+    "phase"
+]
+
+# Standard Library
+import json
+import os
+import socket
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+# Manim
+from manim._config import config
+from manim.scene.scene import Scene
+
+
+# Processes started by a render (like the workers of parallel_render) report to the same target
+PROGRESS_ENV = "THEORYVIZ_PROGRESS"
+
+
+class ProgressStream:
+    """
+    Writes progress events as JSON lines, one object per line, flushed as soon as it is written.
+
+    target is where they go:
+
+    - "fd:N" writes to the already open file descriptor N (e.g. "fd:3", or "fd:2" for stderr)
+    - "tcp:HOST:PORT" connects to a TCP socket
+    - "unix:PATH" connects to a Unix domain socket
+    - anything else is a file path, appended to
+
+    Every event has "event", "time" (Unix time in seconds), "elapsed" (seconds since the stream was
+    opened) and "pid", plus whatever fields it was emitted with.
+    """
+
+    def __init__(self, target: str) -> None:
+        self.target = target
+        self.started = time.time()
+        self._socket: socket.socket = None
+        self._file: TextIO = self._open(target)
+
+    def _open(self, target: str) -> TextIO:
+        if target.startswith("fd:"):
+            return os.fdopen(int(target.removeprefix("fd:")), "w", buffering=1, closefd=False)
+        if target.startswith("tcp:"):
+            host, _, port = target.removeprefix("tcp:").rpartition(":")
+            self._socket = socket.create_connection((host, int(port)))
+            return self._socket.makefile("w", buffering=1)
+        if target.startswith("unix:"):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(target.removeprefix("unix:"))
+            return self._socket.makefile("w", buffering=1)
+        return open(target, "a", buffering=1)
+
+    def emit(self, event: str, **fields) -> None:
+        now = time.time()
+        record = {"event": event, "time": round(now, 3), "elapsed": round(now - self.started, 3), "pid": os.getpid(), **fields}
+        try:
+            self._file.write(json.dumps(record, default=str) + "\n")
+        except OSError:
+            # The listener went away; the render goes on without it
+            pass
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        if self._socket is not None:
+            self._socket.close()
+
+
+_stream: ProgressStream | None = None
+
+
+def open_progress(target: str) -> ProgressStream:
+    """
+    Starts sending progress events to target (see ProgressStream), from this process and from any
+    process it starts later. A file descriptor isn't passed on to the processes it starts (like the
+    workers of parallel_render), so they only report to socket and file targets.
+    """
+    global _stream
+    close_progress()
+    _stream = ProgressStream(target)
+    if target.startswith("fd:"):
+        os.environ.pop(PROGRESS_ENV, None)
+    else:
+        os.environ[PROGRESS_ENV] = target
+    return _stream
+
+
+def close_progress() -> None:
+    global _stream
+    if _stream is not None:
+        _stream.close()
+        _stream = None
+    os.environ.pop(PROGRESS_ENV, None)
+
+
+def _current() -> ProgressStream | None:
+    global _stream
+    if _stream is None and os.environ.get(PROGRESS_ENV):
+        # Started by a process that reports progress
+        try:
+            _stream = ProgressStream(os.environ[PROGRESS_ENV])
+        except (OSError, ValueError) as e:
+            print(f"Can't report progress to {os.environ[PROGRESS_ENV]}: {e}", file=sys.stderr)
+            del os.environ[PROGRESS_ENV]
+    return _stream
+
+
+def emit(event: str, **fields) -> None:
+    """
+    Sends one progress event. Does nothing unless open_progress() was called (by --progress)
+    """
+    stream = _current()
+    if stream is not None:
+        stream.emit(event, **fields)
+
+
+@contextmanager
+def phase(name: str, **fields) -> Iterator[None]:
+    """
+    Wraps one phase of a job (parse, load, validate, build, render, encode) in "phase_start" and
+    "phase_end" events. The end event has the phase's duration; a phase that raises sends an "error"
+    event instead.
+    """
+    started = time.perf_counter()
+    emit("phase_start", phase=name, **fields)
+    try:
+        yield
+    except BaseException as e:
+        emit("error", phase=name, error=f"{type(e).__name__}: {e}", duration=round(time.perf_counter() - started, 3))
+        raise
+    emit("phase_end", phase=name, duration=round(time.perf_counter() - started, 3), **fields)
+
+
+def frames_written(scene: Scene) -> int:
+    """
+    How many frames of movie the scene has rendered so far, going by the renderer's clock
+    """
+    return round(getattr(scene.renderer, "time", 0) * config.frame_rate)
@@ -0,0 +1,116 @@
+__all__ = [
+    "RENDERERS",
+    "StepControls",
+    "render_interactive",
+    "renderer_config",
+    "set_background_color",
+    "wait_for_step"
+]
+
+# Standard Library
+from typing import Callable
+
+# Manim
+from manim._config import config, tempconfig
+from manim.constants import RendererType
+from manim.scene.scene import Scene
+from manim.utils.color.core import ParsableManimColor
+
+
+RENDERERS = ("cairo", "opengl")
+
+# How long the window waits for a key between steps before moving on anyway, in seconds
+STEP_TIMEOUT = 3600
+
+
+def renderer_config(name: str) -> dict:
+    """
+    Config overrides for a renderer picked with --renderer (or RENDERER in a .viz file).
+
+    Cairo changes nothing. OpenGL draws into a window in real time instead of encoding a movie, so
+    there is no movie file and nothing to open afterwards.
+    """
+    if name not in RENDERERS:
+        raise ValueError(f"Unknown renderer {name}: expected one of {', '.join(RENDERERS)}")
+    if name == "cairo":
+        return dict()
+    return {
+        "renderer": "opengl",
+        "preview": True,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "format": None,
+        "disable_caching": True
+    }
+
+
+def set_background_color(scene: Scene, color: ParsableManimColor) -> None:
+    """
+    Sets a scene's background color. The OpenGL renderer clears the window to its own background
+    color, not the camera's
+    """
+    if config.renderer == RendererType.OPENGL:
+        scene.renderer.background_color = color
+    else:
+        scene.camera.background_color = color
+
+
+class StepControls:
+    """
+    Keys for stepping through a scene in the OpenGL window. The scene pauses after every step (see
+    wait_for_step()) until space is pressed; c plays the rest without pausing again. Manim's own keys
+    (q to quit, r to reset the camera, dragging to move it) keep working.
+    """
+
+    NEXT = " "
+    CONTINUE = "c"
+
+    def __init__(self, scene: Scene) -> None:
+        self.advance = False
+        self.continuous = False
+        scene.key_to_function_map[self.NEXT] = self._next
+        scene.key_to_function_map[self.CONTINUE] = self._continue
+
+    def _next(self) -> None:
+        self.advance = True
+
+    def _continue(self) -> None:
+        self.continuous = True
+
+    def wait(self, scene: Scene) -> None:
+        if self.continuous:
+            return
+        self.advance = False
+        # The window keeps drawing (and the camera keeps moving) while it waits
+        scene.wait_until(lambda: self.advance or self.continuous, max_time=STEP_TIMEOUT)
+
+
+def wait_for_step(scene: Scene) -> None:
+    """
+    Called by the scenes after each step. Does nothing unless the scene is shown by render_interactive()
+    """
+    controls = getattr(scene, "step_controls", None)
+    if controls is not None:
+        controls.wait(scene)
+
+
+def render_interactive(
+    scene_factory: Callable[..., Scene],
+    scene_args: tuple,
+    render_config: dict,
+    step: bool = True
+) -> None:
+    """
+    Shows a scene in an OpenGL window at the frame rate of render_config's quality, without encoding
+    anything. The scene is built under the OpenGL renderer, so every mobject in it is an OpenGL one.
+    With step set, the scene pauses after every step until a key is pressed (see StepControls).
+    """
+    with tempconfig({**render_config, **renderer_config("opengl")}):
+        scene = scene_factory(*scene_args)
+        if scene.renderer.window is None:
+            raise RuntimeError("The OpenGL renderer didn't open a window")
+
+        if step:
+            scene.step_controls = StepControls(scene)
+            print("Space: next step, c: play the rest, q: quit")
+        scene.render()
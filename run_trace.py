@@ -0,0 +1,277 @@
+__all__ = [
+    "RunStep",
+    "RunTrace"
+]
+
+# Standard Library
+from typing import Iterator, NamedTuple
+
+# Dependencies
+import numpy as np
+
+from automata.base.exceptions import RejectionException
+from automata.fa.dfa import DFA
+from automata.fa.nfa import NFA
+from automata.tm.dtm import DTM
+from automata.tm.tape import TMTape
+
+
+# How many steps apart the full tape snapshots of a Turing Machine run are
+DEFAULT_CHECKPOINT_INTERVAL = 64
+
+_MOVES = ("L", "N", "R")  # Indexed by move + 1
+
+
+class RunStep(NamedTuple):
+    """
+    One step of a run: the configuration before it, the symbol read, and the configuration after it.
+
+    For a DFA or TM, before and after are single states. For an NFA they are frozensets of states (frontiers).
+    write and move are only used by Turing Machines.
+    """
+    before: str | frozenset
+    symbol: str
+    after: str | frozenset
+    write: str | None = None
+    move: str | None = None
+
+
+class RunTrace:
+    """
+    Every step an automaton takes while reading one input, computed once.
+
+    The managers animate the graph, table, tape and ledger from the same trace, so none of them has
+    to simulate the automaton on its own.
+
+    The run is stored compactly and decoded on demand: one integer per configuration (an index into
+    self.states) for DFAs and TMs, one bitset per frontier for NFAs, and for TMs one (position, symbol)
+    delta per step plus a full snapshot of the tape every checkpoint_interval steps. Any step, or any
+    TM tape through tape_at(), can be looked up without replaying the run from the start.
+
+    Parameters
+    ----------
+    kind
+        "dfa", "nfa" or "tm"
+    states
+        Every state of the automaton. Configurations are stored as indices into this list
+    accepted
+        Whether the input was accepted, or None if the run was cut off before it could tell (see truncated)
+    checkpoint_interval
+        How many steps apart the tape snapshots of a TM run are
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        states: list,
+        accepted: bool | None = None,
+        checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL
+    ) -> None:
+        self.kind = kind
+        self.states = sorted(states, key=str)
+        self.accepted = accepted
+        self.truncated = False  # Whether a TM run was cut off after max_iter steps, before it halted
+        self.checkpoint_interval = checkpoint_interval
+
+        self._state_ids = {state: i for i, state in enumerate(self.states)}
+        self.symbols: list[str] = []
+        self._symbol_ids: dict[str, int] = dict()
+
+        # One entry per configuration, so one more than there are steps
+        self._configurations: np.ndarray = np.zeros(1, dtype=np.int32)  # DFA and TM
+        self._frontiers: list[int] = [0]  # NFA, bit i set when self.states[i] is in the frontier
+        self._read: np.ndarray = np.zeros(0, dtype=np.int32)  # Symbol read during each step
+
+        # Turing Machines only. Positions are absolute, so they don't shift when the tape grows to the left
+        self._writes: np.ndarray = np.zeros(0, dtype=np.int32)
+        self._moves: np.ndarray = np.zeros(0, dtype=np.int8)
+        self._positions: np.ndarray = np.zeros(0, dtype=np.int64)  # Head position before each step
+        self._checkpoints: list[tuple[int, tuple[str, ...]]] = []  # (position of the first cell, cells)
+        self._start_position: int = 0
+        self.blank_symbol: str = None
+
+    def __len__(self) -> int:
+        return len(self._read)
+
+    def __getitem__(self, i: int | slice) -> RunStep | list[RunStep]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Step {i} is outside of a run with {len(self)} steps")
+
+        symbol = self.symbols[self._read[i]]
+        if self.kind == "tm":
+            return RunStep(
+                self.configuration(i),
+                symbol,
+                self.configuration(i + 1),
+                self.symbols[self._writes[i]],
+                _MOVES[self._moves[i] + 1]
+            )
+        return RunStep(self.configuration(i), symbol, self.configuration(i + 1))
+
+    def __iter__(self) -> Iterator[RunStep]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return f"RunTrace of a {self.kind} with {len(self)} steps"
+
+    @property
+    def initial(self) -> str | frozenset:
+        """
+        The configuration before the first step
+        """
+        return self.configuration(0)
+
+    def configuration(self, i: int) -> str | frozenset:
+        """
+        The configuration after i steps: a state, or a frontier of states for an NFA. O(1) for a DFA
+        or TM, O(number of states) for an NFA
+        """
+        if self.kind == "nfa":
+            bits = self._frontiers[i]
+            return frozenset(state for j, state in enumerate(self.states) if bits >> j & 1)
+        return self.states[self._configurations[i]]
+
+    def tape_at(self, i: int) -> TMTape:
+        """
+        The tape of a Turing Machine after i steps, rebuilt from the nearest snapshot at or before
+        step i in O(checkpoint_interval) steps
+        """
+        if self.kind != "tm":
+            raise TypeError(f"A {self.kind} has no tape")
+        if not 0 <= i <= len(self):
+            raise IndexError(f"Step {i} is outside of a run with {len(self)} steps")
+
+        checkpoint = i // self.checkpoint_interval
+        first, cells = self._checkpoints[checkpoint]
+        tape = dict(enumerate(cells, start=first))
+
+        for j in range(checkpoint * self.checkpoint_interval, i):
+            tape[int(self._positions[j])] = self.symbols[self._writes[j]]
+        head = self.head_at(i)
+
+        left = min(min(tape), head)
+        right = max(max(tape), head)
+        return TMTape(
+            [tape.get(k, self.blank_symbol) for k in range(left, right + 1)],
+            blank_symbol=self.blank_symbol,
+            current_position=head - left
+        )
+
+    def head_at(self, i: int) -> int:
+        """
+        Where the head of a Turing Machine is after i steps, as a position on the tape it started with.
+        Positions left of where that tape started are negative
+        """
+        if i < len(self):
+            return int(self._positions[i])
+        return int(self._positions[-1] + self._moves[-1]) if len(self) > 0 else self._start_position
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self._symbol_ids[symbol]
+
+    def _bits(self, frontier) -> int:
+        bits = 0
+        for state in frontier:
+            bits |= 1 << self._state_ids[state]
+        return bits
+
+    @classmethod
+    def from_dfa(cls, dfa: DFA, input_string: str):
+        trace = cls("dfa", dfa.states)
+        configurations = [trace._state_ids[dfa.initial_state]]
+        read = []
+
+        current = dfa.initial_state
+        for symbol in input_string:
+            next_state = dfa._get_next_current_state(current, symbol)
+            if next_state is None:
+                # Partial DFA with no transition for this symbol: the run dies here
+                trace.accepted = False
+                break
+            configurations.append(trace._state_ids[next_state])
+            read.append(trace._symbol_id(symbol))
+            current = next_state
+        else:
+            trace.accepted = current in dfa.final_states
+
+        trace._configurations = np.array(configurations, dtype=np.int32)
+        trace._read = np.array(read, dtype=np.int32)
+        return trace
+
+    @classmethod
+    def from_nfa(cls, nfa: NFA, input_string: str):
+        trace = cls("nfa", nfa.states)
+        frontier = nfa._get_lambda_closures()[nfa.initial_state]
+        trace._frontiers = [trace._bits(frontier)]
+        read = []
+
+        for symbol in input_string:
+            frontier = nfa._get_next_current_states(frontier, symbol)
+            trace._frontiers.append(trace._bits(frontier))
+            read.append(trace._symbol_id(symbol))
+
+        trace._read = np.array(read, dtype=np.int32)
+        trace.accepted = not frontier.isdisjoint(nfa.final_states)
+        return trace
+
+    @classmethod
+    def from_tm(cls, tm: DTM, tape: TMTape, max_iter: int = 100, checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        trace = cls("tm", tm.states, checkpoint_interval=checkpoint_interval)
+        trace.blank_symbol = tape.blank_symbol
+
+        configurations = [trace._state_ids[tm.initial_state]]
+        read, writes, moves, positions = [], [], [], []
+
+        generator = tm.read_input_stepwise(list(tape.tape))
+        initial_config = generator.__next__()  # The tape the machine actually starts on
+
+        state, current_tape = initial_config.state, initial_config.tape
+        origin = 0  # Absolute position of current_tape.tape[0]
+        position = current_tape.current_position
+        trace._start_position = position
+
+        try:
+            for tm_config in generator:
+                if len(read) > max_iter:
+                    trace.truncated = True
+                    break
+
+                if len(read) % checkpoint_interval == 0:
+                    trace._checkpoints.append((origin, current_tape.tape))
+
+                symbol = current_tape.read_symbol()
+                _, write, move = tm._get_transition(state, symbol)
+
+                configurations.append(trace._state_ids[tm_config.state])
+                read.append(trace._symbol_id(symbol))
+                writes.append(trace._symbol_id(write))
+                moves.append(_MOVES.index(move) - 1)
+                positions.append(position)
+
+                position += moves[-1]
+                state, current_tape = tm_config.state, tm_config.tape
+                # The library grows the tape to the left by shifting every index up
+                origin = position - current_tape.current_position
+            else:
+                trace.accepted = True
+        except RejectionException:
+            trace.accepted = False
+
+        if len(read) % checkpoint_interval == 0:
+            trace._checkpoints.append((origin, current_tape.tape))
+
+        trace._configurations = np.array(configurations, dtype=np.int32)
+        trace._read = np.array(read, dtype=np.int32)
+        trace._writes = np.array(writes, dtype=np.int32)
+        trace._moves = np.array(moves, dtype=np.int8)
+        trace._positions = np.array(positions, dtype=np.int64)
+        return trace
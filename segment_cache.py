@@ -0,0 +1,152 @@
+__all__ = [
+    "SegmentCache",
+    "canonical",
+    "code_version"
+]
+
+# Standard Library
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Mapping, Set
+from functools import cache
+from pathlib import Path
+
+# Dependencies
+import numpy as np
+
+
+dir_path = Path(os.path.dirname(os.path.realpath(__file__)))
+
+# 2 GB of rendered segments before the least recently used ones get deleted
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+
+def canonical(obj):
+    """
+    Turns the parts of a cache key into plain JSON values that always come out the same way:
+    mappings get sorted keys, sets get sorted, and arrays become lists
+    """
+    if isinstance(obj, Mapping):
+        return {str(k): canonical(v) for k, v in sorted(obj.items(), key=lambda item: str(item[0]))}
+    if isinstance(obj, Set):
+        return sorted((canonical(v) for v in obj), key=lambda v: json.dumps(v, sort_keys=True))
+    if isinstance(obj, (list, tuple)):
+        return [canonical(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return np.round(obj, 4).tolist()
+    if isinstance(obj, (np.floating, float)):
+        return round(float(obj), 4)
+    if isinstance(obj, (np.integer, int, str, bool)) or obj is None:
+        return obj.item() if isinstance(obj, np.generic) else obj
+    return str(obj)
+
+
+@cache
+def code_version() -> str:
+    """
+    A hash of the Manim version and every module in this directory, so changing the code that draws
+    the animations never serves a stale segment
+    """
+    from manim import __version__ as manim_version
+
+    digest = hashlib.sha256(manim_version.encode())
+    for source in sorted(dir_path.glob("*.py")):
+        digest.update(source.name.encode())
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+class SegmentCache:
+    """
+    Rendered movie segments stored under a hash of everything that went into rendering them.
+
+    Keys are made by the renderer from what a segment shows (automaton, resolved visual config, where
+    each component is, how the run got to the segment's start, the input it shows and the steps it
+    plays) and the render settings. Files are touched on every hit, and the least recently used ones
+    are deleted whenever the cache grows past max_bytes, except the ones this cache has handed out:
+    the run that asked for them still has to join them. Hit and miss counts are kept for this run and
+    in total.
+    """
+
+    def __init__(self, directory: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        if directory is None:
+            # Next to the rendered videos, wherever manim's config puts them
+            from manim._config import config
+
+            directory = Path(config.media_dir) / "segment_cache"
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self._in_use: set[Path] = set()  # Returned by get() or put(), so never evicted
+        self._stats_file = self.directory / "stats.json"
+        self._recorded = (0, 0)  # Hits and misses already added to the totals
+
+    def key(self, *parts) -> str:
+        digest = hashlib.sha256(code_version().encode())
+        digest.update(json.dumps(canonical(parts), sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def get(self, key: str, suffix: str = ".mp4") -> Path | None:
+        path = self._path(key, suffix)
+        if path.exists():
+            self.hits += 1
+            path.touch()
+            self._in_use.add(path)
+            return path
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, movie: Path) -> Path:
+        """
+        Copies a freshly rendered segment into the cache and returns where the copy is
+        """
+        path = self._path(key, Path(movie).suffix)
+        shutil.copyfile(movie, path)
+        self._in_use.add(path)
+        self._evict()
+        return path
+
+    def files(self) -> list[Path]:
+        return [path for path in self.directory.iterdir() if path != self._stats_file]
+
+    def size(self) -> int:
+        return sum(path.stat().st_size for path in self.files())
+
+    def _evict(self) -> None:
+        files = sorted(self.files(), key=lambda path: path.stat().st_mtime)
+        total = sum(path.stat().st_size for path in files)
+        for oldest in files:
+            if total <= self.max_bytes:
+                break
+            if oldest in self._in_use:
+                continue
+            total -= oldest.stat().st_size
+            oldest.unlink()
+
+    def report(self) -> None:
+        """
+        Prints this run's hits and misses, adds them to the totals kept in the cache directory, and
+        prints those too
+        """
+        totals = {"hits": 0, "misses": 0}
+        if self._stats_file.exists():
+            totals.update(json.loads(self._stats_file.read_text()))
+        totals["hits"] += self.hits - self._recorded[0]
+        totals["misses"] += self.misses - self._recorded[1]
+        self._stats_file.write_text(json.dumps(totals))
+        self._recorded = (self.hits, self.misses)
+
+        lookups = self.hits + self.misses
+        rate = f"{100 * self.hits / lookups:.0f}%" if lookups > 0 else "n/a"
+        print(f"Segment cache: {self.hits} hits, {self.misses} misses ({rate} hit rate) this run; "
+              f"{totals['hits']} hits, {totals['misses']} misses in total")
+        print(f"Segment cache: {self.size() / 1024 ** 2:.1f} MB of {self.max_bytes / 1024 ** 2:.0f} MB used in {self.directory}")
@@ -0,0 +1,204 @@
+__all__ = [
+    "HoldingFileWriter",
+    "StaticBackgroundScene",
+    "StaticLayerRenderer"
+]
+
+# Standard Library
+import hashlib
+from typing import NamedTuple
+
+# Dependencies
+import av
+import numpy as np
+
+# Manim
+from manim._config import config
+from manim.animation.animation import Animation
+from manim.animation.composition import AnimationGroup
+from manim.camera.camera import Camera
+from manim.constants import RendererType
+from manim.mobject.mobject import Mobject
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene import Scene
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.file_ops import is_gif_format, is_png_format, write_to_movie
+
+# Internal
+from progress import phase
+
+
+def leaf_animations(animation: Animation) -> list[Animation]:
+    """
+    The animations that actually change something, looking inside AnimationGroups and Successions
+    """
+    if isinstance(animation, AnimationGroup):
+        return [leaf for sub in animation.animations for leaf in leaf_animations(sub)]
+    return [animation]
+
+
+def _signature(mobjects: list[Mobject]) -> bytes:
+    """
+    A digest of everything about the mobjects that shows up when they are drawn
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for mob in mobjects:
+        digest.update(id(mob).to_bytes(8, "little"))
+        for name in ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+            array = getattr(mob, name, None)
+            if isinstance(array, np.ndarray):
+                digest.update(np.ascontiguousarray(array).tobytes())
+        digest.update(repr((getattr(mob, "stroke_width", None), getattr(mob, "background_stroke_width", None), mob.z_index)).encode())
+    return digest.digest()
+
+
+class _HeldFrame(NamedTuple):
+    frame: np.ndarray
+
+
+class HoldingFileWriter(SceneFileWriter):
+    """
+    A SceneFileWriter that can hold a frame on screen without encoding it over and over.
+
+    Frames go through the writer thread's queue like any other, and the thread gives every frame an
+    explicit timestamp. A frame held for n frames is encoded once at the start of the hold and once
+    more n - 1 frames later, so the movie lasts exactly as long as before but the frames in between are
+    never converted or encoded.
+    """
+
+    def open_partial_movie_stream(self, file_path=None) -> None:
+        # Only the writer thread counts frames from here on
+        self._next_pts = 0
+        super().open_partial_movie_stream(file_path)
+
+    def _encode(self, frame: np.ndarray, pts: int) -> None:
+        av_frame = av.VideoFrame.from_ndarray(frame, format="rgba")
+        av_frame.pts = pts
+        for packet in self.video_stream.encode(av_frame):
+            self.video_container.mux(packet)
+
+    def _writes_movie_frames(self) -> bool:
+        # Gifs are made by combine_files(), which stamps the frames again one after the other
+        return write_to_movie() and not is_png_format() and not is_gif_format() and config.renderer == RendererType.CAIRO
+
+    def encode_and_write_frame(self, frame: np.ndarray | _HeldFrame, num_frames: int) -> None:
+        if not self._writes_movie_frames():
+            return super().encode_and_write_frame(frame, num_frames)
+
+        # Timestamps are set by hand for every frame, since held frames leave gaps between them
+        if isinstance(frame, _HeldFrame):
+            self._encode(frame.frame, self._next_pts)
+            self._encode(frame.frame, self._next_pts + num_frames - 1)
+            self._next_pts += num_frames
+            return
+        for _ in range(num_frames):
+            self._encode(frame, self._next_pts)
+            self._next_pts += 1
+
+    def write_held_frame(self, frame: np.ndarray, num_frames: int) -> None:
+        if not self._writes_movie_frames() or num_frames <= 2:
+            return self.write_frame(frame, num_frames)
+        self.queue.put((num_frames, _HeldFrame(frame)))
+
+    def finish(self) -> None:
+        # Joins the partial movies into the final one
+        with phase("encode", partial_movies=len(self.partial_movie_files)):
+            super().finish()
+
+
+class StaticLayerRenderer(CairoRenderer):
+    """
+    A CairoRenderer that keeps the static background it draws at the start of every play, one per
+    camera position, and reuses it for later plays as long as the static mobjects look the same.
+
+    Waits where nothing moves and no updater runs are written with HoldingFileWriter.write_held_frame(),
+    so a pause costs one drawn frame and two encoded ones however long it lasts.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("file_writer_class", HoldingFileWriter)
+        super().__init__(*args, **kwargs)
+        self._backgrounds: dict[tuple, tuple[bytes, np.ndarray]] = dict()
+        self._static_signature: bytes = None  # Of the static mobjects in the current play
+
+    def freeze_current_frame(self, duration: float) -> None:
+        if not isinstance(self.file_writer, HoldingFileWriter):
+            return super().freeze_current_frame(duration)
+
+        dt = 1 / self.camera.frame_rate
+        num_frames = int(duration / dt)
+        if self.skip_animations:
+            return
+        self.time += num_frames * dt
+        self.file_writer.write_held_frame(self.get_frame(), num_frames)
+
+    def _camera_key(self, camera: Camera | None = None) -> tuple:
+        camera = camera if camera is not None else self.camera
+        return (
+            np.asarray(camera.frame_center, dtype=float).tobytes(),
+            camera.frame_width,
+            camera.frame_height,
+            camera.pixel_width,
+            camera.pixel_height,
+            str(camera.background_color),
+            camera.background_opacity
+        )
+
+    def save_static_frame_data(self, scene: Scene, static_mobjects: list[Mobject]) -> np.ndarray | None:
+        if not static_mobjects:
+            return super().save_static_frame_data(scene, static_mobjects)
+
+        key = self._camera_key()
+        signature = _signature(static_mobjects)
+        self._static_signature = signature
+        if key in self._backgrounds and self._backgrounds[key][0] == signature:
+            self.static_image = self._backgrounds[key][1]
+            return self.static_image
+
+        image = super().save_static_frame_data(scene, static_mobjects)
+        if image is not None:
+            self._backgrounds[key] = (signature, image)
+        return image
+
+
+class StaticBackgroundScene(Scene):
+    """
+    A Scene that only redraws what an animation actually changes.
+
+    Manim draws the mobjects it considers static once per play, then draws the moving ones on top
+    every frame. By default, the first mobject with an updater (like a FiniteAutomaton's update_edges)
+    or the group an AnimationGroup adds to the scene makes everything after it count as moving, so the
+    whole graph, table and ledger get redrawn every frame. Here only the mobjects of the animations
+    that run, foreground mobjects, and mobjects with updaters count as moving. Mobjects with
+    static_updaters set to True (whose updaters only change anything when one of their parts is
+    animated) are left out.
+
+    Moving mobjects are drawn above the static layer, so their stacking order against static ones
+    can differ from a plain Scene while they move.
+    """
+
+    def __init__(self, **kwargs):
+        if config.renderer == RendererType.CAIRO and kwargs.get("renderer") is None:
+            kwargs["renderer"] = StaticLayerRenderer(
+                camera_class=kwargs.get("camera_class", Camera),
+                skip_animations=kwargs.get("skip_animations", False)
+            )
+        super().__init__(**kwargs)
+
+    def render(self, preview: bool = False):
+        with phase("render", scene=type(self).__name__):
+            return super().render(preview)
+
+    def get_moving_mobjects(self, *animations: Animation) -> list[Mobject]:
+        animated = set()
+        for animation in animations:
+            for leaf in leaf_animations(animation):
+                if leaf.mobject is not None:
+                    animated.update(leaf.mobject.get_family())
+
+        return [
+            mob for mob in self.get_mobject_family_members()
+            if mob in animated
+            or mob in self.foreground_mobjects
+            or (len(mob.updaters) > 0 and not getattr(mob, "static_updaters", False))
+        ]
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from deadline import LADDER, DeadlineSettings, fit_settings
+from preflight import CostModel, SceneComplexity
+
+
+# A minute of movie, 50 seconds of it a run that can be compressed
+SCENE = SceneComplexity(vertices=5, edges=8, tex_labels=10, mobjects=1000, animations=30, movie_seconds=60, compressible_seconds=50)
+
+WIDESCREEN = 16 / 9
+
+
+def predicted(model: CostModel, pixel_height: int, frame_rate: int) -> float:
+    return model.predict(SCENE, 2 * round(pixel_height * WIDESCREEN / 2), pixel_height, frame_rate)
+
+
+def test_plenty_of_time_gets_the_top_of_the_ladder():
+    settings = fit_settings(SCENE, CostModel(), 10_000, WIDESCREEN)
+
+    assert (settings.pixel_width, settings.pixel_height, settings.frame_rate) == (1920, 1080, 60)
+    assert settings.run_budget == 0
+
+
+@pytest.mark.parametrize("rung", range(1, len(LADDER)))
+def test_the_best_rung_that_fits_is_picked(rung):
+    model = CostModel()
+    # Just enough time for this rung, and not for the one above it
+    seconds = predicted(model, *LADDER[rung])
+    assert predicted(model, *LADDER[rung - 1]) > seconds
+
+    settings = fit_settings(SCENE, model, seconds, WIDESCREEN)
+
+    assert (settings.pixel_height, settings.frame_rate) == LADDER[rung]
+    assert settings.run_budget == 0
+    assert settings.seconds == pytest.approx(seconds)
+
+
+def test_the_run_is_compressed_at_the_bottom_when_nothing_fits():
+    model = CostModel()
+    seconds = 20
+    assert predicted(model, *LADDER[-1]) > seconds
+
+    settings = fit_settings(SCENE, model, seconds, WIDESCREEN)
+
+    assert (settings.pixel_height, settings.frame_rate) == LADDER[-1]
+    assert 1 <= settings.run_budget < SCENE.compressible_seconds
+    assert settings.seconds == seconds
+
+
+def test_nothing_fits_without_a_run_to_compress():
+    assert fit_settings(SCENE._replace(compressible_seconds=0), CostModel(), 20, WIDESCREEN) is None
+
+
+def test_nothing_fits_when_even_the_compressed_run_is_too_long():
+    assert fit_settings(SCENE, CostModel(), 5, WIDESCREEN) is None
+
+
+def test_settings_replace_the_quality_of_the_render_config():
+    settings = DeadlineSettings(1280, 720, 30, 0, 100)
+
+    assert settings.render_config({"quality": "high_quality", "preview": True}) == {
+        "preview": True,
+        "pixel_width": 1280,
+        "pixel_height": 720,
+        "frame_rate": 30
+    }
@@ -0,0 +1,82 @@
+import pytest
+
+from automata.fa.dfa import DFA
+
+from planner import COMPONENT_STEP_SECONDS, TRANSITION_SECONDS, PlannedStep, budget_scale, plan_run, planned_seconds
+from run_trace import RunTrace
+
+
+# Loops on "a" in q0, goes around q1 -> q2 -> q1 on "b"
+DFA_WITH_CYCLES = DFA(
+    states={"q0", "q1", "q2"},
+    input_symbols={"a", "b"},
+    transitions={
+        "q0": {"a": "q0", "b": "q1"},
+        "q1": {"a": "q0", "b": "q2"},
+        "q2": {"a": "q0", "b": "q1"}
+    },
+    initial_state="q0",
+    final_states={"q2"}
+)
+
+
+def trace_of(input_string: str) -> RunTrace:
+    return RunTrace.from_dfa(DFA_WITH_CYCLES, input_string)
+
+
+def test_plan_without_fast_forward_has_every_step():
+    assert plan_run(trace_of("aaaab"), min_repeats=0) == [PlannedStep(i) for i in range(5)]
+
+
+def test_plan_collapses_a_self_loop():
+    assert plan_run(trace_of("aaaab")) == [PlannedStep(0, 1, 4), PlannedStep(4)]
+
+
+def test_plan_collapses_a_cycle():
+    # q0 -b-> q1, then q1 -b-> q2 -b-> q1 three times over, then q1 -a-> q0
+    assert plan_run(trace_of("b" + "bb" * 3 + "a")) == [PlannedStep(0), PlannedStep(1, 2, 3), PlannedStep(7)]
+
+
+def test_plan_leaves_short_repeats_alone():
+    assert plan_run(trace_of("aab")) == [PlannedStep(0), PlannedStep(1), PlannedStep(2)]
+
+
+def test_plan_ignores_cycles_longer_than_max_period():
+    assert plan_run(trace_of("b" + "bb" * 3), max_period=1) == [PlannedStep(i) for i in range(7)]
+
+
+def test_plan_covers_the_whole_trace():
+    trace = trace_of("abbabbbbbbaaaaaab")
+    plan = plan_run(trace)
+
+    assert sum(planned.length for planned in plan) == len(trace)
+    for previous, planned in zip(plan, plan[1:]):
+        assert planned.start == previous.start + previous.length
+    assert plan[-1].last(trace) == trace[-1]
+
+
+def test_planned_seconds_counts_every_trip_around_a_cycle_on_the_graph():
+    plan = [PlannedStep(0), PlannedStep(1, 2, 3), PlannedStep(7)]
+
+    assert planned_seconds(plan, TRANSITION_SECONDS, COMPONENT_STEP_SECONDS) == [6.0, 12.0, 6.0]
+    # Without the graph, a fast-forward is animated as one step
+    assert planned_seconds(plan, 0, COMPONENT_STEP_SECONDS) == [1.0, 1.0, 1.0]
+
+
+def test_budget_scale_leaves_runs_that_fit_alone():
+    assert budget_scale([6.0, 12.0, 6.0]) == 1.0
+    assert budget_scale([6.0, 12.0, 6.0], budget=24) == 1.0
+    assert budget_scale([6.0, 12.0, 6.0], budget=100) == 1.0
+
+
+def test_budget_scale_fits_the_total_of_the_durations():
+    durations = [6.0, 12.0, 6.0]
+    scale = budget_scale(durations, budget=12)
+
+    assert scale == pytest.approx(0.5)
+    assert sum(duration * scale for duration in durations) == pytest.approx(12)
+
+
+def test_budget_scale_does_not_depend_on_the_first_step():
+    # A fast-forward first used to set the scale for the whole run
+    assert budget_scale([12.0, 6.0, 6.0], budget=12) == budget_scale([6.0, 6.0, 12.0], budget=12)
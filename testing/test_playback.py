@@ -0,0 +1,170 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("manim")
+
+from manim.animation.animation import Animation
+from manim.mobject.mobject import Mobject
+
+import segment_cache
+from parallel_render import cache_ranges, split_plays
+from playback import PlaySegment, play_run, scene_plays, segment_fingerprints
+from segment_cache import SegmentCache
+
+
+class RecordingManager:
+    """
+    Stands in for an Auto_Manager whose run reads one symbol per step, and records what it is asked to do
+    """
+
+    def __init__(self, name: str, symbols: str):
+        self.name = name
+        self.symbols = symbols
+        self.position = 0  # Where the components are: how many steps have played or been skipped
+        self.seeks: list[int] = []
+
+    def step_count(self) -> int:
+        return len(self.symbols)
+
+    def seek(self, step: int) -> None:
+        self.seeks.append(step)
+        self.position = max(self.position, step)
+
+    def animate_steps(self, start: int = 0):
+        self.seek(start)
+        for i in range(start, len(self.symbols)):
+            assert self.position == i, "a step was built before the ones ahead of it played"
+            animation = Animation(Mobject())
+            animation.step = (self.name, i)
+            yield animation
+            self.position = i + 1
+
+    def fingerprint(self) -> dict:
+        return {"name": self.name}
+
+    def step_fingerprints(self):
+        yield from self.symbols
+
+    def shown_input(self, start: int, stop: int) -> str:
+        # Like a marquee: only the symbols near the steps that play
+        return self.symbols[start:stop + 1]
+
+
+class RecordingScene:
+    def __init__(self, segment: PlaySegment | None = None):
+        self.renderer = SimpleNamespace(num_plays=0, time=0)
+        self.mobjects = []
+        self.played = []
+        if segment is not None:
+            self.segment = segment
+
+    def play(self, succession) -> None:
+        self.played.append(tuple(animation.step for animation in succession.animations))
+        self.mobjects.append(succession.mobject)
+
+    def construct(self, managers: list[RecordingManager], chunk_size: int) -> None:
+        if scene_plays(self, ("intro",)):
+            self.played.append("intro")
+        for manager in managers:
+            play_run(self, manager, chunk_size)
+        if scene_plays(self, ("wait", 1)):
+            self.played.append("wait")
+
+
+def managers(first: str = "abcdefghij", second: str = "xyzuv") -> list[RecordingManager]:
+    return [RecordingManager("first", first), RecordingManager("second", second)]
+
+
+def counted(chunk_size: int = 4, **inputs) -> RecordingScene:
+    scene = RecordingScene(PlaySegment(0, -1))
+    scene.run_managers = managers(**inputs)
+    scene.construct(scene.run_managers, chunk_size)
+    return scene
+
+
+def test_counting_builds_and_seeks_nothing():
+    scene = counted()
+
+    assert scene.played == []
+    assert all(manager.seeks == [] for manager in scene.run_managers)
+    # The intro, 3 chunks of the first run, 2 of the second, and the closing wait
+    assert scene.segment.cursor == 7
+
+
+def test_take_returns_the_part_of_the_plays_in_the_segment():
+    segment = PlaySegment(2, 4)
+
+    assert segment.take((("a",), ("b",))) == range(0, 0)
+    assert segment.take((("c",), ("d",))) == range(0, 2)
+    assert not segment.finished
+    assert segment.take((("e",), ("f",))) == range(0, 1)
+    assert segment.finished
+    assert segment.cursor == 6
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 4, 16])
+def test_splitting_the_plays_any_way_renders_the_same_sequence(chunk_size):
+    serial = RecordingScene()
+    serial.construct(managers(), chunk_size)
+    plays = counted(chunk_size).segment.cursor
+    assert plays == len(serial.played)
+
+    for workers in range(1, plays + 1):
+        played = []
+        for first, last in split_plays(plays, workers):
+            scene = RecordingScene(PlaySegment(first, last))
+            scene.construct(managers(), chunk_size)
+            played += scene.played
+        assert played == serial.played, f"split {workers} ways"
+
+
+def test_a_worker_seeks_straight_to_its_first_step():
+    scene = RecordingScene(PlaySegment(2, 3))
+    first, second = managers()
+    scene.construct([first, second], 4)
+
+    # Plays 2 and 3 are the second and third chunks of the first run
+    assert scene.played == [tuple(("first", i) for i in range(4, 8)), (("first", 8), ("first", 9))]
+    assert first.seeks == [4]
+    # The second run is never reached, so it is left alone
+    assert second.seeks == []
+
+
+def block_keys(monkeypatch, tmp_path, first: str) -> list[str]:
+    monkeypatch.setattr(segment_cache, "code_version", lambda: "test")
+    scene = counted(first=first)
+    cache = SegmentCache(tmp_path / "cache")
+    ranges = cache_ranges(scene.segment.cursor)
+    return [cache.key(fingerprint, "480p") for fingerprint in segment_fingerprints(scene.segment, ranges, scene.run_managers)]
+
+
+def test_fingerprints_are_stable(monkeypatch, tmp_path):
+    assert block_keys(monkeypatch, tmp_path, "abcdefghij") == block_keys(monkeypatch, tmp_path, "abcdefghij")
+
+
+def test_changing_the_last_symbol_only_changes_the_blocks_from_its_step_on(monkeypatch, tmp_path):
+    keys = block_keys(monkeypatch, tmp_path, "abcdefghij")
+    changed = block_keys(monkeypatch, tmp_path, "abcdefghiz")
+
+    # Blocks: the intro, plays 1-4 (the whole first run and the start of the second), then plays 5-6
+    assert len(keys) == 3
+    assert keys[0] == changed[0]
+    assert keys[1] != changed[1]
+    # The second run's steps don't change, but the first run's prefix does
+    assert keys[2] != changed[2]
+
+
+def test_fingerprints_cover_each_run_step_once():
+    scene = counted()
+    fingerprints = segment_fingerprints(scene.segment, cache_ranges(scene.segment.cursor), scene.run_managers)
+
+    covered = {0: [], 1: []}
+    for fingerprint in fingerprints:
+        for play in fingerprint["plays"]:
+            if play[0] == "run":
+                covered[play[1]] += play[2]
+    assert "".join(covered[0]) == "abcdefghij"
+    assert "".join(covered[1]) == "xyzuv"
+    # Nothing before the first block, so every prefix there is the empty digest
+    assert len({manager["prefix"] for manager in fingerprints[0]["managers"]}) == 1
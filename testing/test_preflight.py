@@ -0,0 +1,158 @@
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+import preflight
+from preflight import FULL_FIT_SAMPLES, HISTORY_LIMIT, CostModel, SceneComplexity, _lower_qualities, estimate_render, load_history
+
+
+# A minute of movie, 50 seconds of it a run that can be compressed
+SCENE = SceneComplexity(vertices=5, edges=8, tex_labels=10, mobjects=1000, animations=30, movie_seconds=60, compressible_seconds=50)
+
+# What the default cost model predicts for SCENE: about 1280 s at high_quality, 290 s at medium_quality
+# and 67 s at low_quality
+
+
+def history_entry(complexity: SceneComplexity, pixel_width: int, pixel_height: int, frame_rate: int, seconds: float) -> dict:
+    return {
+        "time": 0,
+        "complexity": complexity._asdict(),
+        "pixel_width": pixel_width,
+        "pixel_height": pixel_height,
+        "frame_rate": frame_rate,
+        "seconds": seconds
+    }
+
+
+def synthetic_history(coefficients: tuple, renders: int) -> list[dict]:
+    """
+    Renders of different sizes, resolutions and frame rates that took exactly what coefficients predict
+    """
+    truth = CostModel(coefficients)
+    sizes = [(854, 480), (1280, 720), (1920, 1080)]
+    history = []
+    for i in range(renders):
+        complexity = SCENE._replace(mobjects=200 + 150 * i, movie_seconds=5 + 7 * (i % 5))
+        pixel_width, pixel_height = sizes[i % 3]
+        frame_rate = (15, 30, 60)[i // 3 % 3]
+        seconds = truth.predict(complexity, pixel_width, pixel_height, frame_rate)
+        history.append(history_entry(complexity, pixel_width, pixel_height, frame_rate, seconds))
+    return history
+
+
+def write_history(path, history: list[dict]) -> None:
+    with path.open("w") as f:
+        for entry in history:
+            f.write(json.dumps(entry) + "\n")
+
+
+def test_calibration_recovers_the_costs_of_earlier_renders(tmp_path):
+    coefficients = (5.0, 0.004, 0.01, 0.3)
+    write_history(tmp_path / "render_history.jsonl", synthetic_history(coefficients, FULL_FIT_SAMPLES + 8))
+
+    model = CostModel.calibrated(load_history(tmp_path / "render_history.jsonl"))
+
+    assert model.samples == FULL_FIT_SAMPLES + 8
+    assert model.coefficients == pytest.approx(coefficients, rel=1e-6)
+
+
+def test_few_renders_scale_the_default_costs(tmp_path):
+    # Every render took twice as long as the defaults say
+    default = CostModel()
+    history = [
+        history_entry(SCENE, 854, 480, 15, 2 * default.predict(SCENE, 854, 480, 15)),
+        history_entry(SCENE, 1920, 1080, 60, 2 * default.predict(SCENE, 1920, 1080, 60))
+    ]
+
+    model = CostModel.calibrated(history)
+
+    assert model.samples == 2
+    assert model.coefficients == pytest.approx(2 * np.asarray(CostModel.DEFAULT_COEFFICIENTS))
+
+
+def test_no_history_means_the_default_model():
+    assert CostModel.calibrated([]).coefficients == pytest.approx(CostModel.DEFAULT_COEFFICIENTS)
+
+
+def test_load_history_skips_broken_lines_and_keeps_the_most_recent(tmp_path):
+    path = tmp_path / "render_history.jsonl"
+    entries = [history_entry(SCENE, 854, 480, 15, i) for i in range(HISTORY_LIMIT + 10)]
+    write_history(path, entries)
+    with path.open("a") as f:
+        f.write("{not json\n")
+
+    history = load_history(path)
+
+    assert len(history) == HISTORY_LIMIT
+    assert history[0]["seconds"] == 10
+    assert history[-1]["seconds"] == HISTORY_LIMIT + 9
+    assert load_history(tmp_path / "missing.jsonl") == []
+
+
+def test_lower_qualities_go_down_by_resolution_then_frame_rate():
+    assert _lower_qualities("production_quality") == ["high_quality", "medium_quality", "low_quality"]
+    assert _lower_qualities("high_quality") == ["medium_quality", "low_quality"]
+    assert _lower_qualities("low_quality") == []
+    # Not one of the ranked qualities, so there is nothing to go down to
+    assert _lower_qualities("example_quality") == []
+
+
+def test_estimates_fall_with_quality():
+    model = CostModel()
+    seconds = [estimate_render(SCENE, quality, model).seconds for quality in ("high_quality", "medium_quality", "low_quality")]
+
+    assert seconds == sorted(seconds, reverse=True)
+    assert estimate_render(SCENE, "low_quality", model).frames == 900
+
+
+class MeasuredScene:
+    def __init__(self, complexity: SceneComplexity):
+        self._complexity = complexity
+
+    def complexity(self) -> SceneComplexity:
+        return self._complexity
+
+
+@pytest.fixture
+def uncalibrated(monkeypatch):
+    # Decisions are checked against the default costs, whatever renders this machine has recorded
+    monkeypatch.setattr(preflight, "load_history", lambda: [])
+
+
+def run_preflight(budget: float, complexity: SceneComplexity = SCENE, reject: bool = False):
+    return preflight.preflight(MeasuredScene, (complexity,), {"quality": "high_quality"}, budget, reject)
+
+
+def test_a_job_within_budget_is_left_alone(uncalibrated):
+    assert run_preflight(2000) == (MeasuredScene, {"quality": "high_quality"}, False)
+    # No budget at all
+    assert run_preflight(0) == (MeasuredScene, {"quality": "high_quality"}, False)
+
+
+def test_an_over_budget_job_is_rejected_when_asked(uncalibrated):
+    assert run_preflight(500, reject=True) is None
+
+
+def test_over_budget_drops_to_the_best_quality_that_fits(uncalibrated):
+    assert run_preflight(500) == (MeasuredScene, {"quality": "medium_quality"}, False)
+    assert run_preflight(100) == (MeasuredScene, {"quality": "low_quality"}, False)
+
+
+def test_then_the_run_is_compressed_at_the_lowest_quality(uncalibrated):
+    factory, render_config, draft = run_preflight(30)
+
+    assert render_config == {"quality": "low_quality"}
+    assert not draft
+    planner = factory.args[1]
+    assert planner["fast_forward"]
+    # What's left of 30 s after the fixed cost, less the 10 s that isn't part of the run
+    assert 10 < planner["duration_budget"] < 20
+
+
+def test_then_a_draft(uncalibrated):
+    assert run_preflight(10) == (MeasuredScene, {"quality": "high_quality"}, True)
+    # Nothing to compress
+    assert run_preflight(30, SCENE._replace(compressible_seconds=0)) == (MeasuredScene, {"quality": "high_quality"}, True)
@@ -0,0 +1,129 @@
+import pytest
+
+from automata.base.exceptions import RejectionException
+from automata.fa.dfa import DFA
+from automata.fa.nfa import NFA
+from automata.tm.dtm import DTM
+from automata.tm.tape import TMTape
+
+from run_trace import RunStep, RunTrace
+
+
+# Accepts strings with an even number of "a"s
+EVEN_AS = DFA(
+    states={"even", "odd"},
+    input_symbols={"a", "b"},
+    transitions={
+        "even": {"a": "odd", "b": "even"},
+        "odd": {"a": "even", "b": "odd"}
+    },
+    initial_state="even",
+    final_states={"even"}
+)
+
+# Accepts strings ending in "ab", with epsilon moves out of the start and after each "a"
+ENDS_IN_AB = NFA(
+    states={"q0", "q1", "q2", "q3", "q4"},
+    input_symbols={"a", "b"},
+    transitions={
+        "q0": {"": {"q1"}},
+        "q1": {"a": {"q1", "q2"}, "b": {"q1"}},
+        "q2": {"": {"q3"}},
+        "q3": {"b": {"q4"}}
+    },
+    initial_state="q0",
+    final_states={"q4"}
+)
+
+# Walks left off the start of the tape, writes an x there, and walks back to the first blank on the right
+GROWS_LEFT = DTM(
+    states={"left", "back", "done"},
+    input_symbols={"1"},
+    tape_symbols={"1", "x", "."},
+    transitions={
+        "left": {"1": ("left", "1", "L"), ".": ("back", "x", "R")},
+        "back": {"1": ("back", "1", "R"), "x": ("back", "x", "R"), ".": ("done", ".", "N")}
+    },
+    initial_state="left",
+    blank_symbol=".",
+    final_states={"done"}
+)
+
+
+def stepwise(automaton, input_string) -> list:
+    """
+    Every configuration the library goes through, up to where it rejects the input
+    """
+    configurations = []
+    try:
+        for configuration in automaton.read_input_stepwise(input_string):
+            configurations.append(configuration)
+    except RejectionException:
+        pass
+    return configurations
+
+
+@pytest.mark.parametrize("input_string", ["", "a", "ab", "aabba", "bbbbbbbbbbbbbbbbab"])
+def test_dfa_trace_matches_the_library(input_string):
+    trace = RunTrace.from_dfa(EVEN_AS, input_string)
+    expected = stepwise(EVEN_AS, input_string)
+
+    assert len(trace) == len(input_string)
+    assert [trace.configuration(i) for i in range(len(trace) + 1)] == expected
+    assert list(trace) == [RunStep(expected[i], symbol, expected[i + 1]) for i, symbol in enumerate(input_string)]
+    assert trace.accepted == EVEN_AS.accepts_input(input_string)
+
+
+@pytest.mark.parametrize("input_string", ["", "a", "ab", "ba", "aab", "abab", "bbbbbbbbbbbbbbbbbbbbab"])
+def test_nfa_trace_follows_epsilon_moves_like_the_library(input_string):
+    trace = RunTrace.from_nfa(ENDS_IN_AB, input_string)
+    expected = stepwise(ENDS_IN_AB, input_string)
+
+    assert [trace.configuration(i) for i in range(len(trace) + 1)] == expected
+    assert trace.accepted == ENDS_IN_AB.accepts_input(input_string)
+
+
+def test_nfa_frontier_includes_the_epsilon_closure():
+    trace = RunTrace.from_nfa(ENDS_IN_AB, "a")
+
+    assert trace.initial == frozenset({"q0", "q1"})
+    assert trace.configuration(1) == frozenset({"q1", "q2", "q3"})
+
+
+def test_tm_trace_matches_the_library_when_the_tape_grows_left():
+    tape = TMTape("111", blank_symbol=".")
+    trace = RunTrace.from_tm(GROWS_LEFT, tape, checkpoint_interval=2)
+    expected = stepwise(GROWS_LEFT, "111")
+
+    assert len(trace) == len(expected) - 1
+    assert trace.accepted is True
+    assert not trace.truncated
+    for i, tm_config in enumerate(expected):
+        assert trace.configuration(i) == tm_config.state
+        # The library shifts its tape right whenever it grows left, so compare what's under and around the head
+        tape_at = trace.tape_at(i)
+        assert tape_at.read_symbol() == tm_config.tape.read_symbol()
+        assert "".join(tape_at.tape).strip(".") == "".join(tm_config.tape.tape).strip(".")
+
+    # Positions stay on the starting tape's scale: the x is written one cell left of it
+    assert [trace.head_at(i) for i in range(len(trace) + 1)] == [0, -1, 0, 1, 2, 3, 3]
+    assert trace[1] == RunStep("left", ".", "back", "x", "R")
+    assert trace.tape_at(len(trace)).tape == ("x", "1", "1", "1", ".")
+
+
+def test_tm_trace_is_cut_off_after_max_iter():
+    # Walks right forever
+    runaway = DTM(
+        states={"q0", "q1"},
+        input_symbols={"1"},
+        tape_symbols={"1", "."},
+        transitions={"q0": {"1": ("q0", "1", "R"), ".": ("q0", ".", "R")}},
+        initial_state="q0",
+        blank_symbol=".",
+        final_states={"q1"}
+    )
+    trace = RunTrace.from_tm(runaway, TMTape("1", blank_symbol="."), max_iter=10)
+
+    assert trace.truncated
+    assert trace.accepted is None
+    assert len(trace) == 11
@@ -0,0 +1,114 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+import segment_cache
+from segment_cache import SegmentCache, canonical
+
+
+@pytest.fixture(autouse=True)
+def fixed_code_version(monkeypatch):
+    # Keys hash the code as well; that part is the same for every key in a test
+    monkeypatch.setattr(segment_cache, "code_version", lambda: "test")
+
+
+def movie(tmp_path, name: str, size: int = 100):
+    path = tmp_path / "rendered" / f"{name}.mp4"
+    path.parent.mkdir(exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def age(path, seconds_ago: float) -> None:
+    now = os.path.getmtime(path)
+    os.utime(path, (now - seconds_ago, now - seconds_ago))
+
+
+def test_canonical_does_not_depend_on_order():
+    assert canonical({"b": {2, 1}, "a": (1.000001, np.array([0.5]))}) == {"a": [1.0, [0.5]], "b": [1, 2]}
+    assert json.dumps(canonical({"x": 1, "y": 2})) == json.dumps(canonical({"y": 2, "x": 1}))
+
+
+def test_key_is_stable_and_depends_on_every_part(tmp_path):
+    cache = SegmentCache(tmp_path / "cache")
+
+    assert cache.key({"a": 1, "b": {1, 2}}, "480p") == cache.key({"b": {2, 1}, "a": 1}, "480p")
+    assert cache.key({"a": 1}, "480p") != cache.key({"a": 2}, "480p")
+    assert cache.key({"a": 1}, "480p") != cache.key({"a": 1}, "1080p")
+
+
+def test_get_misses_until_put(tmp_path):
+    cache = SegmentCache(tmp_path / "cache")
+    key = cache.key("segment")
+
+    assert cache.get(key) is None
+    stored = cache.put(key, movie(tmp_path, "a"))
+    assert cache.get(key) == stored
+    assert stored.read_bytes() == b"x" * 100
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_eviction_deletes_the_least_recently_used_first(tmp_path):
+    earlier = SegmentCache(tmp_path / "cache")
+    old, used, recent = [earlier.put(name, movie(tmp_path, name)) for name in ("old", "used", "recent")]
+    age(old, 30)
+    age(used, 20)
+    age(recent, 10)
+
+    cache = SegmentCache(tmp_path / "cache", max_bytes=250)
+    cache.get("used")  # Touched, so now the most recently used
+    cache.put("new", movie(tmp_path, "new"))
+
+    assert not old.exists()
+    assert not recent.exists()
+    assert used.exists()
+    assert cache.size() <= 250
+
+
+def test_segments_of_the_current_run_survive_eviction(tmp_path):
+    earlier = SegmentCache(tmp_path / "cache")
+    for name in ("a", "b", "c"):
+        age(earlier.put(name, movie(tmp_path, name)), 60)
+
+    # This run uses more than the whole cache holds
+    cache = SegmentCache(tmp_path / "cache", max_bytes=250)
+    returned = [cache.get("a"), cache.get("b")]
+    returned += [cache.put(name, movie(tmp_path, name)) for name in ("d", "e", "f")]
+
+    # Everything the concat is about to join is still there
+    assert all(path is not None and path.exists() for path in returned)
+    assert not (tmp_path / "cache" / "c.mp4").exists()
+
+    # The next run is free to evict them
+    SegmentCache(tmp_path / "cache", max_bytes=250).put("g", movie(tmp_path, "g"))
+    assert sum(path.exists() for path in returned) < len(returned)
+
+
+def test_report_adds_up_stats_across_runs(tmp_path, capsys):
+    first = SegmentCache(tmp_path / "cache")
+    first.get("a")
+    first.put("a", movie(tmp_path, "a"))
+    first.get("a")
+    first.report()
+    # Reporting again only adds what happened since
+    first.report()
+
+    second = SegmentCache(tmp_path / "cache")
+    second.get("a")
+    second.get("b")
+    second.report()
+
+    assert json.loads((tmp_path / "cache" / "stats.json").read_text()) == {"hits": 2, "misses": 2}
+    assert "2 hits, 2 misses in total" in capsys.readouterr().out
+    # The stats file is not a segment
+    assert (tmp_path / "cache" / "stats.json") not in second.files()
+
+
+def test_cache_lives_in_the_media_folder(tmp_path):
+    manim_config = pytest.importorskip("manim._config")
+
+    with manim_config.tempconfig({"media_dir": str(tmp_path / "media")}):
+        cache = SegmentCache()
+    assert cache.directory == tmp_path / "media" / "segment_cache"
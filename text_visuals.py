@@ -3,20 +3,32 @@ __all__ = [
     "TuringTape"
 ]
 
+import numpy as np
+
 from manim.animation.composition import AnimationGroup
 from manim.animation.creation import Unwrite
 from manim.animation.transform import FadeToColor, Transform
+from manim.constants import DOWN, LEFT, RIGHT
 from manim.mobject.table import Table
 from manim.mobject.text.text_mobject import Text
+from manim.mobject.types.vectorized_mobject import VGroup
 from manim.utils.color.core import ManimColor
 
 from automata.tm.tape import TMTape
 
+from animations import Recolor, Translate
+
 
 class ProcessText(Text):
     """
     A Mobject which displays text being processed by a DFA, NFA, or PDA.
     Capable of animating an "Unwrite" of the first character, to correspond with a step taken by an FA.
+
+    If window is positive and the text is longer than that, the text is shown as a marquee instead: only
+    `window` characters are on screen, consumed characters fade to the shadow color, and the text scrolls
+    left by recycling the glyph that falls off the left edge as the next one coming in on the right.
+    Ellipses on either side show there is more text, and a counter below shows the position in the input.
+    Memory and per-step cost then depend on the window size, not on the length of the input.
     """
 
     def __init__(
@@ -24,9 +36,13 @@ class ProcessText(Text):
         text: str,
         visual_config: dict,
         highlight_color: ManimColor = "yellow",
+        window: int = 0,
         **kwargs
     ) -> None:
-        super().__init__(text, color=visual_config["color"], **kwargs)
+        self.full_text = text
+        self.marquee = 0 < window < len(text)
+
+        super().__init__(text[:window] if self.marquee else text, color=visual_config["color"], **kwargs)
 
         if ' ' in text:
             print("Warning: Whitespace does not translate well to this Mobject. Consider replacing with a different character, like _ (underscore)")
@@ -34,17 +50,128 @@ class ProcessText(Text):
         self.textptr = 0
         self.config = visual_config
         self.highlight = highlight_color
-        self[0].set_color(self.highlight)
 
-        # The shadow that's left behind after the unwrites
-        self.add(Text(text, color=visual_config["shadow_color"]).set_z_index(-1))
+        if self.marquee:
+            self._init_marquee(window)
+        else:
+            self[0].set_color(self.highlight)
+
+            # The shadow that's left behind after the unwrites. Kept first in the family rather than given a lower
+            # z_index, since the OpenGL renderer draws a family in order and has no z_index. The characters are
+            # still self.chars[i]
+            self.add_to_back(Text(text, color=visual_config["shadow_color"]))
+
+    def _init_marquee(self, window: int) -> None:
+        self.window = window
+        self.lead = window // 3  # The highlighted character never goes further right than this slot while scrolling
+        self.window_start = 0  # Where the window will be once every queued animation has played
+
+        self._glyphs: dict[str, Text] = dict()
+
+        # Evenly spaced slots over the space the first window of text takes up
+        self.slot_width = self.width / window
+        left = self.get_left()[0]
+        y = self.get_center()[1]
+        self.remove(*self.submobjects)
+
+        self.slots: list[Text] = []  # Glyphs in slot order, once every queued animation has played
+        for i, char in enumerate(self.full_text[:window]):
+            glyph = self._glyph(char).copy().move_to([left + (i + 0.5) * self.slot_width, y, 0])
+            self.slots.append(glyph)
+        self.slots[0].set_color(self.highlight)
+
+        self.ring = VGroup(*self.slots)
+        self.left_more = Text("...", color=self.config["shadow_color"]).scale(0.6).next_to(self.ring, LEFT)
+        self.right_more = Text("...", color=self.config["shadow_color"]).scale(0.6).next_to(self.ring, RIGHT)
+        self.left_more.set_opacity(0)
+        self.counter = Text(self._counter_text(0), color=self.config["shadow_color"]).scale(0.4).next_to(self.ring, DOWN)
+        self._left_more_width = self.left_more.width
+
+        self.add(self.ring, self.left_more, self.right_more, self.counter)
+
+    def _glyph(self, char: str) -> Text:
+        if char not in self._glyphs:
+            self._glyphs[char] = Text(char, color=self.config["color"])
+        return self._glyphs[char]
+
+    def _counter_text(self, ptr: int) -> str:
+        return f"{ptr + 1}/{len(self.full_text)}"
+
+    def _scroll(self, recycled: list[Text], chars: str, start: int, ptr: int) -> None:
+        """
+        Called right before a marquee step plays: moves the glyphs that are about to fall off the left
+        edge to the right end, one after the other, as chars, and updates the indicators and the counter
+        """
+        scale = self.left_more.width / self._left_more_width
+        for glyph, char in zip(recycled, chars):
+            last = max(self.ring, key=lambda other: other.get_x())
+            glyph.become(self._glyph(char).copy().scale(scale))
+            glyph.move_to([last.get_x() + self.slot_width * scale, last.get_y(), 0])
+
+        self._show_position(start, ptr)
+
+    def _show_position(self, start: int, ptr: int) -> None:
+        self.left_more.set_opacity(1 if start > 0 else 0)
+        self.right_more.set_opacity(1 if start + self.window < len(self.full_text) else 0)
+        self.counter.become(
+            Text(self._counter_text(ptr), color=self.config["shadow_color"]).match_height(self.counter).move_to(self.counter)
+        )
 
     def peek_next_letter(self) -> str:
-        return self.original_text[self.textptr]
+        return self.full_text[self.textptr]
 
     def increment_letter(self) -> None:
         self.textptr += 1
 
+    def seek(self, ptr: int) -> None:
+        """
+        Puts the text straight where it is once its first ptr characters have been consumed, without
+        animating anything. Only moves forward.
+        """
+        if ptr <= self.textptr:
+            return
+
+        if self.marquee:
+            self._seek_marquee(ptr)
+        else:
+            # Hidden rather than unwritten, which looks the same
+            for i in range(self.textptr, ptr):
+                self.chars[i].set_opacity(0)
+            if ptr < len(self.original_text):
+                self.chars[ptr].set_color(self.highlight)
+        self.textptr = ptr
+
+    def _marquee_start(self, ptr: int) -> int:
+        # The window only ever scrolls right, so where it ends up doesn't depend on how it got there
+        return max(0, min(ptr - self.lead, len(self.full_text) - self.window))
+
+    def shown_text(self, first_ptr: int, last_ptr: int):
+        """
+        The part of the text that is on screen at some point while the pointer goes from first_ptr to
+        last_ptr: all of it, or for a marquee, every window it scrolls through and how long the text is
+        """
+        if not self.marquee:
+            return self.full_text
+        return self.full_text[self._marquee_start(first_ptr):self._marquee_start(last_ptr) + self.window], len(self.full_text)
+
+    def _seek_marquee(self, ptr: int) -> None:
+        start = self._marquee_start(ptr)
+        scale = self.left_more.width / self._left_more_width
+
+        # Every glyph is relabeled in place, in the order the slots are on screen
+        self.slots = sorted(self.ring, key=lambda glyph: glyph.get_x())
+        for i, glyph in enumerate(self.slots):
+            center = glyph.get_center()
+            glyph.become(self._glyph(self.full_text[start + i]).copy().scale(scale))
+            glyph.move_to(center)
+            if start + i < ptr:
+                glyph.set_color(self.config["shadow_color"])
+            elif start + i == ptr:
+                glyph.set_color(self.highlight)
+
+        self.window_start = start
+        self._show_position(start, min(ptr, len(self.full_text) - 1))
+
     def RemoveOneCharacter(self):
         """
         Unwrites the character pointed to by self.textptr, leaving the shadow behind.
@@ -58,28 +185,102 @@ class ProcessText(Text):
             Unwriting the first character causes it to be removed from this Mobject. Even if the animation
             is not displayed, the effect still occurs on every call.
         """
+        if self.marquee:
+            return self._marquee_step()
+
         if self.textptr < len(self.original_text) - 1:
             return AnimationGroup(
-                FadeToColor(self[self.textptr + 1], color=self.highlight),
-                Unwrite(self[self.textptr])
+                FadeToColor(self.chars[self.textptr + 1], color=self.highlight),
+                Unwrite(self.chars[self.textptr])
             )
         else:
-            return Unwrite(self[self.textptr])
+            return Unwrite(self.chars[self.textptr])
+
+    def RemoveCharacters(self, count: int):
+        """
+        Consumes count characters at once, starting with the one pointed to by self.textptr, for
+        fast-forwarded stretches of a run. Like RemoveOneCharacter(), leaves self.textptr on the last
+        character consumed, so increment_letter() moves past it.
+        """
+        if count <= 1:
+            return self.RemoveOneCharacter()
+
+        if self.marquee:
+            return self._marquee_step(count)
+
+        last = self.textptr + count - 1
+        animations = [Unwrite(self.chars[i]) for i in range(self.textptr, last + 1)]
+        if last < len(self.original_text) - 1:
+            animations.append(FadeToColor(self.chars[last + 1], color=self.highlight))
+        self.textptr = last
+
+        return AnimationGroup(*animations)
+
+    def _marquee_step(self, count: int = 1) -> AnimationGroup:
+        ptr = self.textptr
+        next_ptr = ptr + count
+        old_start = self.window_start
+
+        # Scroll just far enough that the next character sits no further right than the lead slot
+        start = max(old_start, min(next_ptr - self.lead, len(self.full_text) - self.window))
+        shift = min(start - old_start, self.window)
+
+        # The leftmost glyphs come back in on the right as the last characters of the new window
+        recycled = self.slots[:shift]
+        chars = self.full_text[start + self.window - shift:start + self.window]
+        self.slots = self.slots[shift:] + recycled
+        self.window_start = start
+
+        self.textptr = next_ptr - 1
+        scale_reference = self.left_more
+
+        animations = [
+            Translate(
+                self.ring,
+                lambda: LEFT * shift * self.slot_width * scale_reference.width / self._left_more_width,
+                on_begin=lambda: self._scroll(recycled, chars, start, min(next_ptr, len(self.full_text) - 1))
+            )
+        ]
+        # Consumed characters that are still on screen fade to the shadow color
+        for i in range(max(ptr, start), min(next_ptr, start + self.window)):
+            animations.append(Recolor(self.slots[i - start], self.config["shadow_color"]))
+        if next_ptr < len(self.full_text):
+            animations.append(Recolor(self.slots[next_ptr - start], self.highlight))
+
+        return AnimationGroup(*animations)
 
 
 class TuringTape(Table):
+    """
+    A Mobject which displays a fixed window of cells over the unbounded tape of a Turing Machine.
+
+    The tape itself is only stored logically (a sparse dict from position to symbol), so it can grow in
+    either direction. When the head gets within `margin` cells of either edge of the window, the window
+    recenters on the head by relabeling the existing cells from a small pool of glyphs, one per tape symbol.
+    Each step costs the same no matter how far the head has wandered.
+    """
+
     def __init__(
         self,
         tape: TMTape,
         config: dict = dict(),
-        highlight_color="yellow"
+        highlight_color="yellow",
+        window: int | None = None
     ):
-        self.text = "".join(list(tape.tape))
+        self.config = config
         self.blank = tape.blank_symbol
-        self.index = tape.current_position
+        self.window = window if window is not None else config.get("tape_window", 15)
+        self.margin = max(1, self.window // 4)
+
+        # Anything not in here is blank
+        self.cells: dict[int, str] = dict(enumerate(tape.tape))
+        self.head = tape.current_position
+
+        self.view_start = self.head - self.margin  # Where the window will be once every queued animation has played
+        self._shown_start = self.view_start  # Where the window actually is right now
 
         super().__init__(
-            [(list(self.text) + [self.blank])],
+            [self._snapshot(self.view_start)],
             element_to_mobject=Text,
             element_to_mobject_config={
                 "color": config["color"]
@@ -93,35 +294,104 @@ class TuringTape(Table):
         for element in self.get_entries():
             element.scale(config["font_size"] / 48)
 
+        self._glyphs: dict[str, Text] = dict()
+
         self.indicator = self.get_cell(
-            (1, (self.index + 1) % len(self.text)),
+            (1, self.head - self.view_start + 1),
             color=highlight_color
         )
-        self.config = config
         self.add(self.indicator)
 
+        # Cell centers at construction time. Only differences between them are ever used
+        self._cell_centers = np.array([self.get_cell((1, col)).get_center() for col in range(1, self.window + 1)])
+        self._indicator_width = self.indicator.width
+
+    def _snapshot(self, start: int) -> list[str]:
+        return [self.cells.get(pos, self.blank) for pos in range(start, start + self.window)]
+
+    def _scale(self) -> float:
+        return self.indicator.width / self._indicator_width
+
+    def _glyph(self, symbol: str) -> Text:
+        if symbol not in self._glyphs:
+            self._glyphs[symbol] = Text(symbol, color=self.config["color"]).scale(self.config["font_size"] / 48)
+        return self._glyphs[symbol]
+
+    def _show_window(self, start: int, symbols: list[str]) -> None:
+        """
+        Recycles every cell of the window to show symbols, which start at tape position start
+        """
+        scale = self._scale()
+        for i, symbol in enumerate(symbols):
+            entry = self.get_entries((1, i + 1))
+            entry.become(self._glyph(symbol).copy().scale(scale).move_to(entry.get_center()))
+        self._shown_start = start
+
+    def _recenter(self, start: int, head: int) -> int:
+        """
+        Where the window is once the head moves to head, when it was at start. It recenters on the head
+        when the head comes too close to either edge
+        """
+        if start + self.margin <= head <= start + self.window - 1 - self.margin:
+            return start
+        return head - self.window // 2
+
+    def seek(self, tape: TMTape, heads: list[int]) -> None:
+        """
+        Puts the tape straight where a run leaves it, without animating anything. heads are the positions
+        the head has been at, from the start of the run (see RunTrace.head_at()), and tape is what the
+        tape holds at the end. The window recenters along the way just like in animate_update().
+        """
+        start = heads[0] - self.margin
+        for head in heads[1:]:
+            start = self._recenter(start, head)
+
+        head = heads[-1]
+        left = head - tape.current_position
+        self.cells = {left + i: symbol for i, symbol in enumerate(tape.tape)}
+
+        delta = self._cell_centers[head - start] - self._cell_centers[self.head - self.view_start]
+        self.indicator.shift(delta * self._scale())
+        self.head = head
+        self.view_start = start
+        self._show_window(start, self._snapshot(start))
+
     def animate_update(self, changes):
         write = changes[1]
         direction = changes[2]
         if direction == "L":
-            self.index -= 1 if self.index > 0 else 0
+            step = -1
         elif direction == "R":
-            self.index += 1 if self.index < len(self.text) - 1 else 0
+            step = 1
+        elif direction == "N":
+            step = 0
         else:
             raise ValueError("Direction invalid")
 
-        new_entry = Text(write).move_to(
-            self.get_entries((1, self.index + 1))
-        ).scale(self.config["font_size"] / 48).set_color(self.config["color"])
+        old_head, old_start = self.head, self.view_start
+        new_head = old_head + step
+
+        new_start = self._recenter(old_start, new_head)
+
+        # The window has to be relabeled with what the tape holds before this step's write
+        on_begin = None
+        if new_start != old_start:
+            symbols = self._snapshot(new_start)
 
-        if write == self.blank:
-            write = " "
+            def on_begin():
+                self._show_window(new_start, symbols)
 
+        self.cells[old_head] = write
+        self.head = new_head
+        self.view_start = new_start
+
+        delta = self._cell_centers[new_head - new_start] - self._cell_centers[old_head - old_start]
+
+        entry = self.get_entries((1, old_head - new_start + 1))
+        new_entry = self._glyph(write).copy().scale(self._scale()).move_to(entry.get_center())
+
+        # The indicator goes first so the window is relabeled before the write starts
         return AnimationGroup(
-            self.indicator.animate.move_to(
-                self.get_cell((1, self.index + 1))),
-            Transform(
-                self.get_entries((1, self.index + 1)),
-                new_entry
-            )
+            Translate(self.indicator, lambda: delta * self._scale(), on_begin=on_begin),
+            Transform(entry, new_entry)
         )
@@ -1,11 +1,21 @@
+import numpy as np
+
 from manim.mobject.table import Table
 from manim.mobject.text.tex_mobject import MathTex
+from manim.mobject.text.text_mobject import Text
+from manim.constants import DOWN
+
+from animations import Translate
 
 
 class TransitionTable(Table):
-    def __init__(self, automaton, visual_config, highlight_color="yellow", starting_symbol=""):
+    def __init__(self, automaton, visual_config, highlight_color="yellow", starting_symbol="", window=0):
         """
         Given an automaton of type DFA or TM, constructs a mobject displaying the transition table of that automaton. Also provides helpful methods for animation.
+
+        If window is positive and the automaton has more states than that, only `window` rows are built.
+        The rows are recycled as the follower moves, so building and stepping cost depends on the window
+        size instead of on the number of states. A summary row underneath says how many states are hidden.
         """
 
         #TODO: NFA separate table?
@@ -18,11 +28,28 @@ class TransitionTable(Table):
         self.symbols.sort()
         self.states.sort()
 
+        # Built once so looking up a cell never scans the state/symbol lists
+        self._state_index = {state: i for i, state in enumerate(self.states)}
+        self._symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        self.transitions = automaton.transitions
+        self.final_states = set(automaton.final_states)
+
+        # Virtualized mode: only rows [self._window_start, self._window_start + self.window) exist
+        self.virtual = 0 < window < len(self.states)
+        self.window = window if self.virtual else len(self.states)
+        self._window_start = 0
+        self._planned_start = 0  # Where the window will be once every queued animation has played
+
         rows = []
 
         self.starting_symbol = starting_symbol
 
-        for state in self.states:
+        if self.virtual:
+            start_row = self._state_index[automaton.initial_state]
+            self._window_start = self._planned_start = self._clamp_start(start_row - self.window // 2)
+
+        for state in self._visible_states(self._window_start):
             new_row = []
             for sym in self.symbols:
                 new_row.append(automaton.transitions[state][sym])
@@ -31,7 +58,7 @@ class TransitionTable(Table):
 
         super().__init__(
             rows,
-            row_labels=[MathTex(state, color=self.config["border_color"]) for state in self.states],
+            row_labels=[MathTex(state, color=self.config["border_color"]) for state in self._visible_states(self._window_start)],
             col_labels=[MathTex(symbol, color=self.config["border_color"]) for symbol in self.symbols],
             include_outer_lines=True,
             line_config={
@@ -47,20 +74,138 @@ class TransitionTable(Table):
         else:
             start_index = self.get_index(automaton.initial_state, starting_symbol)
 
-        for state in automaton.final_states:
-            for i, cell in enumerate(self.states):
-                if cell == state:
-                    final_state_box = self.get_cell((i + 2, 1)).copy().scale(0.9).set_color("white")
-                    self.add(final_state_box)
+        # One box per visible row; in virtualized mode they are switched on and off as rows are recycled
+        self._final_boxes = []
+        for i, state in enumerate(self._visible_states(self._window_start)):
+            final_state_box = self.get_cell((i + 2, 1)).copy().scale(0.9).set_color("white")
+            if state not in self.final_states:
+                final_state_box.set_stroke(opacity=0)
+            self._final_boxes.append(final_state_box)
+            self.add(final_state_box)
 
         self.follower = self.get_cell(start_index).copy().set_color(highlight_color)
         self.add(self.follower)
 
-    def get_index(self, state, symbol):
+        # Cell centers as they were at construction time, indexed like get_cell() minus one.
+        # The follower animation only ever needs the difference between two of these.
+        self._cell_centers = np.array([
+            [self.get_cell((row, col)).get_center() for col in range(1, len(self.symbols) + 2)]
+            for row in range(1, self.window + 2)
+        ])
+        self._follower_width = self.follower.width
+        self._follower_index = start_index  # Where the follower will be once every queued animation has played
+
+        if self.virtual:
+            # Recycled rows are relabeled from these instead of building new mobjects on every scroll
+            self._glyphs: dict[tuple[bool, str], MathTex | Text] = dict()
+
+            self.summary = Text(self._summary_text(self._window_start), color=self.config["border_color"])
+            self.summary.scale(0.5).next_to(self.get_horizontal_lines()[-1], DOWN)
+            self.add(self.summary)
+
+    def _clamp_start(self, start):
+        return max(0, min(start, len(self.states) - self.window))
+
+    def _visible_states(self, start):
+        return self.states[start:start + self.window]
+
+    def _summary_text(self, start):
+        above = start
+        below = len(self.states) - start - self.window
+        return f"{above} states above, {below} states below ({len(self.states)} total)"
+
+    def _glyph(self, text, is_label):
+        key = (is_label, text)
+        if key not in self._glyphs:
+            if is_label:
+                self._glyphs[key] = MathTex(text, color=self.config["border_color"])
+            else:
+                self._glyphs[key] = self.element_to_mobject(text, **self.element_to_mobject_config)
+        return self._glyphs[key]
+
+    def _scroll_to(self, start):
+        """
+        Recycles the visible rows so they show states[start:start + window].
+        Costs O(window * symbols) no matter how many states the automaton has.
+        """
+        if start == self._window_start:
+            return
+
+        scale = self.follower.width / self._follower_width
+
+        for i, state in enumerate(self._visible_states(start)):
+            cells = [(True, state)] + [(False, str(self.transitions[state][sym])) for sym in self.symbols]
+            for j, (is_label, text) in enumerate(cells):
+                old = self.get_entries((i + 2, j + 1))
+                old.become(self._glyph(text, is_label).copy().scale(scale).move_to(old.get_center()))
+
+            self._final_boxes[i].set_stroke(opacity=1 if state in self.final_states else 0)
+
+        self.summary.become(
+            Text(self._summary_text(start), color=self.config["border_color"]).match_height(self.summary).move_to(self.summary)
+        )
+        self._window_start = start
+
+    def _plan_window(self, state):
+        """
+        Chooses where the window has to be for state to be visible, recentering only when it falls outside
+        """
+        row = self._state_index[state]
+        if self._planned_start <= row < self._planned_start + self.window:
+            return self._planned_start
+        return self._clamp_start(row - self.window // 2)
+
+    def get_index(self, state, symbol, window_start=None):
+        if window_start is None:
+            window_start = self._window_start
+
+        row = self._state_index[state] - window_start
+        if not 0 <= row < self.window:
+            raise IndexError(f"State {state} is not in the visible rows of the table")
+
         if (symbol == "?"):
-            return (self.states.index(state) + 2, 1)
+            return (row + 2, 1)
         else:
-            return (self.states.index(state) + 2, self.symbols.index(symbol) + 2)
+            return (row + 2, self._symbol_index[symbol] + 2)
 
     def move_follower(self, next_row, next_col):
+        if self.virtual:
+            self._planned_start = self._plan_window(next_row)
+            self._scroll_to(self._planned_start)
         self.follower.move_to(self.get_cell(self.get_index(next_row, next_col)))
+        self._follower_index = self.get_index(next_row, next_col)
+
+    def seek(self, rows, next_col):
+        """
+        Puts the follower straight where it ends up after moving through rows in order, on the column of
+        next_col in the last one, without animating anything. In virtualized mode the window is scrolled
+        along the way like follower_animation() would, so it ends up in the same place.
+        """
+        if self.virtual:
+            for row in rows[:-1]:
+                self._planned_start = self._plan_window(row)
+        self.move_follower(rows[-1], next_col)
+
+    def follower_animation(self, next_row, next_col) -> Translate:
+        """
+        Animates only the follower to the cell for (next_row, next_col).
+
+        Unlike ``self.animate.move_follower()``, the rest of the table is never copied. The
+        distance to move comes from the precomputed cell centers, scaled by how much the table
+        has been scaled since it was built. In virtualized mode the rows are recycled right
+        before the follower starts moving, if the next state is not already visible.
+        """
+        start = self._follower_index
+        window_start = self._plan_window(next_row) if self.virtual else 0
+        end = self.get_index(next_row, next_col, window_start)
+
+        self._follower_index = end
+        self._planned_start = window_start
+
+        delta = self._cell_centers[end[0] - 1, end[1] - 1] - self._cell_centers[start[0] - 1, start[1] - 1]
+
+        return Translate(
+            self.follower,
+            lambda: delta * self.follower.width / self._follower_width,
+            on_begin=(lambda: self._scroll_to(window_start)) if self.virtual else None
+        )
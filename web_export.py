@@ -0,0 +1,221 @@
+__all__ = [
+    "export_web",
+    "timeline"
+]
+
+# Standard Library
+import html
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Manim
+from manim.mobject.mobject import Mobject
+from manim.mobject.types.vectorized_mobject import VGroup
+from manim.utils.color import ManimColor
+
+# Internal
+from export import DEFAULT_MARGIN, svg_document, svg_transform
+from fa_manager import Auto_Manager
+
+
+dir_path = Path(os.path.dirname(os.path.realpath(__file__)))
+player_dir = dir_path / "web_player"
+
+TIMELINE_FORMAT = 1
+
+# Components the player draws itself instead of taking them from the SVG
+PLAYER_COMPONENTS = {"text", "tape", "ledger"}
+
+
+def _hex(color: str) -> str:
+    # Manim color names like "BLUE_C" mean nothing to a browser
+    return ManimColor(color).to_hex()
+
+
+def _svg_parts(manager: Auto_Manager) -> tuple[Mobject, dict[Mobject, str]]:
+    """
+    What goes into the SVG (the graph, and the table if it is shown) and the classes the player
+    uses to find states, edges and the table's follower again
+    """
+    graph = manager.mobj[manager.graph_key]
+    parts = [graph]
+    classes = dict()
+
+    states = manager.run_trace().states
+    for i, state in enumerate(states):
+        classes[graph.vertices[state]["base"]] = f"state-{i}"
+        classes[graph.vertices[state]["base"].submobjects[0]] = "label"
+    for j, edge in enumerate(graph.edges):
+        classes[graph.edges[edge]] = f"edge-{j}"
+
+    table = manager.mobj["table"]
+    if _animated_table(manager):
+        parts.append(table)
+        classes[table.follower] = "follower"
+
+    return VGroup(*parts), classes
+
+
+def _animated_table(manager: Auto_Manager) -> bool:
+    # Only DFA and NFA runs move the table's follower, and only a table showing every row keeps its cells in place
+    return manager.showing.get("table", False) and manager.run_trace().kind != "tm" and not manager.mobj["table"].virtual
+
+
+def timeline(manager: Auto_Manager, scene: Mobject | None = None) -> dict:
+    """
+    Everything the web player needs to replay a run, built from the manager's run trace.
+
+    Steps are stored as short lists to keep the file small: [symbol, after, edges] where symbol is
+    an index into "symbols", after is a state index (a list of them for an NFA) and edges are indices
+    into "edges". Turing Machine steps add the index of the symbol written and the move (-1, 0 or 1).
+
+    scene is the mobject the SVG was drawn from. When the table is in it, "cells" holds the boxes
+    (x, y, width, height in SVG units) the follower visits and which box goes with each configuration.
+    """
+    trace = manager.run_trace()
+    graph = manager.mobj[manager.graph_key]
+    config = manager.config
+
+    state_ids = {state: i for i, state in enumerate(trace.states)}
+    edges = list(graph.edges)
+    edge_ids = {edge: j for j, edge in enumerate(edges)}
+    symbol_ids = {symbol: k for k, symbol in enumerate(trace.symbols)}
+
+    steps = []
+    for step in trace:
+        if trace.kind == "nfa":
+            fired = [
+                edge_ids[(start, end)]
+                for start in sorted(step.before, key=str)
+                for end in manager.auto.transitions.get(start, dict()).get(step.symbol, set())
+                if (start, end) in edge_ids
+            ]
+            steps.append([symbol_ids[step.symbol], sorted(state_ids[state] for state in step.after), fired])
+        else:
+            fired = [edge_ids[(step.before, step.after)]] if (step.before, step.after) in edge_ids else []
+            entry = [symbol_ids[step.symbol], state_ids[step.after], fired]
+            if trace.kind == "tm":
+                entry += [symbol_ids[step.write], {"L": -1, "N": 0, "R": 1}[step.move]]
+            steps.append(entry)
+
+    initial = trace.initial
+    if trace.kind == "nfa":
+        initial = sorted(state_ids[state] for state in initial)
+    else:
+        initial = state_ids[initial]
+
+    data = {
+        "format": TIMELINE_FORMAT,
+        "kind": trace.kind,
+        "states": [str(state) for state in trace.states],
+        "symbols": list(trace.symbols),
+        "edges": [[state_ids[start], state_ids[end]] for start, end in edges],
+        "input": manager.input_string,
+        "accepted": trace.accepted,
+        "initial": initial,
+        "steps": steps,
+        "step_time": _step_time(config, len(trace)),
+        "colors": {
+            "background": _hex(config["scene"]["background_color"]),
+            "idle": _hex(config["theory"]["initial_state_color"]),
+            "current": _hex(config["theory"]["transition_color"]),
+            "highlight": _hex(config["theory"]["current_state_color"]),
+            "text": _hex(config["text"]["color"]),
+            "shadow": _hex(config["text"]["shadow_color"])
+        },
+        "components": sorted(key for key in PLAYER_COMPONENTS if manager.showing.get(key, False)),
+        "ledger_rows": config.get("ledger", dict()).get("max_steps", 3),
+        "tape_window": config["text"].get("tape_window", 15)
+    }
+
+    if trace.kind == "tm":
+        tape = trace.tape_at(0)
+        data["tape"] = {
+            "cells": [symbol_ids.setdefault(symbol, len(symbol_ids)) for symbol in tape.tape],
+            "head": tape.current_position,
+            "blank": trace.blank_symbol
+        }
+        # Symbols that are on the tape but never read or written
+        data["symbols"] = list(symbol_ids)
+
+    if scene is not None and _animated_table(manager):
+        data["cells"] = _table_cells(manager, scene)
+
+    return data
+
+
+def _step_time(config: dict, steps: int) -> float:
+    """
+    Seconds per step in the player: one, unless the planner's duration budget asks for less
+    """
+    budget = config.get("planner", dict()).get("duration_budget", 0)
+    if budget > 0 and steps > 0:
+        return min(1.0, budget / steps)
+    return 1.0
+
+
+def _table_cells(manager: Auto_Manager, scene: Mobject) -> dict:
+    trace = manager.run_trace()
+    table = manager.mobj["table"]
+    to_svg, _, _ = svg_transform(scene, DEFAULT_MARGIN)
+
+    boxes = []
+    box_ids = dict()
+    cursor = []
+    for i in range(len(trace) + 1):
+        if i == len(trace):
+            cursor.append(-1)  # The run is over, so there is no next symbol to point at
+            continue
+
+        cell = table.get_index(manager._table_row(trace.configuration(i)), trace[i].symbol)
+        if cell not in box_ids:
+            box = table.get_cell(cell)
+            left, top = to_svg(box.get_corner([-1, 1, 0]))
+            right, bottom = to_svg(box.get_corner([1, -1, 0]))
+            box_ids[cell] = len(boxes)
+            boxes.append([round(left, 2), round(top, 2), round(right - left, 2), round(bottom - top, 2)])
+        cursor.append(box_ids[cell])
+
+    return {"boxes": boxes, "cursor": cursor}
+
+
+def export_web(manager: Auto_Manager, directory: Path, name: str) -> Path:
+    """
+    Writes a run as files a browser can replay, with no frames rendered or encoded:
+
+    - name.svg, the graph (and the table, if shown) as vectors
+    - name.json, the timeline of the run (see timeline())
+    - name.html, a page with both inlined, which plays them with the bundled player.js
+
+    player.js is copied next to them. The text, tape and ledger are drawn by the player, so only
+    the components shown in the manager are replayed. Returns the path of the page.
+    """
+    if not manager.showing[manager.graph_key]:
+        manager.show_mobj(manager.graph_key)
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    scene, classes = _svg_parts(manager)
+    svg = svg_document(scene, manager.config["scene"]["background_color"], classes=classes)
+    data = timeline(manager, scene)
+    timeline_json = json.dumps(data, separators=(",", ":"))
+
+    (directory / f"{name}.svg").write_text(svg)
+    (directory / f"{name}.json").write_text(timeline_json)
+    shutil.copyfile(player_dir / "player.js", directory / "player.js")
+
+    page = (player_dir / "player.html").read_text()
+    page = page.replace("{{title}}", html.escape(name))
+    page = page.replace("{{svg}}", svg)
+    # Keeps a "</script>" inside the input from ending the script tag early
+    page = page.replace("{{timeline}}", timeline_json.replace("</", "<\\/"))
+
+    path = directory / f"{name}.html"
+    path.write_text(page)
+
+    size = sum((directory / f"{name}{suffix}").stat().st_size for suffix in (".svg", ".json"))
+    print(f"Exported {len(data['steps'])} steps to {path} ({size / 1024:.1f} KB of SVG and timeline)")
+    return path
@@ -0,0 +1,197 @@
+// Replays a run exported by web_export.py: recolors the states and edges of the inlined SVG,
+// moves the table's follower, and draws the text, tape and ledger, one step at a time.
+// Seeking rebuilds the configuration from the start of the run without any animation.
+(function () {
+  "use strict";
+
+  const data = JSON.parse(document.getElementById("timeline").textContent);
+  const svg = document.querySelector("#stage svg");
+  const steps = data.steps;
+
+  const textBox = document.getElementById("text");
+  const tapeBox = document.getElementById("tape");
+  const ledgerBox = document.getElementById("ledger");
+  const statusBox = document.getElementById("status");
+  const playButton = document.getElementById("play");
+  const seek = document.getElementById("seek");
+  const speed = document.getElementById("speed");
+
+  document.body.style.background = data.colors.background;
+  seek.max = steps.length;
+
+  const showing = new Set(data.components);
+  textBox.hidden = !showing.has("text");
+  tapeBox.hidden = !showing.has("tape");
+  ledgerBox.hidden = !showing.has("ledger");
+
+  // The colors every path started with, so a seek can start over from a clean picture
+  const paths = Array.from(svg.querySelectorAll("path"));
+  const original = paths.map((path) => [path.getAttribute("fill"), path.getAttribute("stroke")]);
+
+  function paint(selector, color) {
+    svg.querySelectorAll(selector).forEach((path) => {
+      if (path.getAttribute("fill") !== "none") path.setAttribute("fill", color);
+      if (path.getAttribute("stroke") !== "none") path.setAttribute("stroke", color);
+    });
+  }
+
+  function restore(selector) {
+    svg.querySelectorAll(selector).forEach((path) => {
+      const [fill, stroke] = original[paths.indexOf(path)];
+      path.setAttribute("fill", fill);
+      path.setAttribute("stroke", stroke);
+    });
+  }
+
+  // The table's own follower stays where it was drawn, so the player draws one that can move
+  let cursor = null;
+  if (data.cells) {
+    svg.querySelectorAll(".follower").forEach((path) => { path.style.display = "none"; });
+    cursor = document.createElementNS("http://www.w3.org/2000/svg", "rect");
+    cursor.setAttribute("fill", "none");
+    cursor.setAttribute("stroke", data.colors.highlight);
+    cursor.setAttribute("stroke-width", "3");
+    svg.appendChild(cursor);
+  }
+
+  const asSet = (states) => new Set(Array.isArray(states) ? states : [states]);
+
+  let position = 0;  // Number of steps taken
+  let current = asSet(data.initial);
+  let tape = null;
+  let head = 0;
+  let timer = null;
+
+  function reset() {
+    restore("path");
+    position = 0;
+    current = asSet(data.initial);
+    if (data.tape) {
+      tape = new Map(data.tape.cells.map((symbol, i) => [i, symbol]));
+      head = data.tape.head;
+    }
+  }
+
+  function apply(step, animate) {
+    const after = asSet(step[1]);
+    current.forEach((state) => { if (!after.has(state)) paint(`.state-${state}`, data.colors.idle); });
+    after.forEach((state) => paint(`.state-${state}`, data.colors.current));
+    current = after;
+
+    if (animate) {
+      const edges = step[2].map((edge) => `.edge-${edge}`).join(",");
+      if (edges !== "") {
+        paint(edges, data.colors.current);
+        setTimeout(() => restore(edges), 600 * data.step_time / speed.value);
+      }
+    }
+
+    if (tape !== null) {
+      tape.set(head, step[3]);
+      head += step[4];
+    }
+    position += 1;
+  }
+
+  function drawText() {
+    if (!showing.has("text")) return;
+    textBox.replaceChildren(...Array.from(data.input, (char, i) => {
+      const span = document.createElement("span");
+      span.textContent = char;
+      span.style.color = i < position ? data.colors.shadow : i === position ? data.colors.highlight : data.colors.text;
+      return span;
+    }));
+  }
+
+  function drawTape() {
+    if (!showing.has("tape") || tape === null) return;
+    const first = head - Math.floor(data.tape_window / 2);
+    const cells = [];
+    for (let i = first; i < first + data.tape_window; i++) {
+      const span = document.createElement("span");
+      span.textContent = tape.has(i) ? data.symbols[tape.get(i)] : data.tape.blank;
+      if (i === head) span.style.outline = `2px solid ${data.colors.highlight}`;
+      cells.push(span);
+    }
+    tapeBox.replaceChildren(...cells);
+  }
+
+  function stateNames(states) {
+    return Array.from(asSet(states), (state) => data.states[state]).join(", ");
+  }
+
+  function drawLedger() {
+    if (!showing.has("ledger")) return;
+    const rows = [];
+    for (let i = Math.max(0, position - data.ledger_rows); i < position; i++) {
+      const before = i === 0 ? data.initial : steps[i - 1][1];
+      const row = document.createElement("tr");
+      for (const cell of [stateNames(before), data.symbols[steps[i][0]], "→", stateNames(steps[i][1])]) {
+        const td = document.createElement("td");
+        td.textContent = cell;
+        row.appendChild(td);
+      }
+      rows.push(row);
+    }
+    ledgerBox.replaceChildren(...rows);
+  }
+
+  function drawCursor() {
+    if (cursor === null) return;
+    const box = data.cells.cursor[position];
+    cursor.style.display = box < 0 ? "none" : "";
+    if (box >= 0) {
+      const [x, y, width, height] = data.cells.boxes[box];
+      cursor.setAttribute("x", x);
+      cursor.setAttribute("y", y);
+      cursor.setAttribute("width", width);
+      cursor.setAttribute("height", height);
+    }
+  }
+
+  function draw() {
+    drawText();
+    drawTape();
+    drawLedger();
+    drawCursor();
+    seek.value = position;
+
+    let status = `Step ${position} of ${steps.length}`;
+    if (position === steps.length && data.accepted !== null) {
+      status += data.accepted ? " — accepted" : " — rejected";
+    }
+    statusBox.textContent = status;
+  }
+
+  function goTo(target) {
+    target = Math.max(0, Math.min(steps.length, target));
+    if (target < position) reset();
+    while (position < target) apply(steps[position], false);
+    draw();
+  }
+
+  function pause() {
+    clearInterval(timer);
+    timer = null;
+    playButton.innerHTML = "&#9654;";
+  }
+
+  function play() {
+    if (position === steps.length) goTo(0);
+    playButton.innerHTML = "&#10073;&#10073;";
+    timer = setInterval(() => {
+      if (position === steps.length) return pause();
+      apply(steps[position], true);
+      draw();
+    }, 1000 * data.step_time / speed.value);
+  }
+
+  playButton.addEventListener("click", () => (timer === null ? play() : pause()));
+  document.getElementById("back").addEventListener("click", () => { pause(); goTo(position - 1); });
+  document.getElementById("forward").addEventListener("click", () => { pause(); goTo(position + 1); });
+  seek.addEventListener("input", () => { pause(); goTo(Number(seek.value)); });
+  speed.addEventListener("change", () => { if (timer !== null) { pause(); play(); } });
+
+  reset();
+  draw();
+})();